@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Standing deal alerts over streaming listing updates
+
+Watch rules are indexed by style and, within a style, by their price cap or minimum score in
+sorted lists, so an incoming listing is only fully checked against the rules whose bound it
+already passes. Matches go to a sink once per (rule, URL).
+"""
+
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Iterable, NamedTuple, Optional
+import json
+
+from computer import GPU_SERIES, Computer
+
+
+
+class WatchRule:
+    # ex: WatchRule("cheap 40-series towers", style="Tower", gpuSeries="RTX", minGpuGeneration=40, maxPrice=1200, minScore=70)
+    def __init__(self,
+            name: str,
+            style: Optional[str] = None,                                       # None for any style
+            brand: Optional[str] = None,                                       # case-insensitive
+            gpuSeries: Optional[str] = None,                                   # RTX also matches GeForce RTX
+            minGpuGeneration: Optional[int] = None,                            # 40 for the 40-series
+            maxPrice: Optional[float] = None,                                  # price below this
+            minScore: Optional[float] = None,                                  # score above this
+            minSale: Optional[int] = None,                                     # percent off, at least this
+            minDiscount: Optional[float] = None):                              # percent below MSRP, at least this
+
+        if style is not None and style not in {"Laptop", "All-in-One", "Mini", "Tower"}:
+            raise ValueError(f"Invalid style '{style}'. Must be Laptop, All-in-One, Mini, or Tower.")
+        if gpuSeries is not None and not isinstance(gpuSeries, str):
+            raise TypeError(f"GPU series: {gpuSeries} is invalid")
+
+        self.name = name
+        self.style = style
+        self.brand = brand
+        self.gpuSeries = gpuSeries
+        self.minGpuGeneration = minGpuGeneration
+        self.maxPrice = maxPrice
+        self.minScore = minScore
+        self.minSale = minSale
+        self.minDiscount = minDiscount
+
+        self._brand = brand.casefold() if brand is not None else None
+        self._series = _series(GPU_SERIES.get(gpuSeries) or gpuSeries.upper()) if gpuSeries is not None else None
+
+
+    @staticmethod
+    def from_dict(data: dict) -> 'WatchRule':
+        # Rules kept in JSON/TOML configuration
+        return WatchRule(**data)
+
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'style': self.style, 'brand': self.brand, 'gpuSeries': self.gpuSeries,
+                'minGpuGeneration': self.minGpuGeneration, 'maxPrice': self.maxPrice, 'minScore': self.minScore,
+                'minSale': self.minSale, 'minDiscount': self.minDiscount}
+
+
+    def matches(self, computer: Computer) -> bool:
+        # A condition on a missing field fails
+        price, gpu = computer.price, computer.gpu
+        if self.style is not None and computer.style != self.style:
+            return False
+        if self.maxPrice is not None and (price is None or not price < self.maxPrice):
+            return False
+        if self.minScore is not None and not computer.score > self.minScore:
+            return False
+        if self._brand is not None and (computer.brand or "").casefold() != self._brand:
+            return False
+        if self._series is not None and (gpu.series is None or _series(gpu.series) != self._series):
+            return False
+        if self.minGpuGeneration is not None and (gpu.generation is None or gpu.generation < self.minGpuGeneration):
+            return False
+        if self.minSale is not None and computer.sale < self.minSale:
+            return False
+        if self.minDiscount is not None:
+            msrp = computer.msrp
+            if price is None or not msrp or (msrp - price) / msrp * 100 < self.minDiscount:
+                return False
+        return True
+
+
+
+class Alert(NamedTuple):
+    rule: str
+    url: str
+    price: Optional[float]
+    msrp: Optional[float]
+    sale: int
+    score: float
+    timestamp: datetime                                                        # the listing's, when it was checked
+
+    def to_record(self) -> dict:
+        return self._asdict() | {'timestamp': self.timestamp.isoformat()}
+
+
+
+class FileSink:
+    # Appends one JSON line per alert and flushes, the (rule, url) pairs already in the file count as sent.
+    # A last line left incomplete by a crash mid-append is cut off, as PriceHistory does
+    def __init__(self, path: str):
+        self.path = path
+        self.sent = set()
+        try:
+            with open(path, "rb+") as fp:
+                offset = 0
+                for lineNumber, line in enumerate(fp, start = 1):
+                    if line.strip():
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            if line.endswith(b"\n"):
+                                raise ValueError(f"{path}, line {lineNumber}: not an alert") from None
+                            fp.truncate(offset)                                 # torn by a crash mid-append
+                            break
+                        self.sent.add((record['rule'], record['url']))
+                        if not line.endswith(b"\n"):                          # complete, but the newline didn't make it
+                            fp.write(b"\n")
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        self._file = open(path, "a", encoding = "utf-8")
+
+
+    def send(self, alert: Alert) -> None:
+        self._file.write(json.dumps(alert.to_record(), separators = (',', ':')) + "\n")
+        self._file.flush()
+
+
+    def close(self) -> None:
+        self._file.close()
+
+
+
+class QueueSink:
+    # Hands alerts to anything with put(), ex: queue.Queue or multiprocessing.Queue
+    def __init__(self, queue):
+        self.queue = queue
+        self.sent = set()
+
+
+    def send(self, alert: Alert) -> None:
+        self.queue.put(alert)
+
+
+    def close(self) -> None:
+        pass
+
+
+
+class AlertEngine:
+    def __init__(self, rules: Iterable[WatchRule] = (), sink = None):
+        self.sink = sink
+        self.rules = {}                                                        # name -> WatchRule
+        self._alerted = set(getattr(sink, 'sent', ()))                         # (rule name, url) pairs already sent
+
+        # Style (None for any) -> rules keyed on their most selective bound, see _candidates
+        self._byPrice = {}                                                     # [(maxPrice, name)] sorted
+        self._byScore = {}                                                     # [(minScore, name)] sorted
+        self._unbounded = {}                                                   # [name]
+
+        for rule in rules:
+            self.add(rule)
+
+
+    def __enter__(self) -> 'AlertEngine':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
+
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+    def add(self, rule: WatchRule) -> None:
+        if rule.name in self.rules:
+            raise ValueError(f"A rule named '{rule.name}' is already registered")
+        self.rules[rule.name] = rule
+        if rule.maxPrice is not None:
+            insort(self._byPrice.setdefault(rule.style, []), (rule.maxPrice, rule.name))
+        elif rule.minScore is not None:
+            insort(self._byScore.setdefault(rule.style, []), (rule.minScore, rule.name))
+        else:
+            self._unbounded.setdefault(rule.style, []).append(rule.name)
+
+
+    def remove(self, name: str) -> None:
+        rule = self.rules.pop(name)
+        if rule.maxPrice is not None:
+            self._byPrice[rule.style].remove((rule.maxPrice, name))
+        elif rule.minScore is not None:
+            self._byScore[rule.style].remove((rule.minScore, name))
+        else:
+            self._unbounded[rule.style].remove(name)
+
+
+    def forget(self, url: str) -> None:
+        # Lets a listing alert again, ex: after it sold out and came back
+        self._alerted = {key for key in self._alerted if key[1] != url}
+
+
+    def match(self, computer: Computer) -> list:
+        # Names of every rule the listing matches, alerted or not
+        return [name for name in self._candidates(computer) if self.rules[name].matches(computer)]
+
+
+    def update(self, computer: Computer) -> list:
+        # Matches one incoming listing and sends an Alert for each rule it newly matches. Returns those alerts
+        if computer.url is None:
+            raise ValueError("Listings without a URL can't be alerted on")
+
+        alerts = []
+        for name in self.match(computer):
+            key = (name, computer.url)
+            if key in self._alerted:
+                continue
+            self._alerted.add(key)
+            alert = Alert(name, computer.url, computer.price, computer.msrp, computer.sale, computer.score, computer.timestamp)
+            if self.sink is not None:
+                self.sink.send(alert)
+            alerts.append(alert)
+        return alerts
+
+
+    def update_many(self, computers: Iterable[Computer]) -> list:
+        # Alerts of a whole scrape, in listing order
+        return [alert for computer in computers for alert in self.update(computer)]
+
+
+    def _candidates(self, computer: Computer) -> Iterable[str]:
+        # Rules for the listing's style and for any style whose indexed bound it passes: the price caps above
+        # its price and the minimum scores below its score. Only these get the full check
+        price, score = computer.price, computer.score
+        for style in (computer.style, None):
+            byPrice = self._byPrice.get(style)
+            if byPrice and price is not None:
+                for _, name in byPrice[bisect_right(byPrice, price, key = _bound):]:
+                    yield name
+            byScore = self._byScore.get(style)
+            if byScore:
+                for _, name in byScore[:bisect_left(byScore, score, key = _bound)]:
+                    yield name
+            yield from self._unbounded.get(style, ())
+
+
+
+def _bound(entry: tuple) -> float:
+    return entry[0]
+
+
+def _series(series: str) -> str:
+    # GeForce RTX and RTX are the same series for a rule
+    return series.removeprefix("GEFORCE ")
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Construction, attribute access and memory of many Computer records
+
+Run from the repository root:  python -m benchmarks.computer_record --rows 1000000
+"""
+
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from computer import CPU, GPU, Computer
+
+
+
+def raw_listings(rows: int, seed: int = 0) -> list:
+    # Constructor kwargs per listing, lists for the compound fields as scraped data arrives
+    rng = random.Random(seed)
+    cpus = [CPU("Intel", family, 12, 450, "H") for family in (3, 5, 7, 9)] + [CPU("Apple", 2, None, None, "Pro")]
+    gpus = [GPU("NVIDIA", "GeForce RTX", generation, 50) for generation in (20, 30, 40)] + [GPU("Intel", "Integrated")]
+    
+    return [dict(brand=rng.choice(["HP", "Lenovo", "Dell", "Asus"]), name="Model " + str(rng.randint(1, 99)),
+                 style=rng.choice(["Laptop", "Tower"]), rating=round(rng.uniform(3, 5), 1), reviews=rng.randint(0, 5000),
+                 price=rng.randint(300, 3000), msrp=rng.randint(300, 3000), sale=rng.randint(0, 40),
+                 weight=round(rng.uniform(2, 8), 2), dimensions=[14.1, 9.7, 0.8], screen=rng.choice([14.0, 15.6, None]),
+                 resolution=[1920, 1080], refresh=rng.choice([60, 144]), keypad=True, webcam=True, backlit=False,
+                 cpu=rng.choice(cpus), gpu=rng.choice(gpus),
+                 ram=[rng.choice([8, 16, 32]), "DDR5"], storage=[rng.choice([512, 1000]), "SSD"],
+                 url="https://example.com/p/" + str(index))
+            for index in range(rows)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    listings = raw_listings(args.rows, args.seed)
+    gc.disable()
+    
+    start = time.perf_counter()
+    computers = [Computer(**listing) for listing in listings]
+    construction = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    total = 0
+    for pc in computers:
+        total += pc.price + pc.ram[0] + pc.resolution[0] + pc.refresh + pc.score
+    access = time.perf_counter() - start
+    
+    del computers
+    tracemalloc.start()
+    computers = []
+    for listing in listings:
+        # Every scraped listing arrives with its own lists, count whatever the Computer keeps of them
+        computers.append(Computer(**{key: (list(value) if isinstance(value, list) else value)
+                                     for key, value in listing.items()}))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.enable()
+    
+    print(f"Construction: {construction:.2f} s ({construction / args.rows * 1e6:.2f} us per Computer)")
+    print(f"Attribute access (5 fields): {access:.2f} s ({access / args.rows * 1e9:.0f} ns per Computer)")
+    print(f"Memory held: {current / 2**20:.1f} MiB ({current / args.rows:.0f} B per Computer)")
+    
+    
+    
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Matching a scrape against many watch rules, every rule per listing against the rule index
+
+Run from the repository root:  python -m benchmarks.deal_alerts --rows 100000 --rules 1000
+"""
+
+
+import argparse
+import random
+import time
+
+from alerts import AlertEngine, WatchRule
+from benchmarks.suite import build, synthetic_listings
+
+
+
+def random_rules(count: int, seed: int = 0) -> list:
+    # Users mostly watch one style under a price cap, some only for a minimum score
+    rng = random.Random(seed)
+    rules = []
+    for index in range(count):
+        bounded = rng.random()
+        rules.append(WatchRule(f"rule {index}", style=rng.choice([None, "Laptop", "Laptop", "Tower", "Mini", "All-in-One"]),
+                               brand=rng.choice([None, None, "HP", "Dell", "Lenovo"]),
+                               gpuSeries=rng.choice([None, "RTX", "RX"]), minGpuGeneration=rng.choice([None, 30, 40]),
+                               maxPrice=rng.randrange(400, 2500, 50) if bounded < 0.8 else None,
+                               minScore=rng.randint(50, 80) if bounded > 0.6 else None,
+                               minSale=rng.choice([None, None, 10, 20]), minDiscount=rng.choice([None, None, 15])))
+    return rules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    computers = list(build(synthetic_listings(args.rows, args.seed)))
+    rules = random_rules(args.rules, args.seed)
+    engine = AlertEngine(rules)
+
+    start = time.perf_counter()
+    scanned = sum(rule.matches(pc) for pc in computers for rule in rules)
+    scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed = sum(len(engine.match(pc)) for pc in computers)
+    index = time.perf_counter() - start
+
+    assert scanned == indexed
+    print(f"{args.rows:,} listings, {args.rules:,} rules, {indexed:,} matches")
+    print(f"Every rule per listing: {scan:7.2f} s ({scan / args.rows * 1e6:7.1f} us per listing)")
+    print(f"Rule index:             {index:7.2f} s ({index / args.rows * 1e6:7.1f} us per listing)")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Time and accuracy of deduplicate as the number of listings grows
+
+Run from the repository root:  python -m benchmarks.dedup_clusters --rows 1000000
+"""
+
+
+import argparse
+import random
+import time
+
+from benchmarks.computer_record import raw_listings
+from computer import Computer
+from dedup import deduplicate
+
+
+
+RETAILERS = ["www.bestbuy.com", "www.amazon.com", "www.newegg.com", "www.walmart.com", "www.bhphotovideo.com"]
+
+
+def retailer_copies(rows: int, seed: int = 0) -> tuple:
+    # Listings of rows // 4 machines, each at up to 5 retailers under a reworded name and its own price.
+    # Returns (listings, machine id per listing)
+    rng = random.Random(seed)
+    machines = raw_listings(max(rows // 4, 1), seed)
+    for index, machine in enumerate(machines):
+        machine['name'] = f"{rng.choice(['Victus', 'Omen', 'IdeaPad', 'Legion', 'Inspiron', 'ROG'])} {index}"
+
+    listings, truth = [], []
+    while len(listings) < rows:
+        index = rng.randrange(len(machines))
+        listing = dict(machines[index])
+        listing['name'] = rng.choice(["{} Gaming Laptop", "{brand} {}", "New {} Laptop, Windows 11", "{}-series"]).format(
+            listing['name'], brand = listing['brand'])
+        listing['price'] = listing['price'] + rng.randint(-50, 50)
+        listing['url'] = f"https://{rng.choice(RETAILERS)}/p/{len(listings)}"
+        listings.append(Computer(**listing))
+        truth.append(index)
+    return listings, truth
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rows = 10_000
+    while rows <= args.rows:
+        listings, truth = retailer_copies(rows, args.seed)
+        start = time.perf_counter()
+        merged = deduplicate(listings)
+        elapsed = time.perf_counter() - start
+
+        # A cluster is pure when all its listings are copies of one machine
+        machineOf = {listing.url: machine for listing, machine in zip(listings, truth)}
+        pure = sum(len({machineOf[offer.url] for offer in cluster.offers}) == 1 for cluster in merged)
+        print(f"{rows:>10,} listings  {elapsed:7.2f} s  {elapsed / rows * 1e6:6.1f} us per listing  "
+              f"{len(merged):,} clusters for {len(set(truth)):,} machines, {pure / len(merged):.1%} pure")
+        rows *= 10
+
+
+
+if __name__ == "__main__":
+    main()
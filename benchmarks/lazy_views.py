@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+A job reading only price, url and score: full Computers against lazy ComputerViews
+
+Run from the repository root:  python -m benchmarks.lazy_views --rows 1000000
+"""
+
+
+import argparse
+import json
+import time
+
+from benchmarks.suite import build, synthetic_listings
+from computer import Computer
+from view import ComputerView
+
+
+
+def timed(label: str, rows: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44}{elapsed:8.2f} s  {elapsed / rows * 1e6:8.2f} us per record")
+
+
+def cheap_deals(computers) -> list:
+    return [(pc.url, pc.price) for pc in computers if pc.price is not None and pc.price < 800 and pc.score > 50]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    records = [json.loads(json.dumps(pc.to_record())) for pc in build(synthetic_listings(args.rows, args.seed))]
+    unscored = [{key: value for key, value in record.items() if key != 'score'} for record in records]
+
+    timed("from_records(validate='batch')", args.rows, lambda: cheap_deals(Computer.from_records(records)[0]))
+    timed("from_records(validate='lazy')", args.rows, lambda: cheap_deals(Computer.from_records(records, "lazy")[0]))
+    timed("ComputerView, stored score", args.rows, lambda: cheap_deals(map(ComputerView, records)))
+    timed("ComputerView, score computed", args.rows, lambda: cheap_deals(map(ComputerView, unscored)))
+
+    assert cheap_deals(Computer.from_records(records)[0]) == cheap_deals(map(ComputerView, records))
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Writing and reading listings through the SQLite ListingStore
+
+Run from the repository root:  python -m benchmarks.listing_store --rows 1000000
+"""
+
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.computer_record import raw_listings
+from computer import Computer
+from store import ListingStore
+
+
+
+def timed(label: str, rows: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44}{elapsed:8.2f} s  {rows / elapsed:>12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    computers = [Computer(**listing) for listing in raw_listings(args.rows, args.seed)]
+    for index, computer in enumerate(computers):
+        computer.url = f"https://example.com/p/{index}"
+    single = min(args.rows, 10_000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ListingStore(os.path.join(directory, "single.db"), batchSize = 1) as store:
+            timed(f"upsert, 1 row per transaction ({single:,})", single, lambda: store.upsert(computers[:single]))
+
+        with ListingStore(os.path.join(directory, "listings.db")) as store:
+            timed("upsert, batched inserts", args.rows, lambda: store.upsert(computers))
+            timed("upsert, batched updates", args.rows, lambda: store.upsert(computers))
+            timed("select all", args.rows, lambda: sum(1 for _ in store.select()))
+            timed("select first 100 by score", 100, lambda: [pc for _, pc in zip(range(100), store.select(orderBy = "score",
+                                                                                                       descending = True))])
+            timed("select Laptop, $500-$1000, 16 GB+", args.rows,
+                  lambda: sum(1 for _ in store.select(style = "Laptop", minPrice = 500, maxPrice = 1000, minRam = 16)))
+
+
+
+if __name__ == "__main__":
+    main()
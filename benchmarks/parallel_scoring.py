@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of score_catalog from one worker up to every core
+
+Run from the repository root:  python -m benchmarks.parallel_scoring --rows 1000000
+"""
+
+
+import argparse
+import os
+import time
+
+from benchmarks.computer_record import raw_listings
+from computer import Computer
+from parallel import score_catalog
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=10_000)
+    args = parser.parse_args()
+
+    computers = [Computer(**listing) for listing in raw_listings(args.rows, args.seed)]
+
+    # Single core reference: what the nightly job does today
+    start = time.perf_counter()
+    for pc in computers:
+        pc.check()
+    sequential = time.perf_counter() - start
+    print(f"{'Computer.check()':<20}{sequential:8.2f} s  {args.rows / sequential:>12,.0f} rows/s")
+
+    counts = sorted({1, args.workers} | {2 ** power for power in range(args.workers.bit_length()) if 2 ** power < args.workers})
+    for workers in counts:
+        start = time.perf_counter()
+        scores, failures = score_catalog(computers, workers, args.chunk)
+        elapsed = time.perf_counter() - start
+        print(f"{f'{workers} worker(s)':<20}{elapsed:8.2f} s  {args.rows / elapsed:>12,.0f} rows/s  "
+              f"x{sequential / elapsed:.2f}")
+
+        assert not failures and all(score == pc.score for score, pc in zip(scores, computers))
+
+
+
+if __name__ == "__main__":
+    main()
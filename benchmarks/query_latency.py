@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Query latency of ListingIndex against a full scan and sort
+
+Run from the repository root:  python -m benchmarks.query_latency --rows 1000000
+"""
+
+
+import argparse
+import random
+import time
+
+from benchmarks.computer_record import raw_listings
+from computer import Computer
+from query import ListingIndex
+
+
+
+QUERIES = {
+    "best 20 laptops <= $900, >= 16 GB RAM, >= 144 Hz":
+        (lambda index: index.query().where(style="Laptop").range("price", hi=900).range("ram", lo=16).range("refresh", lo=144).top(20),
+         lambda pc: pc.style == "Laptop" and pc.price <= 900 and pc.ram[0] >= 16 and pc.refresh >= 144),
+    "best 20 towers with an RTX 40, score >= 50":
+        (lambda index: index.query().where(style="Tower", gpuGeneration=40).range("score", lo=50).top(20),
+         lambda pc: pc.style == "Tower" and pc.gpu.generation == 40 and pc.score >= 50),
+    "best 20 Dell or HP, $1000 - $1100":
+        (lambda index: index.query().where(brand=("Dell", "HP")).range("price", 1000, 1100).top(20),
+         lambda pc: pc.brand in ("Dell", "HP") and 1000 <= pc.price <= 1100)
+}
+
+
+
+def timed(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    computers, _ = Computer.from_records(raw_listings(args.rows, args.seed), validate = "none")
+    
+    start = time.perf_counter()
+    index = ListingIndex(computers)
+    print(f"Index build for {args.rows:,} rows: {time.perf_counter() - start:.2f} s")
+    
+    rng = random.Random(args.seed)
+    rows = rng.sample(range(args.rows), min(args.updates, args.rows))
+    start = time.perf_counter()
+    for row in rows:
+        index.update(row, {'price': rng.randint(300, 3000)})
+    elapsed = time.perf_counter() - start
+    print(f"Price updates: {elapsed / len(rows) * 1e6:.1f} us each")
+    
+    for label, (indexed, predicate) in QUERIES.items():
+        scan = lambda: sorted((pc for pc in computers if predicate(pc)), key = lambda pc: pc.score, reverse = True)[:20]
+        assert [pc.score for pc in indexed(index)] == [pc.score for pc in scan()]
+        print(f"{label}: indexed {timed(lambda: indexed(index), args.repeat) * 1e3:.1f} ms, "
+              f"scan + sort {timed(scan, 1) * 1e3:.1f} ms")
+    
+    
+    
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Rendering a daily digest per Computer against the bulk renderers over catalog columns
+
+Run from the repository root:  python -m benchmarks.report_rendering --rows 200000
+"""
+
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from benchmarks.suite import build, synthetic_listings
+from catalog import ComputerCatalog
+from render import COLUMNS, write_csv, write_summary
+
+
+
+def timed(label: str, rows: int, path: str, run) -> None:
+    start = time.perf_counter()
+    with open(path, "w", encoding = "utf-8", newline = "") as fp:
+        run(fp)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36}{elapsed:8.2f} s  {rows / elapsed:>12,.0f} rows/s  {os.path.getsize(path) / 2**20:8.1f} MiB")
+
+
+def per_object_csv(computers: list, fp) -> None:
+    writer = csv.writer(fp, lineterminator = "\n")
+    writer.writerow(COLUMNS)
+    for pc in computers:
+        row = pc.to_row()
+        writer.writerow(row[:9] + [row[9][0], row[9][1], row[10], str(row[11]), str(row[12]),
+                                   row[13][0], row[13][1], row[14][0], row[14][1]] + row[15:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    computers = list(build(synthetic_listings(args.rows, args.seed)))
+    catalog = ComputerCatalog(computers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "digest")
+        timed("__str__ per Computer", args.rows, path, lambda fp: [fp.write(str(pc) + "\n\n") for pc in computers])
+        timed("to_str per Computer", args.rows, path, lambda fp: [fp.write(pc.to_str() + "\n") for pc in computers])
+        timed("write_summary", args.rows, path, lambda fp: write_summary(catalog, fp))
+        timed("csv.writer over to_row", args.rows, path, lambda fp: per_object_csv(computers, fp))
+        timed("write_csv", args.rows, path, lambda fp: write_csv(catalog, fp))
+
+
+
+if __name__ == "__main__":
+    main()
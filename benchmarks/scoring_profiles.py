@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Scoring a catalog for several profiles, one pass per profile against one fused pass
+
+Run from the repository root:  python -m benchmarks.scoring_profiles --rows 1000000
+"""
+
+
+import argparse
+import time
+
+from benchmarks.computer_record import raw_listings
+from catalog import ComputerCatalog
+from computer import Computer
+from scoring import DEFAULT_PROFILE, Profile, ScoringEngine
+
+
+
+PROFILES = [DEFAULT_PROFILE,
+            Profile("gaming", weights={'gpu': 3, 'refresh': 2, 'cpu': 2}),
+            Profile("office", weights={'gpu': 0, 'price': 2, 'rating': 2}, missing={'rating': 60}),
+            Profile("travel", weights={'gpu': 0.5, 'features': 2}, scales={'storage': 10})]
+
+
+def timed(label: str, rows: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40}{elapsed:8.2f} s  {rows / elapsed:>12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    computers = [Computer(**listing) for listing in raw_listings(args.rows, args.seed)]
+    catalog = ComputerCatalog(computers)
+    separate = [ScoringEngine([profile]) for profile in PROFILES]
+    fused = ScoringEngine(PROFILES)
+
+    timed("create_score(), default only", args.rows, lambda: [pc.create_score() for pc in computers])
+    timed(f"{len(PROFILES)} profiles, one pass each", args.rows, lambda: [engine.score_all(computers) for engine in separate])
+    timed(f"{len(PROFILES)} profiles, fused", args.rows, lambda: fused.score_all(computers))
+    timed(f"{len(PROFILES)} profiles, catalog, one pass each", args.rows,
+          lambda: [engine.score_catalog(catalog) for engine in separate])
+    timed(f"{len(PROFILES)} profiles, catalog, fused", args.rows, lambda: fused.score_catalog(catalog))
+
+    assert list(fused.score_catalog(catalog)['default']) == [pc.score for pc in computers]
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Memory held by the CPU/GPU specs of many listings
+
+Run from the repository root:  python -m benchmarks.spec_memory --rows 1000000
+"""
+
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from computer import CPU, GPU
+
+
+
+def raw_specs(rows: int, seed: int = 0) -> list:
+    # Raw (cpu args, gpu args) per listing, drawn from a few thousand distinct chips with mixed casing
+    rng = random.Random(seed)
+    cpuBrands = {"intel": [3, 5, 7, 9], "amd": [3, 5, 7, 9], "apple": [1, 2, 3, 4]}
+    gpus = [("nvidia", "GeForce RTX", 20, 30, 40, 50), ("radeon", "RX", 60, 70, 76, 90)]
+    
+    specs = []
+    for _ in range(rows):
+        brand = rng.choice(list(cpuBrands))
+        casedBrand = rng.choice([brand, brand.upper(), brand.capitalize()])
+        if brand == "apple":
+            cpuArgs = (casedBrand, rng.choice(cpuBrands[brand]), None, None, rng.choice([None, "pro", "Max"]))
+        else:
+            cpuArgs = (casedBrand, rng.choice(cpuBrands[brand]), rng.randint(10, 14),
+                       rng.randrange(100, 1000, 50), rng.choice(["H", "hs", "U", "HX", None]))
+        
+        gpuBrand, series, *generations = rng.choice(gpus)
+        gpuArgs = (gpuBrand, series, rng.choice(generations), rng.choice([50, 60, 70, 80, 90]), rng.choice([None, "Ti", "XT"]))
+        specs.append((cpuArgs, gpuArgs))
+    return specs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    specs = raw_specs(args.rows, args.seed)
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    listings = [(CPU(*cpuArgs), GPU(*gpuArgs)) for cpuArgs, gpuArgs in specs]
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    distinctCpus = len({id(cpu) for cpu, _ in listings})
+    distinctGpus = len({id(gpu) for _, gpu in listings})
+    print(f"{args.rows:,} listings built in {elapsed:.2f} s")
+    print(f"CPU objects: {distinctCpus:,}, GPU objects: {distinctGpus:,}")
+    print(f"Memory held: {current / 2**20:.1f} MiB ({current / args.rows:.0f} B per listing), peak {peak / 2**20:.1f} MiB")
+    
+    
+    
+if __name__ == "__main__":
+    main()
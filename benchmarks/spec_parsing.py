@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of CPU.parse / GPU.parse over listing titles
+
+Run from the repository root:  python -m benchmarks.spec_parsing --rows 1000000
+"""
+
+
+import argparse
+import random
+import time
+
+import computer
+from computer import CPU, GPU
+
+
+
+def raw_titles(rows: int, seed: int = 0) -> list:
+    # Listing titles the way retailers write them, a few thousand distinct ones repeated across sellers
+    rng = random.Random(seed)
+    brands = ["HP Victus 15", "Lenovo LOQ 15", "ASUS TUF Gaming A16", "Dell Inspiron 14", "Acer Nitro V",
+              "MSI Thin GF63", "CyberPowerPC Gamer Xtreme", "Skytech Chronos"]
+    cpus = [lambda: f"Intel Core i{rng.choice('3579')}-{rng.randint(10, 14)}{rng.randrange(100, 1000, 50)}{rng.choice(['H', 'HX', 'U', 'F', ''])}",
+            lambda: f"Intel Core i{rng.choice('357')}-{rng.randint(11, 13)}{rng.randrange(10, 100, 5)}{rng.choice(['U', 'P', 'G7'])}",
+            lambda: f"AMD Ryzen {rng.choice('3579')} {rng.randint(5, 8)}{rng.randrange(100, 1000, 50)}{rng.choice(['HS', 'H', 'U', 'X', ''])}",
+            lambda: f"Intel Core i{rng.choice('579')} {rng.randint(10, 14)}th Gen"]
+    gpus = [lambda: f"NVIDIA GeForce RTX {rng.choice([20, 30, 40])}{rng.choice([50, 60, 70, 80])}{rng.choice(['', ' Ti', ' Super'])}",
+            lambda: f"GeForce GTX 16{rng.choice([50, 60])}",
+            lambda: f"AMD Radeon RX {rng.choice([66, 76, 78])}00{rng.choice(['', 'M', 'S', ' XT', ' XTX'])}",
+            lambda: rng.choice(["Intel Iris Xe Graphics", "Iris Xe Graphics", "Intel UHD Graphics", "AMD Radeon Graphics"])]
+    macs = ["Apple MacBook Air 13-inch M{} chip 8-core CPU 10-core GPU", "Apple MacBook Pro 14-inch M{} Pro"]
+
+    distinct = []
+    for _ in range(5000):
+        if rng.random() < 0.1:
+            distinct.append(f"{rng.choice(macs).format(rng.randint(1, 4))} {rng.choice([8, 16, 24])}GB {rng.choice([256, 512])}GB SSD")
+        else:
+            distinct.append(f"{rng.choice(brands)} Laptop, {rng.choice(cpus)()}, {rng.choice(gpus)()}, "
+                            f"{rng.choice([8, 16, 32])}GB DDR{rng.choice([4, 5])}, {rng.choice([512, 1024])}GB SSD")
+    return [rng.choice(distinct) for _ in range(rows)]
+
+
+def timed(label: str, rows: int, run) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32}{elapsed:8.2f} s  {rows / elapsed:>12,.0f} titles/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    titles = raw_titles(args.rows, args.seed)
+    print(f"{args.rows:,} titles, {len(set(titles)):,} distinct")
+
+    # Regexes alone, every title parsed from scratch
+    parseCpu, parseGpu = computer._parse_cpu.__wrapped__, computer._parse_gpu.__wrapped__
+    timed("uncached", args.rows, lambda: [(parseCpu(title), parseGpu(title)) for title in titles])
+
+    computer._parse_cpu.cache_clear()
+    computer._parse_gpu.cache_clear()
+    timed("parse(), cold cache", args.rows, lambda: [(CPU.parse(title), GPU.parse(title)) for title in titles])
+    timed("parse(), warm cache", args.rows, lambda: [(CPU.parse(title), GPU.parse(title)) for title in titles])
+
+    computer._parse_cpu.cache_clear()
+    computer._parse_gpu.cache_clear()
+    timed("parse_many()", args.rows, lambda: (CPU.parse_many(titles), GPU.parse_many(titles)))
+
+    missed = CPU.parse_many(titles).count(None) + GPU.parse_many(titles).count(None)
+    print(f"Titles without a CPU or GPU found: {missed:,}")
+
+
+
+if __name__ == "__main__":
+    main()
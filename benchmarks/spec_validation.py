@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Per-call cost of validating and canonicalizing CPU/GPU fields
+
+Run from the repository root:  python -m benchmarks.spec_validation --rows 1000000
+"""
+
+
+import argparse
+import gc
+import time
+
+import computer
+from benchmarks.spec_memory import raw_specs
+from computer import CPU, GPU
+
+
+
+def timed(label: str, rows: int, run, repeat: int = 3) -> None:
+    # Best of a few runs, with the garbage collector off as timeit does
+    elapsed = float("inf")
+    gc.disable()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        elapsed = min(elapsed, time.perf_counter() - start)
+    gc.enable()
+    print(f"{label:<36}{elapsed:8.2f} s  {elapsed / rows * 1e9:8.0f} ns per call")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    specs = raw_specs(args.rows, args.seed)
+    cpuArgs = [cpu for cpu, _ in specs]
+    gpuArgs = [gpu for _, gpu in specs]
+
+    timed("CPU._canonical", args.rows, lambda: [CPU._canonical(*spec) for spec in cpuArgs])
+    timed("GPU._canonical", args.rows, lambda: [GPU._canonical(*spec) for spec in gpuArgs])
+    timed("CPU(...)", args.rows, lambda: [CPU(*spec) for spec in cpuArgs])
+    timed("GPU(...)", args.rows, lambda: [GPU(*spec) for spec in gpuArgs])
+
+    # Whole columns at once, only in trees that have the column validator
+    if hasattr(computer, "canonical_column"):
+        brands = [spec[0] for spec in cpuArgs]
+        families = [spec[1] for spec in cpuArgs]
+        timed("canonical_column(CPU_BRANDS)", args.rows,
+              lambda: computer.canonical_column(computer.CPU_BRANDS, brands, "CPU brand"))
+        timed("canonical_column(CPU_FAMILIES)", args.rows,
+              lambda: computer.canonical_column(computer.CPU_FAMILIES, families, "CPU family"))
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite of the Computer hot path, saved as JSON and gated against a baseline
+
+Times construction (CPU/GPU included), check(), create_score(), __str__, to_str, to_row, to_json
+and the to_record -> to_computer round trip over 10k, 100k, ... rows of a seeded synthetic
+catalog, and the memory held per Computer. Each case is the best of --repeat runs with the
+garbage collector off. With --baseline, any case more than --tolerance slower per row than in
+the baseline is reported and the exit status is 1.
+
+Run from the repository root:
+    python -m benchmarks.suite --rows 1000000 --output results.json
+    python -m benchmarks.suite --rows 1000000 --baseline results.json
+"""
+
+
+from collections import deque
+from typing import Iterable
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.spec_memory import raw_specs
+from computer import CPU, GPU, Computer
+
+
+
+BRANDS = {"Laptop": ["HP", "Lenovo", "Dell", "Asus", "Acer", "MSI", "Apple"], "All-in-One": ["HP", "Dell", "Lenovo", "Apple"],
+          "Mini": ["Apple", "Intel", "Beelink", "Asus"], "Tower": ["HP", "Dell", "Lenovo", "CyberPowerPC", "iBUYPOWER"]}
+STYLES = ["Laptop"] * 6 + ["Tower"] * 2 + ["All-in-One", "Mini"]
+RESOLUTIONS = [[1920, 1080]] * 5 + [[1920, 1200], [2560, 1440], [2560, 1600], [2880, 1800], [3840, 2160]]
+INTEGRATED_GPUS = [("Intel", "Integrated"), ("Intel", "Iris Xe"), ("Apple",)]
+
+MEMORY_ROWS = 100_000                                                          # tracemalloc runs slow, memory is sampled
+
+
+
+def synthetic_listings(rows: int, seed: int = 0) -> list:
+    # Constructor kwargs with raw (cpu args, gpu args) in place of the specs: every style, a third of the
+    # machines on integrated graphics, sales on a quarter, and missing ratings, MSRPs and screens
+    rng = random.Random(seed)
+    listings = []
+    for index, (cpuArgs, gpuArgs) in enumerate(raw_specs(rows, seed)):
+        style = rng.choice(STYLES)
+        price = rng.randint(250, 3500)
+        sale = rng.choice([0, 0, 0, 10, 15, 20, 25])
+        portable = style == "Laptop"
+        listings.append(dict(
+            brand=rng.choice(BRANDS[style]), name=f"{rng.choice(['Victus', 'IdeaPad', 'XPS', 'ROG', 'Aspire'])} {rng.randint(1, 99)}",
+            style=style, rating=rng.choice([None, round(rng.uniform(2.5, 5), 1)]), reviews=rng.randint(0, 20_000),
+            price=price, msrp=round(price * 100 / (100 - sale)) if sale else rng.choice([None, price]), sale=sale,
+            weight=round(rng.uniform(2, 7), 2) if portable else rng.choice([None, round(rng.uniform(5, 40), 1)]),
+            dimensions=[round(rng.uniform(11, 16), 1), round(rng.uniform(8, 11), 1), round(rng.uniform(0.5, 1.2), 2)]
+                       if portable else [None, None, None],
+            screen=rng.choice([13.3, 14.0, 15.6, 16.0, 17.3]) if portable else (23.8 if style == "All-in-One" else None),
+            resolution=rng.choice(RESOLUTIONS), refresh=rng.choice([60, 60, 120, 144, 165, 240]),
+            keypad=portable and rng.random() < 0.4, webcam=style in ("Laptop", "All-in-One"), backlit=portable and rng.random() < 0.7,
+            cpu=cpuArgs, gpu=rng.choice(INTEGRATED_GPUS) if rng.random() < 0.33 else gpuArgs,
+            ram=[rng.choice([8, 16, 16, 32, 64]), rng.choice(["DDR4", "DDR5", "LPDDR5"])],
+            storage=[rng.choice([256, 512, 1000, 2000]), rng.choice(["SSD", "SSD", "SSD", "HDD"])],
+            url=f"https://example.com/p/{index}"))
+    return listings
+
+
+def build(listings: list) -> Iterable[Computer]:
+    return (Computer(**{**listing, 'cpu': CPU(*listing['cpu']), 'gpu': GPU(*listing['gpu'])}) for listing in listings)
+
+
+def drain(results: Iterable) -> None:
+    # Consumes results without keeping them, so 1M to_json strings never sit in memory at once
+    deque(results, maxlen = 0)
+
+
+# Case -> function of (listings, computers), timed as a whole
+CASES = {
+    'construct': lambda listings, computers: drain(build(listings)),
+    'check': lambda listings, computers: drain(map(Computer.check, computers)),
+    'create_score': lambda listings, computers: drain(map(Computer.create_score, computers)),
+    'str': lambda listings, computers: drain(map(str, computers)),
+    'to_str': lambda listings, computers: drain(map(Computer.to_str, computers)),
+    'to_row': lambda listings, computers: drain(map(Computer.to_row, computers)),
+    'to_json': lambda listings, computers: drain(map(Computer.to_json, computers)),
+    'round_trip': lambda listings, computers: drain(Computer.to_computer(pc.to_record()) for pc in computers)
+}
+
+
+
+def time_case(case, listings: list, computers: list, repeat: int) -> dict:
+    best = None
+    for _ in range(repeat):
+        gc.disable()
+        start = time.perf_counter()
+        try:
+            case(listings, computers)
+        except Exception as error:                                             # a broken case is a result, not a crash
+            return {'error': f"{type(error).__name__}: {error}"}
+        finally:
+            gc.enable()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {'seconds': best, 'nsPerRow': best / len(listings) * 1e9}
+
+
+def memory_per_row(listings: list) -> float:
+    # Bytes held per Computer, CPU/GPU specs and shared tuples included
+    gc.collect()
+    tracemalloc.start()
+    computers = list(build(listings))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del computers
+    return current / len(listings)
+
+
+def run(sizes: list, seed: int, repeat: int, cases: list) -> dict:
+    results = {'python': sys.version.split()[0], 'platform': platform.platform(), 'seed': seed, 'sizes': {}}
+    for rows in sizes:
+        listings = synthetic_listings(rows, seed)
+        computers = list(build(listings))
+        timings = {name: time_case(CASES[name], listings, computers, repeat) for name in cases}
+        timings['memory'] = {'bytesPerRow': memory_per_row(listings[:MEMORY_ROWS])}
+        results['sizes'][str(rows)] = timings
+        del listings, computers
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    # (rows, case, baseline, current, change) for every case slower, or bigger, than the baseline by more than tolerance
+    found = []
+    for rows, timings in results['sizes'].items():
+        for name, result in timings.items():
+            before = baseline.get('sizes', {}).get(rows, {}).get(name)
+            if before is None:
+                continue
+            metric = 'bytesPerRow' if name == 'memory' else 'nsPerRow'
+            if metric not in result or metric not in before:
+                if 'error' in result and 'error' not in before:
+                    found.append((rows, name, before[metric], None, None))
+                continue
+            change = result[metric] / before[metric] - 1
+            if change > tolerance:
+                found.append((rows, name, before[metric], result[metric], change))
+    return found
+
+
+def report(results: dict, baseline: dict = None) -> None:
+    for rows, timings in results['sizes'].items():
+        print(f"{int(rows):,} rows")
+        for name, result in timings.items():
+            if 'error' in result:
+                line = f"  {name:<14}  failed: {result['error']}"
+            elif name == 'memory':
+                line = f"  {name:<14}{result['bytesPerRow']:10.0f} B per Computer"
+            else:
+                line = f"  {name:<14}{result['seconds']:10.3f} s  {result['nsPerRow']:10.0f} ns per row"
+            before = (baseline or {}).get('sizes', {}).get(rows, {}).get(name, {})
+            metric = 'bytesPerRow' if name == 'memory' else 'nsPerRow'
+            if metric in result and metric in before:
+                line += f"  {result[metric] / before[metric] - 1:+7.1%} vs baseline"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="largest size, sizes go 10k, 100k, ... up to it")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default=",".join(CASES), help="comma separated subset of " + ", ".join(CASES))
+    parser.add_argument("--output", help="JSON file to save the results to")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="slowdown per row allowed against the baseline")
+    args = parser.parse_args()
+
+    cases = args.cases.split(",")
+    for name in cases:
+        if name not in CASES:
+            parser.error(f"unknown case '{name}'")
+    sizes = [min(10_000, args.rows)]
+    while sizes[-1] * 10 <= args.rows:
+        sizes.append(sizes[-1] * 10)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding = "utf-8") as fp:
+            baseline = json.load(fp)
+
+    results = run(sizes, args.seed, args.repeat, cases)
+    report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding = "utf-8") as fp:
+            json.dump(results, fp, indent = 4)
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance)
+        for rows, name, before, after, change in found:
+            print(f"REGRESSION {name} at {int(rows):,} rows: " +
+                  ("now fails" if after is None else f"{before:.0f} -> {after:.0f} ({change:+.1%})"))
+        if found:
+            sys.exit(1)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar container for many Computer listings, scored in one batched pass
+"""
+
+
+from array import array
+from typing import Iterable, Optional
+
+from computer import (FIELD_CHECKS, SCORE_COMPONENTS, SCORE_DEPENDENCIES, Capacity, Computer, Resolution, _decode_field,
+                      cpu_score, feature_score, gpu_score, price_score, ram_score, rating_score,
+                      refresh_score, resolution_score, storage_score, total_score)
+
+
+
+class ComputerCatalog:
+    def __init__(self, computers: Iterable[Computer] = ()):
+        # Basic Info
+        self.brand = []
+        self.name = []
+        self.style = []
+
+        # Reviews & Price (masks hold 1 where the Optional value is present). Numbers are float64
+        # columns, Computer takes ints or floats for any of them
+        self.rating = array('d')
+        self.ratingMask = array('B')
+        self.reviews = array('d')
+
+        self.price = array('d')
+        self.priceMask = array('B')
+        self.msrp = array('d')
+        self.msrpMask = array('B')
+        self.sale = array('d')
+
+        # Screen
+        self.screen = array('d')
+        self.screenMask = array('B')
+        self.resolutionWidth = array('d')
+        self.resolutionHeight = array('d')
+        self.refresh = array('d')
+
+        # Features
+        self.keypad = array('B')
+        self.webcam = array('B')
+        self.backlit = array('B')
+
+        # Hardware
+        self.cpu = []
+        self.cpuFamily = array('q')
+        self.cpuFamilyMask = array('B')
+        self.gpu = []
+        self.gpuGeneration = array('q')
+        self.gpuGenerationMask = array('B')
+        self.gpuPerformance = array('q')
+
+        self.ramSize = array('d')
+        self.ramSizeMask = array('B')
+        self.ramType = []
+        self.storageSize = array('d')
+        self.storageSizeMask = array('B')
+        self.storageType = []
+
+        # URL, Timestamp & Score
+        self.url = []
+        self.timestamp = []
+        self.score = array('d')
+        self.subScores = None                                                  # SCORE_COMPONENTS name -> column, once scored
+
+        self.extend(computers)
+
+
+    def __len__(self) -> int:
+        return len(self.style)
+
+
+    def append(self, computer: Computer) -> None:
+        self.brand.append(computer.brand)
+        self.name.append(computer.name)
+        self.style.append(computer.style)
+
+        _append_optional(self.rating, self.ratingMask, computer.rating)
+        self.reviews.append(computer.reviews)
+
+        _append_optional(self.price, self.priceMask, computer.price)
+        _append_optional(self.msrp, self.msrpMask, computer.msrp)
+        self.sale.append(computer.sale)
+
+        _append_optional(self.screen, self.screenMask, computer.screen)
+        self.resolutionWidth.append(computer.resolution[0])
+        self.resolutionHeight.append(computer.resolution[1])
+        self.refresh.append(computer.refresh)
+
+        self.keypad.append(bool(computer.keypad))
+        self.webcam.append(bool(computer.webcam))
+        self.backlit.append(bool(computer.backlit))
+
+        cpu, gpu = computer.cpu, computer.gpu
+        self.cpu.append(cpu)
+        _append_optional(self.cpuFamily, self.cpuFamilyMask, cpu.family)
+        self.gpu.append(gpu)
+        _append_optional(self.gpuGeneration, self.gpuGenerationMask, gpu.generation)
+        self.gpuPerformance.append(gpu.performance or 0)
+
+        _append_optional(self.ramSize, self.ramSizeMask, computer.ram[0])
+        self.ramType.append(computer.ram[1])
+        _append_optional(self.storageSize, self.storageSizeMask, computer.storage[0])
+        self.storageType.append(computer.storage[1])
+
+        self.url.append(computer.url)
+        self.timestamp.append(computer.timestamp)
+        self.score.append(computer.score)
+
+        if self.subScores is not None:
+            if getattr(computer, 'subScores', None) is None:
+                computer.create_score()
+            for name, value in zip(SCORE_COMPONENTS, computer.subScores):
+                self.subScores[name].append(value)
+
+
+    def extend(self, computers: Iterable[Computer]) -> None:
+        for computer in computers:
+            self.append(computer)
+
+
+    def row(self, index: int) -> list:
+        # Same layout as Computer.to_row(), whole numbers as ints
+        return [self.brand[index], self.name[index], self.style[index],
+                _number(_get_optional(self.rating, self.ratingMask, index)), _number(self.reviews[index]),
+                _number(_get_optional(self.price, self.priceMask, index)),
+                _number(_get_optional(self.msrp, self.msrpMask, index)), _number(self.sale[index]),
+                _number(_get_optional(self.screen, self.screenMask, index)),
+                Resolution(_number(self.resolutionWidth[index]), _number(self.resolutionHeight[index])),
+                _number(self.refresh[index]),
+                self.cpu[index], self.gpu[index],
+                Capacity(_number(_get_optional(self.ramSize, self.ramSizeMask, index)), self.ramType[index]),
+                Capacity(_number(_get_optional(self.storageSize, self.storageSizeMask, index)), self.storageType[index]),
+                self.url[index], self.timestamp[index].isoformat(), self.score[index]]
+
+
+    def rows(self) -> Iterable[list]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+
+    def sub_scores(self) -> dict:
+        # Same nine terms as Computer.create_score, one column each, through the same score functions
+        rating, price, msrp = (_optional(self.rating, self.ratingMask), _optional(self.price, self.priceMask),
+                               _optional(self.msrp, self.msrpMask))
+        family, generation = _optional(self.cpuFamily, self.cpuFamilyMask), _optional(self.gpuGeneration, self.gpuGenerationMask)
+        ram, storage = _optional(self.ramSize, self.ramSizeMask), _optional(self.storageSize, self.storageSizeMask)
+        return {
+            'rating': array('d', map(rating_score, rating)),
+            'price': array('d', map(price_score, price, msrp)),
+            'resolution': array('d', map(resolution_score, self.resolutionWidth, self.resolutionHeight)),
+            'refresh': array('d', map(refresh_score, self.refresh)),
+            'features': array('d', map(feature_score, self.keypad, self.webcam, self.backlit)),
+            'cpu': array('d', map(cpu_score, family)),
+            'gpu': array('d', map(gpu_score, generation, self.gpuPerformance)),
+            'ram': array('d', map(ram_score, ram)),
+            'storage': array('d', map(storage_score, storage))
+        }
+
+
+    def create_score(self) -> array:
+        self.subScores = self.sub_scores()
+        self.score = array('d', map(total_score, zip(*self.subScores.values())))
+        return self.score
+
+
+    def update_many(self, updates: Iterable[tuple]) -> None:
+        # (row, data) pairs as for Computer.update: only the given fields are checked and only the
+        # sub-scores reading them are recomputed for that row. Fields the catalog doesn't store are ignored.
+        # A row is checked in full before any of it is written, so an update that raises leaves its row as it was
+        for row, data in updates:
+            changes = {}
+            for key, value in data.items():
+                if key in _COLUMN_VALUES:
+                    value = _decode_field(key, value)
+                    if key in FIELD_CHECKS:
+                        FIELD_CHECKS[key](value)
+                    changes[key] = value
+
+            writes = [write for key, value in changes.items() for write in _COLUMN_VALUES[key](value)]
+            previous = []
+            try:
+                for name, value in writes:
+                    column = getattr(self, name)
+                    previous.append((column, column[row]))
+                    column[row] = value
+            except (TypeError, ValueError, OverflowError):                     # a value the column can't hold
+                for column, value in reversed(previous):
+                    column[row] = value
+                raise
+
+            if self.subScores is not None:
+                for component in {component for key in changes for component in SCORE_DEPENDENCIES.get(key, ())}:
+                    self.subScores[SCORE_COMPONENTS[component]][row] = _ROW_SUB_SCORES[component](self, row)
+                self.score[row] = total_score([column[row] for column in self.subScores.values()])
+
+        if self.subScores is None:
+            self.create_score()
+
+
+
+# Field -> the (column, value) writes update_many makes for it
+_COLUMN_VALUES = {
+    'brand': lambda value: (('brand', value),),
+    'name': lambda value: (('name', value),),
+    'style': lambda value: (('style', value),),
+    'rating': lambda value: _optional_values('rating', value),
+    'reviews': lambda value: (('reviews', value),),
+    'price': lambda value: _optional_values('price', value),
+    'msrp': lambda value: _optional_values('msrp', value),
+    'sale': lambda value: (('sale', value),),
+    'screen': lambda value: _optional_values('screen', value),
+    'resolution': lambda value: (('resolutionWidth', value[0]), ('resolutionHeight', value[1])),
+    'refresh': lambda value: (('refresh', value),),
+    'keypad': lambda value: (('keypad', bool(value)),),
+    'webcam': lambda value: (('webcam', bool(value)),),
+    'backlit': lambda value: (('backlit', bool(value)),),
+    'cpu': lambda value: (('cpu', value),) + _optional_values('cpuFamily', value.family),
+    'gpu': lambda value: (('gpu', value),) + _optional_values('gpuGeneration', value.generation) +
+                         (('gpuPerformance', value.performance or 0),),
+    'ram': lambda value: _optional_values('ramSize', value[0]) + (('ramType', value[1]),),
+    'storage': lambda value: _optional_values('storageSize', value[0]) + (('storageType', value[1]),),
+    'url': lambda value: (('url', value),),
+    'timestamp': lambda value: (('timestamp', value),)
+}
+
+# One row's sub-scores from the columns, in SCORE_COMPONENTS order
+_ROW_SUB_SCORES = (
+    lambda catalog, row: rating_score(_get_optional(catalog.rating, catalog.ratingMask, row)),
+    lambda catalog, row: price_score(_get_optional(catalog.price, catalog.priceMask, row),
+                                     _get_optional(catalog.msrp, catalog.msrpMask, row)),
+    lambda catalog, row: resolution_score(catalog.resolutionWidth[row], catalog.resolutionHeight[row]),
+    lambda catalog, row: refresh_score(catalog.refresh[row]),
+    lambda catalog, row: feature_score(catalog.keypad[row], catalog.webcam[row], catalog.backlit[row]),
+    lambda catalog, row: cpu_score(_get_optional(catalog.cpuFamily, catalog.cpuFamilyMask, row)),
+    lambda catalog, row: gpu_score(_get_optional(catalog.gpuGeneration, catalog.gpuGenerationMask, row),
+                                   catalog.gpuPerformance[row]),
+    lambda catalog, row: ram_score(_get_optional(catalog.ramSize, catalog.ramSizeMask, row)),
+    lambda catalog, row: storage_score(_get_optional(catalog.storageSize, catalog.storageSizeMask, row))
+)
+
+
+
+def _append_optional(column: array, mask: array, value: Optional[float]) -> None:
+    if value is None:
+        column.append(0)
+        mask.append(0)
+    else:
+        column.append(value)
+        mask.append(1)
+
+
+def _optional_values(name: str, value: Optional[float]) -> tuple:
+    return ((name, 0 if value is None else value), (name + 'Mask', value is not None))
+
+
+def _get_optional(column: array, mask: array, index: int) -> Optional[float]:
+    return column[index] if mask[index] else None
+
+
+def _optional(column: array, mask: array) -> Iterable[Optional[float]]:
+    return (value if present else None for value, present in zip(column, mask))
+
+
+def _number(value: Optional[float]):
+    # Numbers are kept as float64 columns, whole ones come back as ints as they usually are on a Computer
+    return int(value) if isinstance(value, float) and value.is_integer() else value
@@ -7,94 +7,199 @@ Created on Tue Jul 22 13:44:49 2025
 
 
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from itertools import product
+from types import MappingProxyType
+from typing import Iterable, Mapping, NamedTuple, Optional
+import inspect
 import json
+import re
+
+
+
+# Raw spelling -> canonical form for the spec fields with a fixed vocabulary, every casing listed
+# up front so validating a field is one lookup. None maps to itself (field left out)
+def _case_variants(words: dict) -> dict:
+    return {"".join(letters): canonical for word, canonical in words.items()
+            for letters in product(*({letter.lower(), letter.upper()} for letter in word))}
+
+
+CPU_BRANDS = MappingProxyType({None: None, **_case_variants({"intel": "Intel", "amd": "AMD", "apple": "Apple"})})
+CPU_FAMILIES = MappingProxyType({None: None, **{family: family for family in (1, 2, 3, 4, 5, 7, 9)},
+                                 **{str(family): family for family in (1, 2, 3, 4, 5, 7, 9)}})
+GPU_BRANDS = MappingProxyType({None: None, **_case_variants({"nvidia": "NVIDIA", "radeon": "Radeon",
+                                                             "intel": "Intel", "apple": "Apple"})})
+GPU_SERIES = MappingProxyType({None: None, **_case_variants({"rtx": "RTX", "gtx": "GTX", "rx": "RX", "arc": "ARC",
+                                                             "geforce rtx": "GEFORCE RTX", "geforce gtx": "GEFORCE GTX",
+                                                             "uhd": "UHD", "iris xe": "IRIS XE",
+                                                             "integrated": "Integrated"})})
+
+# Usual suffixes per canonical brand, others still go through upper()/capitalize()
+CPU_SUFFIXES = MappingProxyType({brand: MappingProxyType(_case_variants({suffix: suffix.capitalize() if brand == "Apple" else suffix.upper()
+                                                                         for suffix in suffixes}))
+                                 for brand, suffixes in (("Intel", ("h", "hx", "hk", "u", "k", "kf", "ks", "f", "p", "t")),
+                                                         ("AMD", ("h", "hs", "hx", "u", "x", "x3d", "hx3d", "g", "ge")),
+                                                         ("Apple", ("pro", "max", "ultra")),
+                                                         (None, ()))})
+
+
+def _gpu_suffix_case(brand: Optional[str], suffix: str) -> str:
+    # Radeon suffixes are upper case (XT, XTX, GRE), Intel/Apple ones capitalized, others upper case up to two letters (TI, Super)
+    return suffix.lower().capitalize() if brand in ("Intel", "Apple") or (brand != "Radeon" and len(suffix) > 2) else suffix.upper()
+
+
+GPU_SUFFIXES = MappingProxyType({brand: MappingProxyType(_case_variants({suffix: _gpu_suffix_case(brand, suffix) for suffix in suffixes}))
+                                 for brand, suffixes in (("NVIDIA", ("ti", "super", "ti super")),
+                                                         ("Radeon", ("xt", "xtx", "gre", "m", "s", "m xt", "s xt")),
+                                                         ("Intel", ()), ("Apple", ()), (None, ()))})
+
+
+def canonical_column(table: Mapping, values: Iterable, field: str, allowed: Optional[type] = None) -> tuple:
+    # A whole column through one of the tables above, each distinct value looked up once.
+    # Returns (canonical values, {position: error}), None standing in for the values that failed
+    canonical, errors, verdicts = [], {}, {}
+    for position, value in enumerate(values):
+        try:
+            result = verdicts[value, type(value)]                              # 5.0 == 5, but CPU() rejects 5.0
+        except KeyError:
+            result = verdicts[value, type(value)] = _canonical_value(table, value, field, allowed)
+        except TypeError:                                                      # unhashable
+            result = _invalid(field, value, allowed)
+
+        if isinstance(result, Exception):
+            errors[position] = result
+            result = None
+        canonical.append(result)
+    return canonical, errors
+
+
+def _canonical_value(table: Mapping, value, field: str, allowed: Optional[type]):
+    if value is not None and not isinstance(value, (str, int)):
+        return _invalid(field, value, allowed)
+    try:
+        return table[value]
+    except KeyError:
+        return _invalid(field, value, allowed)
+
+
+def _invalid(field: str, value, allowed: Optional[type] = None) -> Exception:
+    # TypeError for a value of the wrong type, ValueError for a string outside the vocabulary
+    error = ValueError if isinstance(value, str) or (allowed and isinstance(value, allowed)) else TypeError
+    return error(f"{field}: {value} is invalid")
 
 
 
 class CPU:
-    def __init__(self,
+    # Specs are immutable and interned: CPU(...) hands back one shared instance per canonical
+    # (brand, family, generation, model, suffix), so millions of listings share a few thousand chips
+    __slots__ = ('brand', 'family', 'generation', 'model', 'suffix', 'edgeCase', '_str')
+    
+    _registry = {}                                                             # canonical key -> CPU
+    
+    def __new__(cls,
             brand: Optional[str] = None,                                       # Intel
             family: Optional[str] = None,                                      # i5
             generation: Optional[int] = None,                                  # 12th Gen
-            model: Optional[int] = None,                                       # 400
+            model: Optional[int] = None,                                       # 400, or "05" when the model number has a leading zero
             suffix: Optional[str] = None):                                     # K
         
-        self.brand = brand
-        self.family = family
-        self.generation = generation
-        self.model = model
-        self.suffix = suffix
-        
-        self.validBrands = ["INTEL", "AMD", "APPLE"]                           # CPU Brands
-        self.validFamilies = [3, 5, 7, 9, "3", "5", "7", "9",                  # Intel/AMD Families
-                              1, 2, 4, "1", "2", "4"]                          # Mac Families
+        key = cls._canonical(brand, family, generation, model, suffix)
+        spec = cls._registry.get(key)
+        if spec is None:
+            spec = object.__new__(cls)
+            for field, value in zip(('brand', 'family', 'generation', 'model', 'suffix'), key):
+                object.__setattr__(spec, field, value)
+            object.__setattr__(spec, 'edgeCase', False)
+            object.__setattr__(spec, '_str', None)
+            spec = cls._registry.setdefault(key, spec)
+        return spec
         
-        self.edgeCase = False
-        
-        self.check()
         
+    @classmethod
+    def _canonical(cls, brand, family, generation, model, suffix) -> tuple:
+        try:
+            brand = CPU_BRANDS[brand]
+        except (KeyError, TypeError):
+            raise _invalid("CPU brand", brand)
+            
+        try:
+            canonicalFamily = CPU_FAMILIES[family]
+        except (KeyError, TypeError):
+            raise _invalid("CPU family", family, int)
+        if family is not None and not isinstance(family, (str, int)):          # 5.0 finds 5 in the table
+            raise TypeError(f"CPU family: {family} is invalid")
+        family = canonicalFamily
         
-    def check(self):
-        if self.brand is not None and not isinstance(self.brand, str):
-            raise TypeError(f"CPU brand: {self.brand} is invalid")
-        elif self.brand is None:
-            None
-        elif self.brand.upper() not in self.validBrands:
-            raise ValueError(f"CPU brand: {self.brand} is invalid")
-        elif isinstance(self.brand, str):
-            if self.brand.upper() == "AMD":
-                self.brand = self.brand.upper()
-            else:
-                self.brand = self.brand.lower().capitalize()
-        else:
-            self.edgeCase = True
+        if generation is not None and not isinstance(generation, int):
+            raise TypeError(f"CPU generation: {generation} is invalid")
+        elif generation is not None and generation < 0:
+            raise ValueError(f"CPU generation: {generation} is invalid")
             
-        if self.family is not None and not isinstance(self.family, (str, int)):
-            raise TypeError(f"CPU family: {self.family} is invalid")
-        elif self.family is None:
-            None
-        elif self.family not in self.validFamilies:
-            raise ValueError(f"CPU family: {self.generation} is invalid")
-        elif isinstance(self.family, (str, int)):
-            self.family = int(self.family)
-        else:
-            self.edgeCase = True
-        
-        if self.generation is not None and not isinstance(self.generation, int):
-            raise TypeError(f"CPU generation: {self.generation} is invalid")
-        elif self.generation is None:
-            None
-        elif isinstance(self.generation, int):
-            if self.generation < 0:
-                raise ValueError(f"CPU generation: {self.generation} is invalid")
-        else:
-            self.edgeCase = True
+        if isinstance(model, str):                                             # digits as written, "450" is 450 but "05" keeps its zero
+            if not (model.isascii() and model.isdigit()):
+                raise ValueError(f"CPU model: {model} is invalid")
+            model = model if len(model) > 1 and model[0] == "0" else int(model)
+        elif model is not None and not isinstance(model, int):
+            raise TypeError(f"CPU model: {model} is invalid")
+        elif model is not None and model < 0:
+            raise ValueError(f"CPU model: {model} is invalid")
             
-        if self.model is not None and not isinstance(self.model, int):
-            raise TypeError(f"CPU model: {self.model} is invalid")
-        elif self.model is None:
-            None
-        elif isinstance(self.model, int):
-            if self.model < 0:
-                raise ValueError(f"CPU model: {self.model} is invalid")
-        else:
-            self.edgeCase = True
+        if suffix is not None and not isinstance(suffix, str):
+            raise TypeError(f"CPU suffix: {suffix} is invalid")
+        elif suffix is not None:
+            suffix = (CPU_SUFFIXES[brand].get(suffix) or
+                      (suffix.lower().capitalize() if brand == "Apple" else suffix.upper()))
             
-        if self.suffix is not None and not isinstance(self.suffix, (str, chr)):
-            raise TypeError(f"CPU suffix: {self.suffix} is invalid")
-        elif self.suffix is None:
-            None
-        elif isinstance(self.suffix, (str, chr)):
-            if self.brand == "Apple":
-                self.suffix = self.suffix.lower().capitalize()
-            else:
-                self.suffix = self.suffix.upper()
-        else:
-            self.edgeCase = True
+        return (brand, family, generation, model, suffix)
+    
+    
+    @property
+    def key(self) -> tuple:
+        return (self.brand, self.family, self.generation, self.model, self.suffix)
+    
+    
+    @classmethod
+    def parse(cls, text: str) -> 'CPU':
+        # CPU named in a listing title, ex: "Intel Core i5-12450H", "AMD Ryzen 7 7840HS", "Apple M2 Pro"
+        cpu = _parse_cpu(text)
+        if cpu is None:
+            raise ValueError(f"No CPU found in '{text}'")
+        return cpu
+    
+    
+    @classmethod
+    def parse_many(cls, titles: Iterable[str]) -> list:
+        # A whole column of titles, each distinct title parsed once, None where no CPU is found
+        titles = list(titles)
+        parsed = {title: _parse_cpu(title) for title in set(titles)}
+        return [parsed[title] for title in titles]
+        
+        
+    def check(self):
+        # Validated once when first interned, and immutable afterwards
+        pass
+    
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CPU is immutable, can't set '{name}'")
+    
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"CPU is immutable, can't delete '{name}'")
+    
+    
+    def __reduce__(self):
+        # Unpickling goes back through the registry
+        return (CPU, self.key)
                 
                 
     def __str__(self) -> str:
+        if self._str is None:
+            object.__setattr__(self, '_str', self._render())
+        return self._str
+    
+    
+    def _render(self) -> str:
         tempStr = ""
         
         match self.brand:
@@ -142,116 +247,133 @@ class CPU:
         return tempStr
     
     
-    # def to_dict(self) -> dict:
-    #     return {
-    #         'brand': self.brand,
-    #         'family': self.family,
-    #         'generation': self.generation,
-    #         'model': self.model,
-    #         'suffix': self.suffix
-    #     }
+    def to_dict(self) -> dict:
+        return {
+            'brand': self.brand,
+            'family': self.family,
+            'generation': self.generation,
+            'model': self.model,
+            'suffix': self.suffix
+        }
     
     
     
 class GPU:
-    def __init__(self,
+    # Immutable and interned like CPU, one shared instance per canonical (brand, series, generation, performance, suffix)
+    __slots__ = ('brand', 'series', 'generation', 'performance', 'suffix', 'edgeCase', '_str')
+    
+    _registry = {}                                                             # canonical key -> GPU
+    
+    def __new__(cls,
             brand: Optional[str] = None,
             series: Optional[str] = None,
             generation: Optional[int] = None,
             performance: Optional[int] = None,
             suffix: Optional[str] = None):
-
-        self.brand = brand
-        self.series = series
-        self.generation = generation
-        self.performance = performance
-        self.suffix = suffix
-
-
-        self.validBrands = ["NVIDIA", "RADEON", "INTEL", "APPLE"]
         
-        self.edgeCase = False
-
-        self.check()
+        key = cls._canonical(brand, series, generation, performance, suffix)
+        spec = cls._registry.get(key)
+        if spec is None:
+            spec = object.__new__(cls)
+            for field, value in zip(('brand', 'series', 'generation', 'performance', 'suffix'), key):
+                object.__setattr__(spec, field, value)
+            object.__setattr__(spec, 'edgeCase', False)
+            object.__setattr__(spec, '_str', None)
+            spec = cls._registry.setdefault(key, spec)
+        return spec
         
         
-    def check(self):
-        if self.brand is not None and not isinstance(self.brand, str):
-            raise TypeError(f"GPU brand: {self.brand} is invalid")
-        elif self.brand is None:
-            None
-        elif self.brand.upper() not in self.validBrands:
-            raise ValueError(f"GPU brand: {self.brand} is invalid")
-        elif isinstance(self.brand, str):
-            if self.brand.upper() == "NVIDIA":
-                self.brand = self.brand.upper()
-            else:
-                self.brand = self.brand.lower().capitalize()
-        else:
-            self.edgeCase = True
-        
-        if self.series is not None and not isinstance(self.series, str):
-            raise TypeError(f"GPU series: {self.series} is invalid")
-        elif self.series is None:
-            None
-        elif self.series.upper() == "INTEGRATED":
-            self.series = self.series.lower().capitalize()
-        elif isinstance(self.series, str):
-            self.series = self.series.upper()
-        else:
-            self.edgeCase = True
+    @classmethod
+    def _canonical(cls, brand, series, generation, performance, suffix) -> tuple:
+        try:
+            brand = GPU_BRANDS[brand]
+        except (KeyError, TypeError):
+            raise _invalid("GPU brand", brand)
+        
+        if series is not None and not isinstance(series, str):
+            raise TypeError(f"GPU series: {series} is invalid")
+        elif series is not None:
+            series = GPU_SERIES.get(series) or series.upper()                  # every casing of Integrated is in the table
             
-        if self.generation is not None and not isinstance(self.generation, int):
-            raise TypeError(f"GPU generation: {self.generation} is invalid")
-        elif self.generation is None:
-            None
-        elif isinstance(self.generation, int):
-            if self.generation < 0:
-                raise ValueError(f"GPU generation: {self.generation} is invalid")
-        else:
-            self.edgeCase = True
+        if generation is not None and not isinstance(generation, int):
+            raise TypeError(f"GPU generation: {generation} is invalid")
+        elif generation is not None and generation < 0:
+            raise ValueError(f"GPU generation: {generation} is invalid")
             
-        if self.performance is not None and not isinstance(self.performance, int):
-            raise TypeError(f"GPU performance: {self.performance} is invalid")
-        elif self.performance is None:
-            None
-        elif isinstance(self.performance, int):
-            if self.performance < 0:
-                raise ValueError(f"GPU performance: {self.performance} is invalid")
-        else:
-            self.edgeCase = True
+        if performance is not None and not isinstance(performance, int):
+            raise TypeError(f"GPU performance: {performance} is invalid")
+        elif performance is not None and performance < 0:
+            raise ValueError(f"GPU performance: {performance} is invalid")
             
-        if self.suffix is not None and not isinstance(self.suffix, (str, chr)):
-            raise TypeError(f"GPU suffix: {self.suffix} is invalid")
-        elif self.suffix is None:
-            None
-        elif isinstance(self.suffix, (str, chr)):
-            if self.brand in ["Intel", "Apple"]:
-                self.suffix = self.suffix.lower().capitalize()
-            else:
-                if len(self.suffix) <= 2: 
-                    self.suffix = self.suffix.upper()
-                else:
-                    self.suffix = self.suffix.lower().capitalize()
-        else:
-            self.edgeCase = True    
+        if suffix is not None and not isinstance(suffix, str):
+            raise TypeError(f"GPU suffix: {suffix} is invalid")
+        elif suffix is not None:
+            suffix = GPU_SUFFIXES[brand].get(suffix) or _gpu_suffix_case(brand, suffix)
+                
+        return (brand, series, generation, performance, suffix)
+    
+    
+    @property
+    def key(self) -> tuple:
+        return (self.brand, self.series, self.generation, self.performance, self.suffix)
+    
+    
+    @classmethod
+    def parse(cls, text: str) -> 'GPU':
+        # GPU named in a listing title, ex: "NVIDIA GeForce RTX 4060", "AMD Radeon RX 7600 XT", "Intel Iris Xe"
+        gpu = _parse_gpu(text)
+        if gpu is None:
+            raise ValueError(f"No GPU found in '{text}'")
+        return gpu
+    
+    
+    @classmethod
+    def parse_many(cls, titles: Iterable[str]) -> list:
+        # A whole column of titles, each distinct title parsed once, None where no GPU is found
+        titles = list(titles)
+        parsed = {title: _parse_gpu(title) for title in set(titles)}
+        return [parsed[title] for title in titles]
                         
+    
+    def check(self):
+        # Validated once when first interned, and immutable afterwards
+        pass
+    
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"GPU is immutable, can't set '{name}'")
+    
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"GPU is immutable, can't delete '{name}'")
+    
+    
+    def __reduce__(self):
+        # Unpickling goes back through the registry
+        return (GPU, self.key)
+            
             
     def __str__(self) -> str:
+        if self._str is None:
+            object.__setattr__(self, '_str', self._render())
+        return self._str
+    
+    
+    def _render(self) -> str:
         tempStr = ""
         
         match self.brand:
             case "NVIDIA":
                 tempStr = "NVIDIA " + self.series
                 if self.generation:
-                    tempStr += " " + str(self.generation) + str(self.performance)
+                    tempStr += " " + str(self.generation) + f"{self.performance:02}"
                     if self.suffix:
                         tempStr += " " + self.suffix
             
             case "Radeon":
                 tempStr = "Radeon " + self.series
                 if self.generation:
-                    tempStr += " " + str(self.generation) + str(self.performance)
+                    tempStr += " " + str(self.generation) + f"{self.performance:02}"
                     if self.suffix:
                         tempStr += " " + self.suffix
                         
@@ -275,18 +397,255 @@ class GPU:
         return tempStr
     
     
-    # def to_dict(self) -> dict:
-    #     return {
-    #         'brand': self.brand,
-    #         'series': self.series,
-    #         'generation': self.generation,
-    #         'performance': self.performance,
-    #         'suffix': self.suffix
-    #     }
+    def to_dict(self) -> dict:
+        return {
+            'brand': self.brand,
+            'series': self.series,
+            'generation': self.generation,
+            'performance': self.performance,
+            'suffix': self.suffix
+        }
+    
     
+
+# Spec patterns for CPU.parse / GPU.parse, model numbers split like __str__ joins them:
+# Intel i5-12450H -> generation 12, model 450; i7-1360P -> 13, 60; i3-1005G1 -> 10, "05"; i7-8750H -> 8, 750
+# Ryzen 7 7840HS -> 7, 840; RTX 4060 -> 40, 60; RX 7600 -> 76, 0 and RX 9060 XT -> 90, 60
+_INTEL_CPU = re.compile(r"\b(?:core\s*)?i([3579])(?:(?:[\s-]+|-?)(\d{4,5})((?:[a-z]{1,2}\d?)?)\b|\s+(\d{1,2})(?:st|nd|rd|th)\s+gen\b)?", re.IGNORECASE)
+_AMD_CPU = re.compile(r"\bryzen\s*([3579])(?:\s+(?:pro\s+)?(\d)(\d{3})([a-z]{0,2}(?:3d)?)\b|\s+(\d{1,2})(?:st|nd|rd|th)\s+gen\b)?", re.IGNORECASE)
+_APPLE_CPU = re.compile(r"\bm([1-4])(?:\s+(pro|max|ultra))?\b", re.IGNORECASE)
+_APPLE_CONTEXT = re.compile(r"\b(?:apple|mac\s*book|imac|mac\s+(?:mini|studio|pro))\b", re.IGNORECASE)
+
+_NVIDIA_GPU = re.compile(r"\b(?:geforce\s+)?(rtx|gtx)\s*(\d{1,2})(\d{2})\b(?:\s*(ti\s+super|ti|super)\b)?", re.IGNORECASE)
+_RADEON_GPU = re.compile(r"\bradeon\s+(rx)\s*(\d{1,2})(\d{2})([ms]?)\b(?:\s*(xtx|xt|gre)\b)?", re.IGNORECASE)
+_RADEON_INTEGRATED = re.compile(r"\bradeon\s+(?:\d{3}m\s+)?(?:graphics|integrated)\b", re.IGNORECASE)
+_INTEL_GPU = re.compile(r"\b(?:intel\s+)?(iris\s+xe|iris\s+plus)\b|\bintel\s+(?:(uhd|arc)|(integrated))\b", re.IGNORECASE)
+_APPLE_GPU = re.compile(r"\bapple\s+integrated\b|\b\d{1,2}-core\s+gpu\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize = 1 << 16)
+def _parse_cpu(text: str) -> Optional[CPU]:
+    matches = [(match.start(), brand, match) for brand, pattern in (("Intel", _INTEL_CPU), ("AMD", _AMD_CPU))
+               if (match := pattern.search(text))]
+    if _APPLE_CONTEXT.search(text) and (match := _APPLE_CPU.search(text)):
+        matches.append((match.start(), "Apple", match))
+    if not matches:
+        return None
     
+    _, brand, match = min(matches, key = lambda found: found[0])
+    if brand == "Apple":
+        return CPU("Apple", int(match[1]), None, None, match[2])
+    if brand == "Intel":
+        if not match[2]:
+            return CPU("Intel", int(match[1]), int(match[4]) if match[4] else None)
+        generation, model = _intel_model(match[2])
+        return CPU("Intel", int(match[1]), generation, model, match[3] or None)
+    generation = match[2] or match[5]
+    return CPU(brand, int(match[1]), int(generation) if generation else None, match[3] or None, match[4] or None)
+
+
+def _intel_model(digits: str) -> tuple:
+    # (generation, model) of an Intel model number: 8750 -> 8, 750; 12450 -> 12, 450; 1360 and 1135 -> 13, 60 and 11, 35.
+    # The model stays a digit string so CPU keeps a leading zero: 1005 -> 10, "05"
+    if len(digits) == 5 or "10" <= digits[:2] <= "14":
+        return int(digits[:2]), digits[2:]
+    return int(digits[0]), digits[1:]
+
+
+@lru_cache(maxsize = 1 << 16)
+def _parse_gpu(text: str) -> Optional[GPU]:
+    # Dedicated cards first, a title naming one usually mentions the integrated graphics too.
+    # NVIDIA series are kept as plain RTX/GTX so "GeForce RTX 4060" and "RTX 4060" intern to one spec
+    if match := _NVIDIA_GPU.search(text):
+        return GPU("NVIDIA", match[1], int(match[2]), int(match[3]), match[4] and " ".join(match[4].split()))
+    if match := _RADEON_GPU.search(text):
+        return GPU("Radeon", match[1], int(match[2]), int(match[3]), " ".join(filter(None, (match[4], match[5]))) or None)
+    if match := _INTEL_GPU.search(text):
+        series = match[1] or match[2]
+        return GPU("Intel", " ".join(series.split()) if series else "Integrated")
+    if _RADEON_INTEGRATED.search(text):
+        return GPU("Radeon", "Integrated")
+    if _APPLE_GPU.search(text) or (_APPLE_CONTEXT.search(text) and _APPLE_CPU.search(text)):
+        return GPU("Apple", "Integrated")
+    return None
+
+
+
+# Small fixed records for Computer's compound fields, immutable so defaults can be shared safely
+class Dimensions(NamedTuple):
+    length: Optional[float] = None
+    width: Optional[float] = None
+    thickness: Optional[float] = None
+
+
+class Resolution(NamedTuple):
+    width: int = 1920
+    height: int = 1080
+
+
+class Capacity(NamedTuple):
+    size: Optional[int] = None                                                 # GB
+    kind: Optional[str] = None                                                 # ex: DDR4, SSD
+
+
+_compoundCache = {Dimensions: {}, Resolution: {}, Capacity: {}}
+
+
+def _compound(kind: type, value) -> tuple:
+    # Listings repeat the same few resolutions, RAM and storage configs, so equal values share one tuple.
+    # Keyed on the part types too, (512.0, 'SSD') == (512, 'SSD') but prints differently
+    if type(value) is kind:
+        return value
+    value = kind(*value)
+    cache = _compoundCache[kind]
+    try:
+        return cache.setdefault((value, tuple(map(type, value))), value) if len(cache) < 65536 else value
+    except TypeError:                                                          # unhashable parts, keep as is
+        return value
+
+
+
+# Per-field checks, shared by Computer.check and the column checks in Computer.from_records
+def _check_style(style) -> None:
+    if style not in {"Laptop", "All-in-One", "Mini", "Tower"}:
+        raise ValueError(f"Invalid style '{style}'. Must be Laptop, All-in-One, Mini, or Tower.")
+
+def _check_rating(rating) -> None:
+    if rating is not None and not (0.0 <= rating <= 5.0):
+        raise ValueError(f"Rating of {rating} is outside of range 0 – 5")
+
+def _check_reviews(reviews) -> None:
+    if reviews < 0:
+        raise ValueError(f"Reviews of {reviews} is invalid")
+
+def _check_price(price) -> None:
+    if price is not None and price < 0:
+        raise ValueError(f"Price of {price} is invalid")
+
+def _check_msrp(msrp) -> None:
+    if msrp is not None and msrp < 0:
+        raise ValueError(f"List price of {msrp} is invalid")
+
+def _check_sale(sale) -> None:
+    if not (0 <= sale <= 100):
+        raise ValueError(f"Sale of {sale} is outside of range 0 – 100")
+
+def _check_weight(weight) -> None:
+    if weight is not None and weight < 0:
+        raise ValueError(f"Weight of {weight} is invalid")
+
+def _check_dimensions(dimensions) -> None:
+    if any(d is not None and d < 0 for d in dimensions):
+        raise ValueError(f"Invalid dimensions: {dimensions}")
+
+def _check_screen(screen) -> None:
+    if screen is not None and screen < 0:
+        raise ValueError(f"Screen size of {screen} is invalid")
+
+def _check_resolution(resolution) -> None:
+    if any(r < 0 for r in resolution):
+        raise ValueError(f"Invalid resolution: {resolution}")
+
+def _check_refresh(refresh) -> None:
+    if refresh < 0:
+        raise ValueError(f"Refresh rate of {refresh} is invalid")
+
+def _check_cpu(cpu) -> None:
+    if not isinstance(cpu, CPU):
+        raise TypeError(f"CPU: {cpu} is invalid")
+    cpu.check()
+
+def _check_gpu(gpu) -> None:
+    if not isinstance(gpu, GPU):
+        raise TypeError(f"GPU: {gpu} is invalid")
+    gpu.check()
+
+def _check_ram(ram) -> None:
+    if ram[0] is not None and ram[0] < 0:
+        raise ValueError(f"RAM of {ram[0]} GB is invalid")
+
+def _check_storage(storage) -> None:
+    if storage[0] is not None and storage[0] < 0:
+        raise ValueError(f"Storage of {storage[0]} GB is invalid")
+
+
+FIELD_CHECKS = {
+    'style': _check_style,
+    'rating': _check_rating, 'reviews': _check_reviews,
+    'price': _check_price, 'msrp': _check_msrp, 'sale': _check_sale,
+    'weight': _check_weight, 'dimensions': _check_dimensions,
+    'screen': _check_screen, 'resolution': _check_resolution, 'refresh': _check_refresh,
+    'cpu': _check_cpu, 'gpu': _check_gpu,
+    'ram': _check_ram, 'storage': _check_storage
+}
+
+
+
+# The nine sub-scores of Computer.create_score, over raw values so ComputerCatalog can share them
+def rating_score(rating) -> float:
+    return (rating * 20) if rating is not None else 90
+
+def price_score(price, msrp) -> float:
+    return min((msrp - price) / 5, 100) if (msrp is not None and price is not None) else 0
+
+def resolution_score(width, height) -> float:
+    return min(((width * height) / (1920 * 1080)) * 50, 100)
+
+def refresh_score(refresh) -> float:
+    return min(refresh / 2.4, 100)
+
+def feature_score(keypad, webcam, backlit) -> float:
+    return sum([keypad, webcam, backlit]) * 33.4
+
+def cpu_score(family) -> float:
+    return min((family - 1) * 12.5, 100) if family is not None else 0
+
+def gpu_score(generation, performance) -> float:
+    return min(generation + performance - 40, 100) if generation is not None else 20
+
+def ram_score(size) -> float:
+    return min(size * 1.5625, 100) if size is not None else 6.25
+
+def storage_score(size) -> float:
+    return min(size / 20, 100) if size is not None else 6
+
+def total_score(subScores) -> float:
+    return min(round(sum(subScores) / 9, 2), 100)
+
+
+SCORE_COMPONENTS = ('rating', 'price', 'resolution', 'refresh', 'features', 'cpu', 'gpu', 'ram', 'storage')
+
+# Field -> positions in SCORE_COMPONENTS of the sub-scores reading it
+SCORE_DEPENDENCIES = {
+    'rating': (0,), 'price': (1,), 'msrp': (1,), 'resolution': (2,), 'refresh': (3,),
+    'keypad': (4,), 'webcam': (4,), 'backlit': (4,),
+    'cpu': (5,), 'gpu': (6,), 'ram': (7,), 'storage': (8,)
+}
+
+_SUB_SCORES = (
+    lambda pc: rating_score(pc.rating),
+    lambda pc: price_score(pc.price, pc.msrp),
+    lambda pc: resolution_score(pc.resolution[0], pc.resolution[1]),
+    lambda pc: refresh_score(pc.refresh),
+    lambda pc: feature_score(pc.keypad, pc.webcam, pc.backlit),
+    lambda pc: cpu_score(pc.cpu.family),
+    lambda pc: gpu_score(pc.gpu.generation, pc.gpu.performance),
+    lambda pc: ram_score(pc.ram[0]),
+    lambda pc: storage_score(pc.storage[0])
+)
+
+
 
 class Computer:
+    __slots__ = ('brand', 'name', 'style',
+                 'rating', 'reviews', 'price', 'msrp', 'sale',
+                 'weight', 'dimensions', 'screen', 'resolution', 'refresh',
+                 'keypad', 'webcam', 'backlit',
+                 'cpu', 'gpu', 'ram', 'storage',
+                 'url', 'timestamp', 'score',
+                 'subScores',                                                  # cached create_score terms, see SCORE_COMPONENTS
+                 '_pending')                                                   # raw record of a lazy from_records row
+    
     def __init__(self,
             # Basic Info
             brand: Optional[str] = None,                                       # ex: Hp, Lenovo
@@ -303,11 +662,10 @@ class Computer:
             
             # Size & Screen
             weight: Optional[float] = None,                                    # pounds (lb)
-            dimensions: [Optional[float], Optional[float], Optional[float]] = 
-                            [None, None, None],                                # Length, Width, Thickness iches (in)
+            dimensions: Dimensions = Dimensions(),                             # Length, Width, Thickness iches (in)
             
             screen: Optional[float] = None,                                    # diagonal (in), None for Tower
-            resolution: [int, int] = [1920, 1080],                             # Width x Height (px)
+            resolution: Resolution = Resolution(),                             # Width x Height (px)
             refresh: int = 60,                                                 # Hz
             
             # Features
@@ -319,8 +677,8 @@ class Computer:
             cpu: CPU = CPU(),
             gpu: GPU = GPU(),
             
-            ram: [Optional[int], Optional[str]] = [None, None],                # (GB, type)
-            storage: [Optional[int], Optional[str]] = [None, None],            # (GB, SSD or HDD)
+            ram: Capacity = Capacity(),                                        # (GB, type)
+            storage: Capacity = Capacity(),                                    # (GB, SSD or HDD)
             
             # URL & Timestamp
             url: Optional[str] = None,                                         # URL
@@ -338,10 +696,10 @@ class Computer:
         self.sale = sale
         
         self.weight = weight
-        self.dimensions = dimensions
+        self.dimensions = _compound(Dimensions, dimensions)
         
         self.screen = screen
-        self.resolution = resolution
+        self.resolution = _compound(Resolution, resolution)
         self.refresh = refresh
         
         self.keypad = keypad
@@ -350,81 +708,53 @@ class Computer:
         
         self.cpu = cpu
         self.gpu = gpu
-        self.ram = ram
-        self.storage = storage
+        self.ram = _compound(Capacity, ram)
+        self.storage = _compound(Capacity, storage)
         
         self.url = url
-        self.timestamp = datetime.now()
+        self.timestamp = timestamp if timestamp is not None else datetime.now()
         self.score = 0
 
         self.check()
     
+    
+    def __getattr__(self, name):
+        # Only reached for unset slots: records from from_records(validate="lazy") load here on first read
+        if name == '_pending':
+            raise AttributeError(f"'Computer' object has no attribute '{name}'")
+        try:
+            pending = self._pending
+        except AttributeError:
+            raise AttributeError(f"'Computer' object has no attribute '{name}'") from None
+        
+        del self._pending
+        loaded = []
+        for key, value in pending.items():
+            try:
+                object.__getattribute__(self, key)
+            except AttributeError:
+                setattr(self, key, value)
+                loaded.append(key)
+        try:
+            self.check()
+        except (TypeError, ValueError):
+            for key in loaded:
+                delattr(self, key)
+            self._pending = pending
+            raise
+        return getattr(self, name)
 
 
     def check(self) -> None:
-        # Style check
-        if self.style not in {"Laptop", "All-in-One", "Mini", "Tower"}:
-            raise ValueError(f"Invalid style '{self.style}'. Must be Laptop, All-in-One, Mini, or Tower.")
-
-        # Reviews checks
-        if self.rating is not None and not (0.0 <= self.rating <= 5.0):
-            raise ValueError(f"Rating of {self.rating} is outside of range 0 – 5")
-        if self.reviews < 0:
-            raise ValueError(f"Reviews of {self.reviews} is invalid")
-
-        # Price checks
-        if self.price is not None and self.price < 0:
-            raise ValueError(f"Price of {self.price} is invalid")
-        if self.msrp is not None and self.msrp < 0:
-            raise ValueError(f"List price of {self.msrp} is invalid")
-        if not (0 <= self.sale <= 100):
-            raise ValueError(f"Sale of {self.sale} is outside of range 0 – 100")
-
-        # Size & Screen checks
-        if self.weight is not None and self.weight < 0:
-            raise ValueError(f"Weight of {self.weight} is invalid")
-        if any(d is not None and d < 0 for d in self.dimensions):
-            raise ValueError(f"Invalid dimensions: {self.dimensions}")
-        if self.screen is not None and self.screen < 0:
-            raise ValueError(f"Screen size of {self.screen} is invalid")
-        if any(r < 0 for r in self.resolution):
-            raise ValueError(f"Invalid resolution: {self.resolution}")
-        if self.refresh < 0:
-            raise ValueError(f"Refresh rate of {self.refresh} is invalid")
-
-        # CPU & GPU check
-        self.cpu.check()
-        self.gpu.check()
-
-        # RAM & storage checks
-        if self.ram[0] is not None and self.ram[0] < 0:
-            raise ValueError(f"RAM of {self.ram[0]} GB is invalid")
-        if self.storage[0] is not None and self.storage[0] < 0:
-            raise ValueError(f"Storage of {self.storage[0]} GB is invalid")
+        for field, fieldCheck in FIELD_CHECKS.items():
+            fieldCheck(getattr(self, field))
             
         self.score = self.create_score()
             
             
     def create_score(self) -> float:
-        ratingScore = (self.rating * 20) if self.rating is not None else 90
-        
-        priceScore = min((self.msrp - self.price) / 5, 100) if (self.msrp is not None and self.price is not None) else 0
-        
-        resolutionScore = min(((self.resolution[0] * self.resolution[1]) / (1920 * 1080)) * 50, 100)
-        
-        refreshScore = min(self.refresh / 2.4, 100)
-        
-        featureScore = sum([self.keypad, self.webcam, self.backlit]) * 33.4
-        
-        cpuScore = min((self.cpu.family - 1) * 12.5, 100) if self.cpu.family is not None else 0
-        
-        gpuScore = min(self.gpu.generation + self.gpu.performance - 40, 100) if self.gpu.generation is not None else 20
-        
-        ramScore = min(self.ram[0] * 1.5625, 100) if self.ram[0] is not None else 6.25
-        
-        storageScore = min(self.storage[0] / 20, 100) if self.storage[0] is not None else 6
-        
-        self.score = min(round((ratingScore + priceScore + resolutionScore + refreshScore + featureScore + cpuScore + gpuScore + ramScore + storageScore) / 9, 2), 100)
+        self.subScores = [subScore(self) for subScore in _SUB_SCORES]
+        self.score = total_score(self.subScores)
         return self.score
     
     
@@ -474,8 +804,8 @@ class Computer:
         priceString = f"${self.price}, " if self.price is not None else ""
         basicString = f"{self.screen or None}\" {self.brand or 'Unknown'} {self.name or ''} {self.style}"
         
-        cpuString = f", {cpu[0]} {cpu[1]}-{cpu[2]}{cpu[3]}{cpu[4]}" if cpu[0] and cpu[1] is not None else ""
-        gpuString = f", {gpu[0]} {gpu[1]} {gpu[2]}{gpu[3]} {gpu[4]}" if gpu[0] and gpu[2] and gpu[3] is not None else ""
+        cpuString = f", {cpu}" if cpu.brand and cpu.family is not None else ""
+        gpuString = f", {gpu}" if gpu.brand and gpu.generation and gpu.performance is not None else ""
         ramString = f", {self.ram[0]} GB of {self.ram[1]}" if self.ram[0] else ""
         storageString = f", {self.storage[0]} GB {self.storage[1]}" if self.storage[0] else ""
         
@@ -511,9 +841,16 @@ class Computer:
     
     
     def to_json(self) -> json:
+        return json.dumps(self.to_record(), indent = 4)
+    
+    
+    def to_record(self) -> dict:
+        # to_dict with plain JSON types, CPU/GPU as dicts and the timestamp as an ISO string
         tempDict = self.to_dict()
+        tempDict['cpu'] = tempDict['cpu'].to_dict()
+        tempDict['gpu'] = tempDict['gpu'].to_dict()
         tempDict['timestamp'] = tempDict['timestamp'].isoformat()
-        return json.dumps(tempDict, indent = 4)
+        return tempDict
     
     
     
@@ -521,18 +858,186 @@ class Computer:
         tempComputer = Computer()
         for key, val in data.items():
             if hasattr(tempComputer, key):
-                setattr(tempComputer, key, val)
+                setattr(tempComputer, key, _decode_field(key, val))
         
         tempComputer.check()
         return tempComputer
         
     
     def update(self, data: dict) -> None:
+        # Checks only the given fields and recomputes only the sub-scores reading them
+        changes = {}
         for key, value in data.items():
             if hasattr(self, key):
-                setattr(self, key, value)
+                value = _decode_field(key, value)
+                if key in FIELD_CHECKS:
+                    FIELD_CHECKS[key](value)
+                changes[key] = value
         
-        self.check()
+        for key, value in changes.items():
+            setattr(self, key, value)
+        
+        subScores = getattr(self, 'subScores', None)
+        if subScores is None:
+            self.create_score()
+            return
+        
+        for component in {component for key in changes for component in SCORE_DEPENDENCIES.get(key, ())}:
+            subScores[component] = _SUB_SCORES[component](self)
+        self.score = total_score(subScores)
+        
+        
+    @staticmethod
+    def from_records(records: Iterable[dict], validate: str = "batch") -> tuple:
+        # Returns (computers, failures), failures being (row index, error) pairs for the records left out
+        #   batch: every field is checked column by column, each distinct value once, then valid rows are scored
+        #   lazy:  checking and scoring wait until a field is first read, which raises for a bad record
+        #   none:  records are trusted as is, a missing score is still computed
+        if validate not in {"batch", "lazy", "none"}:
+            raise ValueError(f"Invalid validate mode '{validate}'. Must be batch, lazy, or none.")
+        
+        rows, failures = [], {}
+        for index, record in enumerate(records):
+            try:
+                rows.append((index, _record_fields(record, decodeSpecs = validate != "batch")))
+            except (TypeError, ValueError) as error:
+                failures[index] = error
+        
+        if validate == "batch":
+            for field, kind in (('cpu', CPU), ('gpu', GPU)):
+                for index, error in _decode_spec_column(rows, field, kind):
+                    failures.setdefault(index, error)
+            for field, fieldCheck in FIELD_CHECKS.items():
+                for index, error in _check_column(rows, field, fieldCheck):
+                    failures.setdefault(index, error)
+            rows = [(index, fields) for index, fields in rows if index not in failures]
+        
+        computers = []
+        for index, fields in rows:
+            computer = Computer.__new__(Computer)
+            if validate == "lazy":
+                computer._pending = fields
+            else:
+                for key, value in fields.items():
+                    setattr(computer, key, value)
+                if validate == "batch" or computer.score is None:
+                    try:
+                        computer.score = computer.create_score()
+                    except (AttributeError, TypeError, ValueError) as error:       # unchecked specs may not be specs
+                        failures[index] = error
+                        continue
+            computers.append(computer)
+        
+        return computers, sorted(failures.items())
+    
+    
+    
+# Computer's constructor defaults, these fill in whatever a record leaves out
+_RECORD_DEFAULTS = {name: parameter.default for name, parameter
+                    in inspect.signature(Computer.__init__).parameters.items() if name != 'self'}
+_RECORD_DEFAULTS['score'] = None
+
+
+_RECORD_TYPES = {'dimensions': Dimensions, 'resolution': Resolution, 'ram': Capacity, 'storage': Capacity}
+
+
+def _decode_field(key: str, value):
+    # JSON records carry CPU/GPU as dicts, compound fields as lists and timestamps as ISO strings
+    if key == 'cpu' and isinstance(value, dict):
+        return CPU(**value)
+    if key == 'gpu' and isinstance(value, dict):
+        return GPU(**value)
+    if key in _RECORD_TYPES and isinstance(value, (list, tuple)):
+        return _compound(_RECORD_TYPES[key], value)
+    if key == 'timestamp' and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _record_fields(record: dict, decodeSpecs: bool = True) -> dict:
+    # decodeSpecs=False leaves CPU/GPU dicts for _decode_spec_column
+    if not isinstance(record, dict):
+        raise TypeError(f"Record: {record} is invalid")
+    fields = dict(_RECORD_DEFAULTS)
+    for key, value in record.items():
+        if key in fields:
+            fields[key] = _decode_field(key, value) if decodeSpecs or key not in ('cpu', 'gpu') else value
+    
+    if fields['timestamp'] is None:
+        fields['timestamp'] = datetime.now()
+    return fields
+
+
+def _decode_spec_column(rows: list, field: str, kind: type) -> Iterable[tuple]:
+    # CPU/GPU dicts of a whole column to specs, each distinct dict decoded once: brands (and CPU families) go
+    # through canonical_column, the rest through the spec's constructor. Yields (row index, error) for each failing row
+    positions, distinct, pending = {}, [], []
+    for index, fields in rows:
+        value = fields[field]
+        if not isinstance(value, dict):
+            continue
+        try:
+            key = tuple(value.items())
+            position = positions.setdefault(key, len(distinct))
+        except TypeError:                                                      # unhashable parts, decoded on its own
+            try:
+                fields[field] = kind(**value)
+            except (TypeError, ValueError) as error:
+                yield index, error
+            continue
+        if position == len(distinct):
+            distinct.append(value)
+        pending.append((position, fields, index))
+
+    name = "CPU" if kind is CPU else "GPU"
+    brands, errors = canonical_column(CPU_BRANDS if kind is CPU else GPU_BRANDS, [value.get('brand') for value in distinct],
+                                      f"{name} brand")
+    canonical = [{'brand': brand} for brand in brands]
+    if kind is CPU:
+        families, familyErrors = canonical_column(CPU_FAMILIES, [value.get('family') for value in distinct], "CPU family", int)
+        errors = {**familyErrors, **errors}                                    # the brand is checked first, as in CPU()
+        for fields, family in zip(canonical, families):
+            fields['family'] = family
+
+    specs = []
+    for position, value in enumerate(distinct):
+        spec = errors.get(position)
+        if spec is None:
+            try:
+                spec = kind(**{**value, **canonical[position]})
+            except (TypeError, ValueError) as error:
+                spec = error
+        specs.append(spec)
+
+    for position, fields, index in pending:
+        if isinstance(specs[position], Exception):
+            yield index, specs[position]
+        else:
+            fields[field] = specs[position]
+
+
+def _check_column(rows: list, field: str, fieldCheck) -> Iterable[tuple]:
+    # Runs fieldCheck once per distinct value in the column and yields (row index, error) for each failing row
+    verdicts = {}
+    for index, fields in rows:
+        value = fields[field]
+        try:
+            error = verdicts[value]
+        except KeyError:
+            error = verdicts[value] = _field_error(fieldCheck, value)
+        except TypeError:
+            error = _field_error(fieldCheck, value)
+        
+        if error is not None:
+            yield index, error
+
+
+def _field_error(fieldCheck, value) -> Optional[Exception]:
+    try:
+        fieldCheck(value)
+    except (TypeError, ValueError) as error:
+        return error
+    return None
     
     
     
@@ -589,4 +1094,4 @@ if __name__ == "__main__":
     # pcDict = pc.to_dict()
     # pcJson = pc.to_json()
     
-    # score = pc.score
\ No newline at end of file
+    # score = pc.score
\ No newline at end of file
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Sharded multi-process crawls with resumable checkpoints
+
+The URL frontier is split across worker processes by host, so each host's politeness limits
+are kept by one ScrapePipeline. Workers fetch and parse pages and send the Computers and the
+links found back to the coordinator, which appends the Computers to one JSON Lines sink and
+hands new links to the shard owning their host.
+
+With a cacheDirectory each worker keeps its own ResponseCache in a subdirectory per shard,
+so pages unchanged since an earlier crawl are not parsed again but their links, read from
+the cached copy, are still followed. Pages pending in a checkpoint may have been cached by the
+run that was stopped, so when unchanged their cached copy is parsed rather than skipped.
+
+Completed pages are appended to a log next to the sink. Every checkpointEvery pages the
+coordinator flushes both and atomically replaces a checkpoint holding the pending frontier and
+the length of each file. A restart truncates both back to those lengths and carries on with the
+pending pages only, so pages completed before the checkpoint are never fetched again and none
+of their listings is written twice.
+"""
+
+
+from collections import Counter
+from typing import Iterable, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import queue
+import zlib
+
+from httpcache import ResponseCache
+from jsonl import dump_jsonl
+from parallel import _START_METHOD
+from scrape import ScrapePipeline, SiteParser, parse_page
+
+
+
+CHECKPOINT = "checkpoint.json"
+SINK = "listings.jsonl"
+PAGES = "pages.log"                                                            # completed URLs, one per line
+
+
+
+class CrawlCoordinator:
+    def __init__(self,
+            parsers: Iterable[SiteParser],
+            directory: str,                                                    # checkpoint and sink, resumed from when present
+            shards: int = 4,                                                   # worker processes
+            checkpointEvery: int = 100,                                        # pages between checkpoints
+            cacheDirectory: Optional[str] = None,                              # per-shard ResponseCaches, kept across crawls
+            **options):                                                        # ScrapePipeline options per worker, ex: perHost, rate
+
+        if 'cache' in options:
+            raise ValueError("A ResponseCache can't be shared by worker processes, pass cacheDirectory instead")
+
+        self.parsers = list(parsers)
+        self.directory = directory
+        self.shards = shards
+        self.checkpointEvery = checkpointEvery
+        self.cacheDirectory = cacheDirectory
+        self.options = options
+        self._hosts = {host for parser in self.parsers for host in parser.hosts}
+
+        self.stats = Counter()                                                 # pages, listings, rejected, failed, links, resumed
+        self.failures = {}                                                     # url -> error message, retried on resume
+
+        os.makedirs(directory, exist_ok = True)
+        self.checkpointPath = os.path.join(directory, CHECKPOINT)
+        self.sinkPath = os.path.join(directory, SINK)
+        self.pagesPath = os.path.join(directory, PAGES)
+
+
+    def shard_of(self, url: str) -> int:
+        # Stable across runs and processes, unlike hash()
+        return zlib.crc32((urlsplit(url).hostname or "").encode()) % self.shards
+
+
+    def run(self, seeds: Iterable[str] = (), maxPages: Optional[int] = None) -> Counter:
+        # Crawls from the checkpoint's frontier plus seeds not seen yet, until the frontier is empty or maxPages
+        # more pages are done. Returns self.stats
+        done, pending, lengths = self._load()
+        self.stats['resumed'] += len(done)
+        frontier = list(dict.fromkeys(pending + [url for url in map(_normalize, seeds) if url not in done]))
+        seen = done | set(frontier)
+
+        context = multiprocessing.get_context(_START_METHOD)
+        inboxes = [context.Queue() for _ in range(self.shards)]
+        outbox = context.Queue()
+        workers = [context.Process(target = _crawl_worker, daemon = True,
+                                   args = (self.parsers, self.options, self._shard_cache(shard), self.checkpointEvery, inbox, outbox))
+                   for shard, inbox in enumerate(inboxes)]
+        for worker in workers:
+            worker.start()
+
+        outstanding = set()
+        resumed = set(pending)
+        for url in frontier:
+            outstanding.add(url)
+            inboxes[self.shard_of(url)].put((url, url in resumed))
+
+        with open(self.sinkPath, "ab+") as sinkBytes, open(self.pagesPath, "ab+") as pagesLog:
+            for fp, length in ((sinkBytes, lengths['sink']), (pagesLog, lengths['pages'])):
+                fp.truncate(length)                                            # written after the last checkpoint
+                fp.seek(length)
+            sink = io.TextIOWrapper(sinkBytes, encoding = "utf-8", write_through = True)
+            try:
+                pages = 0
+                while outstanding and (maxPages is None or pages < maxPages):
+                    url, computers, links, rejected, error = self._next_result(outbox, workers)
+                    outstanding.discard(url)
+                    pages += 1
+                    if error is not None:
+                        self.stats['failed'] += 1
+                        self.failures[url] = error
+                    else:
+                        self.stats['pages'] += 1
+                        self.stats['listings'] += dump_jsonl(computers, sink)
+                        self.stats['rejected'] += rejected                     # records the page's parser left out
+                        done.add(url)
+                        pagesLog.write(url.encode() + b"\n")
+                        self.failures.pop(url, None)
+
+                    for link in links:
+                        link = _normalize(link)
+                        if link not in seen and urlsplit(link).hostname in self._hosts:
+                            seen.add(link)
+                            outstanding.add(link)
+                            inboxes[self.shard_of(link)].put((link, False))
+                            self.stats['links'] += 1
+
+                    if pages % self.checkpointEvery == 0:
+                        self._save(outstanding, sinkBytes, pagesLog)
+            finally:
+                # Pages still queued or in flight stay pending and are fetched by the next run
+                self._save(outstanding, sinkBytes, pagesLog)
+                sink.detach()
+                _stop(workers, inboxes, wait = not outstanding)
+        return self.stats
+
+
+    def _shard_cache(self, shard: int) -> Optional[str]:
+        # Shards are assigned by host, so a shard's cache holds the pages its hosts served last time
+        return None if self.cacheDirectory is None else os.path.join(self.cacheDirectory, f"shard-{shard}")
+
+
+    def _next_result(self, outbox, workers: list) -> tuple:
+        while True:
+            try:
+                return outbox.get(timeout = 1)
+            except queue.Empty:
+                if not all(worker.is_alive() for worker in workers):
+                    raise RuntimeError("A crawl worker died, restart to resume from the last checkpoint")
+
+
+    def _load(self) -> tuple:
+        # (done urls, pending urls, file lengths) of the last checkpoint, failed pages go back to pending
+        try:
+            with open(self.checkpointPath, "r", encoding = "utf-8") as fp:
+                checkpoint = json.load(fp)
+        except FileNotFoundError:
+            return set(), [], {'sink': 0, 'pages': 0}
+
+        with open(self.pagesPath, "rb") as fp:
+            done = set(fp.read(checkpoint['lengths']['pages']).decode().splitlines())
+        self.failures = dict(checkpoint['failed'])
+        return done, checkpoint['pending'] + list(self.failures), checkpoint['lengths']
+
+
+    def _save(self, pending: set, sink, pagesLog) -> None:
+        # The sink and page log reach the disk before the checkpoint pointing at their lengths
+        for fp in (sink, pagesLog):
+            fp.flush()
+            os.fsync(fp.fileno())
+        checkpoint = {'pending': sorted(pending - self.failures.keys()), 'failed': sorted(self.failures.items()),
+                      'lengths': {'sink': sink.tell(), 'pages': pagesLog.tell()}}
+
+        temporary = self.checkpointPath + ".tmp"
+        with open(temporary, "w", encoding = "utf-8") as fp:
+            json.dump(checkpoint, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temporary, self.checkpointPath)
+
+
+
+def _normalize(url: str) -> str:
+    return urldefrag(url)[0]
+
+
+def _stop(workers: list, inboxes: list, wait: bool) -> None:
+    # Waits for idle workers, stops busy ones, their pages are pending in the checkpoint
+    for inbox in inboxes:
+        inbox.put(None)
+        if not wait:
+            inbox.cancel_join_thread()                                         # URLs no worker will read
+    for worker in workers:
+        if not wait:
+            worker.terminate()
+        worker.join()
+
+
+
+def _crawl_worker(parsers: list, options: dict, cacheDirectory: Optional[str], flushEvery: int, inbox, outbox) -> None:
+    # Module level so worker processes can run it
+    cache = ResponseCache(cacheDirectory) if cacheDirectory is not None else None
+    asyncio.run(_crawl_shard(parsers, options, cache, flushEvery, inbox, outbox))
+
+
+async def _crawl_shard(parsers: list, options: dict, cache: Optional[ResponseCache], flushEvery: int, inbox, outbox) -> None:
+    # Pages of one shard, fetched concurrently. Parsing stays in this process, which is already one of many.
+    # The cache index is flushed every flushEvery pages, a stopped worker's newer bodies are dropped on the next load
+    pipeline = ScrapePipeline(parsers, processes = 0, cache = cache, **options)
+    loop = asyncio.get_running_loop()
+    urls = asyncio.Queue()
+
+    async def feed():
+        while (page := await loop.run_in_executor(None, inbox.get)) is not None:
+            await urls.put(page)
+        for _ in range(pipeline.concurrency):
+            await urls.put(None)
+
+    pages = 0
+
+    async def work():
+        nonlocal pages
+        while (page := await urls.get()) is not None:
+            url, resumed = page
+            try:
+                parser = pipeline.parser_for(url)
+                body = await pipeline.fetch_page(url)
+                if body is not None:
+                    computers, rejected = parse_page(parser, url, body)
+                elif (body := cache.body(url)) is not None:                    # unchanged, its listings were sent by an earlier crawl
+                    computers, rejected = parse_page(parser, url, body) if resumed else ([], [])
+                else:                                                          # the index outlived the body, fetched in full
+                    body = await pipeline.fetch_page(url)
+                    computers, rejected = parse_page(parser, url, body)
+                links = [urljoin(url, link) for link in parser.links(url, body)]
+                outbox.put((url, computers, links, len(rejected), None))
+            except Exception as error:                                         # reported, the page is retried on resume
+                outbox.put((url, [], [], 0, f"{type(error).__name__}: {error}"))
+            pages += 1
+            if cache is not None and pages % flushEvery == 0:
+                cache.flush()
+
+    try:
+        await asyncio.gather(feed(), *[work() for _ in range(pipeline.concurrency)])
+    finally:
+        await pipeline.client.close()
+        if cache is not None:
+            cache.flush()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Near-duplicate detection and merge of the same machine listed at several retailers
+
+Listings are first bucketed by an exact spec key (brand, style, CPU, GPU, RAM, storage, screen,
+resolution, refresh). Within a bucket, names are compared through MinHash signatures of their
+word shingles, and LSH bands only pair up listings likely to be similar, so clustering stays
+near linear. Each cluster keeps its best priced listing along with every retailer's offer.
+"""
+
+
+from hashlib import blake2b
+from operator import eq
+from typing import Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+import re
+import struct
+
+from computer import Computer
+
+
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_WINDOWS_EDITION = re.compile(r"\bwin(?:dows)?(?:\s*1[01])?(?:\s*(?:home|pro))?\b")      # Windows, its version and edition
+
+BUCKET_CLUSTERS = 4
+
+# Words retailers add to names without telling machines apart. Model line words (pro, plus, max) are kept
+STOP_WORDS = frozenset({"laptop", "notebook", "desktop", "computer", "pc", "gaming", "new", "latest", "model",
+                        "edition", "inch", "in", "with", "and", "the", "for", "windows", "win", "home"})
+
+
+
+class Offer(NamedTuple):
+    retailer: str                                                              # host without www.
+    url: Optional[str]
+    price: Optional[float]
+
+
+class Merged(NamedTuple):
+    computer: Computer                                                         # best priced listing of the cluster
+    offers: tuple                                                              # every listing's Offer, cheapest first
+
+
+
+def spec_key(computer: Computer) -> tuple:
+    # Listings can only be the same machine when all of these match. Specs are interned, so they compare by identity
+    return ((computer.brand or "").casefold(), computer.style, computer.cpu, computer.gpu,
+            tuple(computer.ram), tuple(computer.storage), computer.screen, tuple(computer.resolution), computer.refresh)
+
+
+def normalize_name(name: Optional[str], brand: Optional[str] = None) -> str:
+    # Lower case words without punctuation, the brand and STOP_WORDS
+    words = _NON_WORD.sub(" ", _WINDOWS_EDITION.sub(" ", (name or "").casefold())).split()
+    dropped = STOP_WORDS | set(_NON_WORD.sub(" ", (brand or "").casefold()).split())
+    return " ".join(word for word in words if word not in dropped)
+
+
+def retailer_of(url: Optional[str]) -> str:
+    host = (urlsplit(url).hostname or "") if url else ""
+    return host[4:] if host.startswith("www.") else host
+
+
+
+class MinHasher:
+    # Deterministic across runs and processes: a shingle's value under each of the permutations is a
+    # 32 bit slice of blake2b keyed with the seed, and a signature is the minimum of each over the shingles
+    def __init__(self, permutations: int = 32, shingle: int = 2, seed: int = 0):
+        self.permutations = permutations
+        self.shingle = shingle
+        self._key = seed.to_bytes(8, "little")
+        self._blocks = -(-permutations // 16)                                  # 16 values per 64 byte digest
+        self._hashes = {}                                                      # shingle -> values
+        self._signatures = {}                                                  # normalized name -> signature
+
+
+    def signature(self, text: str) -> tuple:
+        signature = self._signatures.get(text)
+        if signature is None:
+            # Words and runs of up to self.shingle words, so "victus 15" and "victus 16" stay apart
+            words = text.split() or [""]
+            shingles = [" ".join(words[start:start + size]) for size in range(1, self.shingle + 1)
+                        for start in range(len(words) - size + 1)] or words
+            signature = tuple(map(min, zip(*[self._hash(shingle) for shingle in shingles])))
+            if len(self._signatures) < 1 << 20:
+                self._signatures[text] = signature
+        return signature
+
+
+    def _hash(self, shingle: str) -> tuple:
+        values = self._hashes.get(shingle)
+        if values is None:
+            data = shingle.encode()
+            digest = b"".join(blake2b(data, digest_size = 64, key = self._key, salt = block.to_bytes(16, "little")).digest()
+                              for block in range(self._blocks))
+            values = self._hashes[shingle] = struct.unpack_from(f"<{self.permutations}I", digest)
+        return values
+
+
+
+def similarity(first: tuple, second: tuple) -> float:
+    # Jaccard similarity of the shingle sets, estimated from two signatures
+    return sum(map(eq, first, second)) / len(first)
+
+
+def deduplicate(computers: Iterable[Computer],
+        threshold: float = 0.5,                                                # estimated name similarity to merge at
+        bands: int = 16,
+        rows: int = 2,                                                         # bands * rows permutations
+        seed: int = 0) -> list:
+    # Merged listings in order of each cluster's first listing
+    computers = list(computers)
+    hasher = MinHasher(bands * rows, seed = seed)
+    signatures = [hasher.signature(normalize_name(pc.name, pc.brand)) for pc in computers]
+
+    # Listings sharing a spec key and one band of their signature are candidates. A bucket keeps the
+    # first listing of each cluster it has seen, at most BUCKET_CLUSTERS of them, and a new listing is
+    # only checked against those, which keeps the work linear in the listings
+    parents = list(range(len(computers)))
+    keys, buckets = {}, {}
+    for index, (pc, signature) in enumerate(zip(computers, signatures)):
+        key = keys.setdefault(spec_key(pc), len(keys))                         # small int, hashed once per band
+        checked = set()                                                        # pairs meet again in other bands
+        for band in range(bands):
+            representatives = buckets.setdefault((key, band, signature[band * rows:(band + 1) * rows]), [])
+            matched = False
+            for other in representatives:
+                if other in checked:
+                    matched = matched or _find(parents, other) == _find(parents, index)
+                    continue
+                checked.add(other)
+                if similarity(signatures[other], signature) >= threshold:
+                    _union(parents, other, index)
+                    matched = True
+            if not matched and len(representatives) < BUCKET_CLUSTERS:
+                representatives.append(index)
+
+    clusters = {}
+    for index in range(len(computers)):
+        clusters.setdefault(_find(parents, index), []).append(computers[index])
+    return [_merge(members) for members in clusters.values()]
+
+
+def _merge(members: list) -> Merged:
+    byPrice = sorted(members, key = lambda pc: (pc.price is None, pc.price or 0))
+    return Merged(byPrice[0], tuple(Offer(retailer_of(pc.url), pc.url, pc.price) for pc in byPrice))
+
+
+def _find(parents: list, index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]                               # path halving
+        index = parents[index]
+    return index
+
+
+def _union(parents: list, first: int, second: int) -> None:
+    first, second = _find(parents, first), _find(parents, second)
+    if first != second:
+        parents[max(first, second)] = min(first, second)                       # lowest index stays the root
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Append-only price history of listings, keyed by URL
+
+Each observation only stores the fields that changed since the last one for that URL,
+as one JSON line. The log is replayed into in-memory indexes when the store is opened, and a
+last line left incomplete by a crash mid-append is cut off.
+"""
+
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Iterable, Optional
+import json
+
+from computer import Computer
+
+
+
+TRACKED = ('price', 'msrp', 'sale', 'rating', 'reviews')
+
+
+
+class PriceHistory:
+    def __init__(self, path: str):
+        self.path = path
+        
+        self._state = {}                                                       # url -> latest value of each tracked field
+        self._stateTimes = {}                                                  # url -> timestamp of each value in _state
+        self._events = {}                                                      # url -> [(timestamp, changes)] in time order
+        self._prices = {}                                                      # url -> [(timestamp, price)] in time order
+        self._priceChanges = []                                                # [(timestamp, url)] sorted, for dropped_since
+        
+        try:
+            with open(path, "rb+") as fp:
+                offset = 0
+                for lineNumber, line in enumerate(fp, start = 1):
+                    if line.strip():
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            if line.endswith(b"\n"):
+                                raise ValueError(f"{path}, line {lineNumber}: not a history entry") from None
+                            fp.truncate(offset)                                # torn by a crash mid-append
+                            break
+                        self._apply(entry['url'], datetime.fromisoformat(entry['timestamp']), entry['changes'])
+                        if not line.endswith(b"\n"):                          # complete, but the newline didn't make it
+                            fp.write(b"\n")
+                    offset += len(line)
+        except FileNotFoundError:
+            pass
+        
+        self._file = open(path, "a", encoding = "utf-8")
+        
+        
+    def __enter__(self) -> 'PriceHistory':
+        return self
+    
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+        
+        
+    def close(self) -> None:
+        self._file.close()
+        
+        
+    def flush(self) -> None:
+        self._file.flush()
+        
+        
+    def record(self, computer: Computer) -> Optional[dict]:
+        # Stores what changed since the last observation of computer.url, returns those changes or None
+        if computer.url is None:
+            raise ValueError("Listings without a URL can't be tracked")
+        
+        timestamp = computer.timestamp
+        state = self._state_at(computer.url, timestamp)
+        changes = {field: getattr(computer, field) for field in TRACKED
+                   if field not in state or state[field] != getattr(computer, field)}
+        if not changes:
+            return None
+        
+        self._file.write(json.dumps({'url': computer.url, 'timestamp': timestamp.isoformat(), 'changes': changes},
+                                    separators = (',', ':')) + "\n")
+        self._apply(computer.url, timestamp, changes)
+        return changes
+    
+    
+    def record_many(self, computers: Iterable[Computer]) -> int:
+        # Returns how many listings changed
+        return sum(self.record(computer) is not None for computer in computers)
+    
+    
+    def __contains__(self, url: str) -> bool:
+        return url in self._state
+    
+    
+    def latest(self, url: str) -> dict:
+        return dict(self._state[url])
+    
+    
+    def history(self, url: str) -> list:
+        # [(timestamp, changes)] for one listing, oldest first
+        return list(self._events.get(url, []))
+    
+    
+    def trajectory(self, url: str) -> list:
+        # [(timestamp, price)] for one listing, oldest first
+        return list(self._prices.get(url, []))
+    
+    
+    def price_at(self, url: str, when: datetime) -> Optional[float]:
+        # Price as last observed at or before when, None if the listing wasn't known yet
+        prices = self._prices.get(url, [])
+        position = bisect_right(prices, when, key = lambda point: point[0])
+        return prices[position - 1][1] if position else None
+    
+    
+    def dropped_since(self, since: datetime) -> list:
+        # URLs whose current price is below their price at since, only listings with a price change after since are looked at
+        start = bisect_left(self._priceChanges, since, key = lambda change: change[0])
+        candidates = {url for _, url in self._priceChanges[start:]}
+        
+        dropped = []
+        for url in candidates:
+            before, now = self.price_at(url, since), self._state[url]['price']
+            if before is not None and now is not None and now < before:
+                dropped.append(url)
+        return sorted(dropped)
+    
+    
+    def _state_at(self, url: str, when: datetime) -> dict:
+        # Tracked fields as of when. A late observation is compared with what was known at its own time,
+        # not with observations made after it
+        events = self._events.get(url, [])
+        if not events or events[-1][0] <= when:
+            return self._state.get(url, {})
+        state = {}
+        for _, changes in events[:bisect_right(events, when, key = lambda event: event[0])]:
+            state.update(changes)
+        return state
+    
+    
+    def _apply(self, url: str, timestamp: datetime, changes: dict) -> None:
+        # Observations can arrive late, a field's current value is the one observed last in time
+        state, times = self._state.setdefault(url, {}), self._stateTimes.setdefault(url, {})
+        for field, value in changes.items():
+            if field not in times or times[field] <= timestamp:
+                state[field] = value
+                times[field] = timestamp
+        insort(self._events.setdefault(url, []), (timestamp, changes), key = lambda event: event[0])
+        if 'price' in changes:
+            insort(self._prices.setdefault(url, []), (timestamp, changes['price']), key = lambda point: point[0])
+            insort(self._priceChanges, (timestamp, url))
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk HTTP response cache keyed by listing URL, for conditional re-fetching
+
+Keeps each page's ETag, Last-Modified and content hash so unchanged pages can be
+recognised (304 Not Modified, or the same body again) and skipped before parsing.
+Bodies live in one file per URL, bounded by total size and entry count with LRU eviction.
+"""
+
+
+from collections import Counter, OrderedDict
+from typing import Optional
+import hashlib
+import json
+import os
+
+
+
+class ResponseCache:
+    def __init__(self, directory: str, maxBytes: int = 1 << 30, maxEntries: Optional[int] = None):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.maxEntries = maxEntries
+        self.stats = Counter()                                                 # hits, misses, notModified, unchanged, evictions
+
+        os.makedirs(directory, exist_ok = True)
+        self._indexPath = os.path.join(directory, "index.json")
+        self._entries = OrderedDict()                                          # url -> metadata, least recently used first
+        try:
+            with open(self._indexPath, "r", encoding = "utf-8") as fp:
+                self._entries.update(json.load(fp))
+        except FileNotFoundError:
+            pass
+        self.size = sum(entry['size'] for entry in self._entries.values())
+
+        # Bodies the index doesn't know about were left by an interrupted run
+        known = {entry['file'] for entry in self._entries.values()}
+        for name in os.listdir(directory):
+            if name.endswith(".body") and name not in known:
+                os.remove(os.path.join(directory, name))
+
+
+    def __enter__(self) -> 'ResponseCache':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._entries
+
+
+    def conditional_headers(self, url: str) -> dict:
+        # If-None-Match / If-Modified-Since for a URL seen before, empty otherwise
+        entry = self._entries.get(url)
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['lastModified']:
+            headers['If-Modified-Since'] = entry['lastModified']
+        return headers
+
+
+    def not_modified(self, url: str) -> None:
+        # The server answered 304 to the conditional request
+        self.stats['hits'] += 1
+        self.stats['notModified'] += 1
+        if url in self._entries:
+            self._entries.move_to_end(url)
+
+
+    def store(self, url: str, body: bytes, headers: Optional[dict] = None) -> bool:
+        # Stores a 200 response, returns False when the body is the same as last time
+        headers = headers or {}
+        digest = hashlib.sha256(body).hexdigest()
+        entry = self._entries.get(url)
+        unchanged = entry is not None and entry['hash'] == digest
+
+        if unchanged:
+            self.stats['hits'] += 1
+            self.stats['unchanged'] += 1
+        else:
+            self.stats['misses'] += 1
+            name = hashlib.sha256(url.encode()).hexdigest() + ".body"
+            with open(os.path.join(self.directory, name), "wb") as fp:
+                fp.write(body)
+            self.size += len(body) - (entry['size'] if entry else 0)
+            entry = {'file': name, 'hash': digest, 'size': len(body)}
+
+        entry['etag'] = headers.get('etag')
+        entry['lastModified'] = headers.get('last-modified')
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        self._evict()
+        return not unchanged
+
+
+    def body(self, url: str) -> Optional[bytes]:
+        # None when the URL isn't cached, or its body file is gone and the entry is dropped so the next fetch is in full
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        try:
+            with open(os.path.join(self.directory, entry['file']), "rb") as fp:
+                body = fp.read()
+        except FileNotFoundError:
+            del self._entries[url]
+            self.size -= entry['size']
+            return None
+        self._entries.move_to_end(url)
+        return body
+
+
+    def flush(self) -> None:
+        # Saves the index, bodies are already on disk
+        temporary = self._indexPath + ".tmp"
+        with open(temporary, "w", encoding = "utf-8") as fp:
+            json.dump(self._entries, fp)
+        os.replace(temporary, self._indexPath)
+
+
+    def _evict(self) -> None:
+        while self._entries and (self.size > self.maxBytes or
+                                 (self.maxEntries is not None and len(self._entries) > self.maxEntries)):
+            _, entry = self._entries.popitem(last = False)
+            self.size -= entry['size']
+            self.stats['evictions'] += 1
+            try:
+                os.remove(os.path.join(self.directory, entry['file']))
+            except FileNotFoundError:
+                pass
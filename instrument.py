@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in counters and timing histograms for the construction, validation, scoring and serialization path
+
+While an Instrumentation is enabled, the methods in STAGES and the per-field checks of
+FIELD_CHECKS are swapped for timing wrappers, and the originals are put back when it is
+disabled, so the hot path runs untouched when nothing is being measured. Only the current
+process is measured: score_catalog workers run their own copies of the classes.
+"""
+
+
+from bisect import bisect_left
+from functools import wraps
+from typing import Iterable, Optional
+import os
+import time
+
+from computer import CPU, FIELD_CHECKS, GPU, Computer
+
+
+
+# Stage -> (class, method). Timings are inclusive, __init__ contains check which contains create_score
+STAGES = {
+    'construct': (Computer, '__init__'),
+    'check': (Computer, 'check'),
+    'cpu': (CPU, '_canonical'),                                                # CPU.check is a no-op, specs validate when interned
+    'gpu': (GPU, '_canonical'),
+    'score': (Computer, 'create_score'),
+    'to_dict': (Computer, 'to_dict'),
+    'to_record': (Computer, 'to_record'),
+    'to_json': (Computer, 'to_json'),
+    'to_row': (Computer, 'to_row'),
+    'to_str': (Computer, 'to_str'),
+    'str': (Computer, '__str__')
+}
+
+# Histogram upper bounds in seconds, the last bucket is +Inf
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1)
+
+_active = None                                                                 # the enabled Instrumentation, if any
+
+
+
+class Instrumentation:
+    def __init__(self, stages: Optional[Iterable[str]] = None, buckets: tuple = BUCKETS):
+        self.stages = list(STAGES if stages is None else stages)
+        for stage in self.stages:
+            if stage not in STAGES:
+                raise ValueError(f"Unknown stage '{stage}'. Must be one of {', '.join(STAGES)}.")
+        self.buckets = tuple(sorted(buckets))
+
+        self._originals = {}                                                   # stage -> class __dict__ entry replaced
+        self._originalChecks = {}                                              # field -> FIELD_CHECKS entry replaced
+        self.reset()
+
+
+    def __enter__(self) -> 'Instrumentation':
+        # Scopes a measurement, ex: one ingestion run. Counts are kept after exit for snapshot()
+        self.enable()
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.disable()
+
+
+    @property
+    def enabled(self) -> bool:
+        return _active is self
+
+
+    def reset(self) -> None:
+        self.calls = {stage: 0 for stage in self.stages}
+        self.errors = {stage: 0 for stage in self.stages}                      # calls that raised
+        self.seconds = {stage: 0.0 for stage in self.stages}
+        self.histograms = {stage: [0] * (len(self.buckets) + 1) for stage in self.stages}
+        self.failures = {}                                                     # field -> validation failures
+
+
+    def enable(self) -> None:
+        global _active
+        if _active is self:
+            return
+        if _active is not None:
+            raise RuntimeError("Another Instrumentation is already enabled")
+        _active = self
+
+        for stage in self.stages:
+            cls, method = STAGES[stage]
+            original = cls.__dict__[method]
+            self._originals[stage] = original
+            if isinstance(original, classmethod):
+                setattr(cls, method, classmethod(self._timed(stage, original.__func__)))
+            else:
+                setattr(cls, method, self._timed(stage, original))
+
+        # Batch validation in from_records checks each distinct value once, so failures count distinct values there
+        for field, fieldCheck in FIELD_CHECKS.items():
+            self._originalChecks[field] = fieldCheck
+            FIELD_CHECKS[field] = self._counted(field, fieldCheck)
+
+
+    def disable(self) -> None:
+        global _active
+        if _active is not self:
+            return
+        for stage, original in self._originals.items():
+            cls, method = STAGES[stage]
+            setattr(cls, method, original)
+        FIELD_CHECKS.update(self._originalChecks)
+        self._originals.clear()
+        self._originalChecks.clear()
+        _active = None
+
+
+    def _timed(self, stage: str, function):
+        calls, errors, seconds, histogram = self.calls, self.errors, self.seconds, self.histograms[stage]
+        buckets, failures, clock = self.buckets, self.failures, time.perf_counter
+        field = stage if stage in ('cpu', 'gpu') else None                     # spec validation fails as its field
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except (TypeError, ValueError):
+                errors[stage] += 1
+                if field is not None:
+                    failures[field] = failures.get(field, 0) + 1
+                raise
+            finally:
+                elapsed = clock() - start
+                calls[stage] += 1
+                seconds[stage] += elapsed
+                histogram[bisect_left(buckets, elapsed)] += 1
+        return wrapper
+
+
+    def _counted(self, field: str, fieldCheck):
+        failures = self.failures
+
+        @wraps(fieldCheck)
+        def wrapper(value):
+            try:
+                fieldCheck(value)
+            except (TypeError, ValueError):
+                failures[field] = failures.get(field, 0) + 1
+                raise
+        return wrapper
+
+
+    def snapshot(self) -> dict:
+        # Plain dict, JSON ready. Histogram buckets are cumulative, keyed by upper bound as in Prometheus
+        stages = {}
+        for stage in self.stages:
+            cumulative, total = {}, 0
+            for bound, count in zip(self.buckets + (float('inf'),), self.histograms[stage]):
+                total += count
+                cumulative[repr(bound) if bound != float('inf') else "+Inf"] = total
+            stages[stage] = {'calls': self.calls[stage], 'errors': self.errors[stage],
+                             'seconds': self.seconds[stage], 'buckets': cumulative}
+        return {'stages': stages, 'validationFailures': dict(self.failures)}
+
+
+    def to_prometheus(self) -> str:
+        # Prometheus text exposition format
+        snapshot = self.snapshot()
+        lines = ["# HELP computerfinder_stage_seconds Time spent per stage call",
+                 "# TYPE computerfinder_stage_seconds histogram"]
+        for stage, data in snapshot['stages'].items():
+            for bound, count in data['buckets'].items():
+                lines.append(f'computerfinder_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'computerfinder_stage_seconds_sum{{stage="{stage}"}} {data["seconds"]!r}')
+            lines.append(f'computerfinder_stage_seconds_count{{stage="{stage}"}} {data["calls"]}')
+
+        lines += ["# HELP computerfinder_stage_errors_total Stage calls that raised",
+                  "# TYPE computerfinder_stage_errors_total counter"]
+        lines += [f'computerfinder_stage_errors_total{{stage="{stage}"}} {data["errors"]}'
+                  for stage, data in snapshot['stages'].items()]
+
+        lines += ["# HELP computerfinder_validation_failures_total Failed validations per field",
+                  "# TYPE computerfinder_validation_failures_total counter"]
+        lines += [f'computerfinder_validation_failures_total{{field="{field}"}} {count}'
+                  for field, count in sorted(snapshot['validationFailures'].items())]
+        return "\n".join(lines) + "\n"
+
+
+    def write_prometheus(self, path: str) -> None:
+        # Replaced atomically, so a scraper reading the file (node_exporter textfile) never sees half of it
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding = "utf-8") as fp:
+            fp.write(self.to_prometheus())
+        os.replace(temporary, path)
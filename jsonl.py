@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming JSON Lines snapshots of Computer listings, one compact record per line
+"""
+
+
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional
+import json
+
+from computer import Computer
+
+
+
+def dump_jsonl(computers: Iterable[Computer], fp: IO[str]) -> int:
+    # Writes as it goes, returns the number of records written
+    count = 0
+    for computer in computers:
+        fp.write(json.dumps(computer.to_record(), separators = (',', ':')))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def iter_jsonl(fp: IO[str], validate: str = "batch", failures: Optional[list] = None,
+               chunkSize: int = 1024) -> Iterator[Computer]:
+    # Reads chunkSize lines at a time through Computer.from_records, so memory stays flat however big the file is.
+    # Bad lines raise ValueError, unless a failures list is given to collect (line number, error) pairs instead
+    lines = enumerate(fp, start = 1)
+    while True:
+        chunk = list(islice(lines, chunkSize))
+        if not chunk:
+            return
+        
+        lineNumbers, records, chunkFailures = [], [], []
+        for lineNumber, line in chunk:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                chunkFailures.append((lineNumber, error))
+                continue
+            if not isinstance(record, dict):                                   # valid JSON, but not a record
+                chunkFailures.append((lineNumber, TypeError(f"Record: {record} is invalid")))
+                continue
+            records.append(record)
+            lineNumbers.append(lineNumber)
+                
+        computers, badRows = Computer.from_records(records, validate)
+        chunkFailures.extend((lineNumbers[index], error) for index, error in badRows)
+        
+        if chunkFailures:
+            if failures is None:
+                lineNumber, error = min(chunkFailures, key = lambda failure: failure[0])
+                raise ValueError(f"Line {lineNumber}: {error}") from error
+            failures.extend(sorted(chunkFailures, key = lambda failure: failure[0]))
+        
+        yield from computers
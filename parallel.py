@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-core re-validation and re-scoring of large catalogs
+
+Listings are packed into plain tuples of just the checked and scored fields, sent to a process
+pool in chunks, checked and scored there with the same field checks and sub-score functions as
+Computer, and the scores merged back in input order. Specs and compound fields are interned, so
+pickle sends each distinct one once per chunk and the workers get them back from their registries.
+"""
+
+
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Optional, Union
+import math
+import multiprocessing
+import os
+
+from computer import (CPU, FIELD_CHECKS, GPU, Computer, _RECORD_DEFAULTS, _decode_field, _field_error,
+                      cpu_score, feature_score, gpu_score, price_score, ram_score, rating_score,
+                      refresh_score, resolution_score, storage_score, total_score)
+
+
+
+# Fields of a packed listing, the checked ones first in Computer.check order
+PACKED_FIELDS = tuple(FIELD_CHECKS) + ('keypad', 'webcam', 'backlit')
+
+_CHECKS = tuple(FIELD_CHECKS.values())
+_CPU, _GPU = PACKED_FIELDS.index('cpu'), PACKED_FIELDS.index('gpu')
+_packed = attrgetter(*PACKED_FIELDS)
+
+# Workers start from a fresh interpreter, not a fork of this one: the parent may hold the whole catalog,
+# and forked children touching those objects (refcounts, garbage collection) copy every page of it
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+
+def pack(record: Union[Computer, dict]) -> tuple:
+    # Computer or record dict -> tuple in PACKED_FIELDS order
+    if isinstance(record, Computer):
+        return _packed(record)
+    return tuple([record.get(field, _RECORD_DEFAULTS[field]) for field in PACKED_FIELDS])
+
+
+def score_catalog(records: Iterable[Union[Computer, dict]], workers: Optional[int] = None, chunkSize: int = 10_000) -> tuple:
+    # Returns (scores, failures): an array('d') in input order, NaN for the records that failed a check
+    # or couldn't be scored, and (index, error) pairs for those. workers=1 scores in this process, None uses every core
+    workers = workers or os.cpu_count() or 1
+    records = iter(records)
+    chunks = iter(lambda: [pack(record) for record in islice(records, chunkSize)], [])
+
+    scores, failures = array('d'), []
+    if workers == 1:
+        for chunk in chunks:
+            _merge(scores, failures, score_chunk(chunk))
+        return scores, failures
+
+    # A few chunks in flight per worker, so packing overlaps scoring without holding the whole catalog
+    with ProcessPoolExecutor(workers, mp_context = multiprocessing.get_context(_START_METHOD)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(score_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                _merge(scores, failures, pending.popleft().result())
+        while pending:
+            _merge(scores, failures, pending.popleft().result())
+    return scores, failures
+
+
+def score_chunk(rows: list) -> tuple:
+    # Runs in a worker: (scores as bytes, [(offset in chunk, error)]). As in Computer.from_records, each
+    # column is checked one distinct value at a time, then the rows that passed are scored
+    rows, failures = list(rows), {}
+    for offset, row in enumerate(rows):
+        if type(row[_CPU]) is not CPU or type(row[_GPU]) is not GPU:         # record dicts
+            try:
+                rows[offset] = row[:_CPU] + (_decode_field('cpu', row[_CPU]), _decode_field('gpu', row[_GPU])) + row[_GPU + 1:]
+            except (TypeError, ValueError) as error:
+                failures[offset] = error
+
+    for position, fieldCheck in enumerate(_CHECKS):
+        verdicts = {}
+        for offset, row in enumerate(rows):
+            if offset in failures:
+                continue
+            value = row[position]
+            try:
+                error = verdicts[value]
+            except KeyError:
+                error = verdicts[value] = _field_error(fieldCheck, value)
+            except TypeError:                                                  # unhashable
+                error = _field_error(fieldCheck, value)
+            if error is not None:
+                failures[offset] = error
+
+    scores = array('d')
+    for offset, row in enumerate(rows):
+        if offset in failures:
+            scores.append(math.nan)
+            continue
+        try:
+            scores.append(_score_row(row))
+        except (AttributeError, TypeError, ValueError) as error:               # specs with fields left out, as in from_records
+            failures[offset] = error
+            scores.append(math.nan)
+    return scores.tobytes(), sorted(failures.items())
+
+
+def _score_row(row: tuple) -> float:
+    (style, rating, reviews, price, msrp, sale, weight, dimensions, screen, resolution, refresh,
+     cpu, gpu, ram, storage, keypad, webcam, backlit) = row
+    return total_score([rating_score(rating), price_score(price, msrp),
+                        resolution_score(resolution[0], resolution[1]), refresh_score(refresh),
+                        feature_score(keypad, webcam, backlit), cpu_score(cpu.family),
+                        gpu_score(gpu.generation, gpu.performance), ram_score(ram[0]), storage_score(storage[0])])
+
+
+def _merge(scores: array, failures: list, result: tuple) -> None:
+    chunkScores, chunkFailures = result
+    failures.extend((len(scores) + offset, error) for offset, error in chunkFailures)
+    scores.frombytes(chunkScores)
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Indexed filtering and top-k ranking over a collection of Computer listings
+
+Low cardinality fields (style, brand, RAM, refresh, CPU/GPU fields, ...) get one bitmap per
+distinct value, high cardinality ones (price, score) a sorted (value, row) list. Both are kept
+up to date as listings are added, updated or removed.
+"""
+
+
+from bisect import bisect_left, bisect_right, insort
+from heapq import nlargest
+from typing import Iterable, Optional
+import re
+
+from computer import Computer
+
+
+
+# Field name -> how to read it from a Computer
+FIELDS = {
+    'style': lambda pc: pc.style,
+    'brand': lambda pc: pc.brand,
+    'price': lambda pc: pc.price,
+    'ram': lambda pc: pc.ram[0],
+    'storage': lambda pc: pc.storage[0],
+    'refresh': lambda pc: pc.refresh,
+    'screen': lambda pc: pc.screen,
+    'score': lambda pc: pc.score,
+    'cpuBrand': lambda pc: pc.cpu.brand,
+    'cpuFamily': lambda pc: pc.cpu.family,
+    'cpuGeneration': lambda pc: pc.cpu.generation,
+    'gpuBrand': lambda pc: pc.gpu.brand,
+    'gpuSeries': lambda pc: pc.gpu.series,
+    'gpuGeneration': lambda pc: pc.gpu.generation,
+    'gpuPerformance': lambda pc: pc.gpu.performance
+}
+
+SORTED_FIELDS = ('price', 'score')
+
+_BIT_POSITIONS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+_NONZERO = re.compile(rb"[^\x00]")
+
+
+
+class ListingIndex:
+    def __init__(self, computers: Iterable[Computer] = ()):
+        self.computers = []                                                    # row id -> Computer, None once removed
+        self._alive = bytearray()                                              # bitmap of live rows
+        self._values = {field: [] for field in FIELDS}                         # row id -> indexed value
+        self._bitmaps = {field: {} for field in FIELDS if field not in SORTED_FIELDS}
+        self._sorted = {field: [] for field in SORTED_FIELDS}                  # [(value, row)], None values left out
+
+        self.extend(computers)
+
+
+    def __len__(self) -> int:
+        return len(self.computers) - self.computers.count(None)
+
+
+    def add(self, computer: Computer) -> int:
+        row = self._append(computer)
+        for field in SORTED_FIELDS:
+            value = self._values[field][row]
+            if value is not None:
+                insort(self._sorted[field], (value, row))
+        return row
+
+
+    def extend(self, computers: Iterable[Computer]) -> list:
+        # Bulk add, the sorted indexes are re-sorted once at the end
+        rows = [self._append(computer) for computer in computers]
+        for field in SORTED_FIELDS:
+            values = self._values[field]
+            self._sorted[field].extend((values[row], row) for row in rows if values[row] is not None)
+            self._sorted[field].sort()
+        return rows
+
+
+    def update(self, row: int, data: dict) -> None:
+        # Computer.update, then only the indexes whose value changed are touched
+        computer = self.computers[row]
+        computer.update(data)
+
+        for field, read in FIELDS.items():
+            old, new = self._values[field][row], read(computer)
+            if old == new:
+                continue
+
+            self._values[field][row] = new
+            if field in SORTED_FIELDS:
+                if old is not None:
+                    index = self._sorted[field]
+                    del index[bisect_left(index, (old, row))]
+                if new is not None:
+                    insort(self._sorted[field], (new, row))
+            else:
+                _clear_bit(self._bitmaps[field][old], row)
+                _set_bit(self._bitmaps[field].setdefault(new, bytearray(len(self._alive))), row)
+
+
+    def remove(self, row: int) -> None:
+        for field in FIELDS:
+            value = self._values[field][row]
+            if field in SORTED_FIELDS:
+                if value is not None:
+                    index = self._sorted[field]
+                    del index[bisect_left(index, (value, row))]
+            else:
+                _clear_bit(self._bitmaps[field][value], row)
+            self._values[field][row] = None
+
+        _clear_bit(self._alive, row)
+        self.computers[row] = None
+
+
+    def query(self) -> 'Query':
+        return Query(self)
+
+
+    def _append(self, computer: Computer) -> int:
+        row = len(self.computers)
+        self.computers.append(computer)
+
+        if row % 8 == 0:
+            self._alive.append(0)
+            for bitmaps in self._bitmaps.values():
+                for bitmap in bitmaps.values():
+                    bitmap.append(0)
+        _set_bit(self._alive, row)
+
+        for field, read in FIELDS.items():
+            value = read(computer)
+            self._values[field].append(value)
+            if field not in SORTED_FIELDS:
+                _set_bit(self._bitmaps[field].setdefault(value, bytearray(len(self._alive))), row)
+        return row
+
+
+
+class Query:
+    # Built up with where()/range() and run with rows(), count(), computers() or top()
+    def __init__(self, index: ListingIndex):
+        self.index = index
+        self._equals = []                                                      # [(field, allowed values)]
+        self._ranges = []                                                      # [(field, lo, hi)]
+
+
+    def where(self, **fields) -> 'Query':
+        # field=value, or field=(value, ...) for any of several values
+        for field, value in fields.items():
+            _check_field(field)
+            values = set(value) if isinstance(value, (set, frozenset, list, tuple)) else {value}
+            self._equals.append((field, values))
+        return self
+
+
+    def range(self, field: str, lo: Optional[float] = None, hi: Optional[float] = None) -> 'Query':
+        # lo <= value <= hi, either bound optional, missing values never match
+        _check_field(field)
+        self._ranges.append((field, lo, hi))
+        return self
+
+
+    def rows(self) -> list:
+        bitmap, rowChecks = self._plan()
+        return [row for row in _rows_of(bitmap, len(self.index._alive)) if _passes(row, rowChecks)]
+
+
+    def count(self) -> int:
+        return len(self.rows())
+
+
+    def computers(self) -> list:
+        return [self.index.computers[row] for row in self.rows()]
+
+
+    def top(self, k: int, by: str = 'score') -> list:
+        # k best listings by a field (score by default), highest first, without sorting every match
+        _check_field(by)
+        if k <= 0:
+            return []
+        index = self.index
+        bitmap, rowChecks = self._plan()
+        candidates = bitmap.bit_count()
+
+        # By a sorted field, walk its index from the top while that is expected to be shorter
+        # than listing every candidate, otherwise keep the k best candidates in a heap
+        if by in SORTED_FIELDS and candidates and k * len(index._sorted[by]) < candidates * candidates:
+            data = bitmap.to_bytes(len(index._alive), "little")
+            best = []
+            for _, row in reversed(index._sorted[by]):
+                if data[row >> 3] >> (row & 7) & 1 and _passes(row, rowChecks):
+                    best.append(row)
+                    if len(best) == k:
+                        break
+        else:
+            values = index._values[by]
+            rows = [row for row in _rows_of(bitmap, len(index._alive))
+                    if values[row] is not None and _passes(row, rowChecks)]
+            best = nlargest(k, rows, key = values.__getitem__)
+        return [index.computers[row] for row in best]
+
+
+    def _plan(self) -> tuple:
+        # Candidate bitmap plus the [(values, test)] still to run on each candidate row
+        index = self.index
+        bitmap = int.from_bytes(index._alive, "little")
+
+        # Bitmap fields fold straight into the candidate bitmap
+        rowChecks, ranges = [], []
+        for field, values in self._equals:
+            if field in SORTED_FIELDS:
+                rowChecks.append((index._values[field], values.__contains__))
+            else:
+                bitmaps = index._bitmaps[field]
+                bitmap &= _union(bitmaps[value] for value in values if value in bitmaps)
+        for field, lo, hi in self._ranges:
+            if field in SORTED_FIELDS:
+                ranges.append((field, lo, hi))
+            else:
+                bitmaps = index._bitmaps[field]
+                bitmap &= _union(bitmaps[value] for value in bitmaps if _within(value, lo, hi))
+
+        # A sorted range becomes a bitmap only when it matches fewer rows than the candidates left,
+        # otherwise the candidates are checked one by one
+        for field, lo, hi in ranges:
+            sortedIndex = index._sorted[field]
+            start = 0 if lo is None else bisect_left(sortedIndex, (lo,))
+            end = len(sortedIndex) if hi is None else bisect_right(sortedIndex, (hi, len(index.computers)))
+            if end - start < bitmap.bit_count():
+                matches = bytearray(len(index._alive))
+                for _, row in sortedIndex[start:end]:
+                    _set_bit(matches, row)
+                bitmap &= int.from_bytes(matches, "little")
+            else:
+                rowChecks.append((index._values[field], lambda value, lo = lo, hi = hi: _within(value, lo, hi)))
+        return bitmap, rowChecks
+
+
+
+def _check_field(field: str) -> None:
+    if field not in FIELDS:
+        raise ValueError(f"Field '{field}' is not indexed. Must be one of {', '.join(FIELDS)}.")
+
+
+def _passes(row: int, rowChecks: list) -> bool:
+    return all(test(values[row]) for values, test in rowChecks)
+
+
+def _within(value, lo, hi) -> bool:
+    if value is None:
+        return False
+    return (lo is None or value >= lo) and (hi is None or value <= hi)
+
+
+def _union(bitmaps: Iterable[bytearray]) -> int:
+    result = 0
+    for bitmap in bitmaps:
+        result |= int.from_bytes(bitmap, "little")
+    return result
+
+
+def _set_bit(bitmap: bytearray, row: int) -> None:
+    bitmap[row >> 3] |= 1 << (row & 7)
+
+
+def _clear_bit(bitmap: bytearray, row: int) -> None:
+    bitmap[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+
+def _rows_of(bitmap: int, size: int) -> list:
+    # Set bits of bitmap in increasing order, zero bytes are skipped by the regex engine
+    data = bitmap.to_bytes(size, "little")
+    return [match.start() * 8 + bit for match in _NONZERO.finditer(data) for bit in _BIT_POSITIONS[data[match.start()]]]
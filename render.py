@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk text rendering of a ComputerCatalog: to_str summary lines and CSV/TSV reports
+
+Lines are formatted straight from the catalog's columns and streamed to the file as they
+are made. Numbers print as ComputerCatalog.row() gives them back, whole ones as ints: a
+listing holding 16.0 prints 16 where its own to_str() prints 16.0. Text that repeats across listings (CPU/GPU names, RAM and storage configs, prices,
+timestamps) is formatted once per distinct value and reused.
+"""
+
+
+from typing import IO, Iterable, Optional
+import re
+
+from catalog import ComputerCatalog, _number
+
+
+
+# Report columns, the to_row() layout with resolution, RAM and storage split up
+COLUMNS = ('brand', 'name', 'style', 'rating', 'reviews', 'price', 'msrp', 'sale', 'screen',
+           'resolutionWidth', 'resolutionHeight', 'refresh', 'cpu', 'gpu',
+           'ramSize', 'ramType', 'storageSize', 'storageType', 'url', 'timestamp', 'score')
+
+
+
+def write_summary(catalog: ComputerCatalog, fp: IO[str]) -> int:
+    # One to_str() line per listing, the same text as Computer.to_str() when whole numbers are ints.
+    # Returns the number of lines written
+    fp.writelines(summary_lines(catalog))
+    return len(catalog)
+
+
+def summary_lines(catalog: ComputerCatalog) -> Iterable[str]:
+    cpuText, gpuText, ramText, storageText, priceText = {}, {}, {}, {}, {}
+    for (brand, name, style, price, priceMask, screen, screenMask, cpu, gpu,
+         ramSize, ramSizeMask, ramType, storageSize, storageSizeMask, storageType) in zip(
+            catalog.brand, catalog.name, catalog.style, catalog.price, catalog.priceMask, catalog.screen, catalog.screenMask,
+            catalog.cpu, catalog.gpu, catalog.ramSize, catalog.ramSizeMask, catalog.ramType,
+            catalog.storageSize, catalog.storageSizeMask, catalog.storageType):
+
+        if priceMask:
+            try:
+                pricePart = priceText[price]
+            except KeyError:
+                pricePart = priceText[price] = f"${_number(price)}, "
+        else:
+            pricePart = ""
+
+        try:
+            cpuPart = cpuText[cpu]
+        except KeyError:
+            cpuPart = cpuText[cpu] = f", {cpu}" if cpu.brand and cpu.family is not None else ""
+        try:
+            gpuPart = gpuText[gpu]
+        except KeyError:
+            gpuPart = gpuText[gpu] = f", {gpu}" if gpu.brand and gpu.generation and gpu.performance is not None else ""
+
+        ram = (ramSize if ramSizeMask else None, ramType)
+        try:
+            ramPart = ramText[ram]
+        except KeyError:
+            ramPart = ramText[ram] = f", {_number(ram[0])} GB of {ramType}" if ram[0] else ""
+        storage = (storageSize if storageSizeMask else None, storageType)
+        try:
+            storagePart = storageText[storage]
+        except KeyError:
+            storagePart = storageText[storage] = f", {_number(storage[0])} GB {storageType}" if storage[0] else ""
+
+        yield (f"{pricePart}{_number(screen) if screenMask and screen else None}\" {brand or 'Unknown'} {name or ''} {style}"
+               f"{cpuPart}{gpuPart}{ramPart}{storagePart}\n")
+
+
+def write_csv(catalog: ComputerCatalog, fp: IO[str], delimiter: str = ",", header: bool = True,
+              timeFormat: Optional[str] = None) -> int:
+    # COLUMNS per listing, missing values left empty, timestamps as ISO strings unless timeFormat is given.
+    # Fields holding the delimiter, quotes or line breaks are quoted. Returns the number of listings written
+    if header:
+        fp.write(delimiter.join(COLUMNS) + "\n")
+    fp.writelines(report_lines(catalog, delimiter, timeFormat))
+    return len(catalog)
+
+
+def write_tsv(catalog: ComputerCatalog, fp: IO[str], header: bool = True, timeFormat: Optional[str] = None) -> int:
+    return write_csv(catalog, fp, "\t", header, timeFormat)
+
+
+def report_lines(catalog: ComputerCatalog, delimiter: str = ",", timeFormat: Optional[str] = None) -> Iterable[str]:
+    d = delimiter
+    special = re.compile(f'[{re.escape(delimiter)}"\r\n]')
+    text, floats, ratings, prices, screens, memories, timeText = {}, {}, {}, {}, {}, {}, {}  # repeated values -> formatted fields
+
+    for (brand, name, style, rating, ratingMask, reviews, price, priceMask, msrp, msrpMask, sale, screen, screenMask,
+         width, height, refresh, cpu, gpu, ramSize, ramSizeMask, ramType, storageSize, storageSizeMask, storageType,
+         url, timestamp, score) in zip(
+            catalog.brand, catalog.name, catalog.style, catalog.rating, catalog.ratingMask, catalog.reviews,
+            catalog.price, catalog.priceMask, catalog.msrp, catalog.msrpMask, catalog.sale, catalog.screen, catalog.screenMask,
+            catalog.resolutionWidth, catalog.resolutionHeight, catalog.refresh, catalog.cpu, catalog.gpu,
+            catalog.ramSize, catalog.ramSizeMask, catalog.ramType, catalog.storageSize, catalog.storageSizeMask,
+            catalog.storageType, catalog.url, catalog.timestamp, catalog.score):
+
+        try:
+            head = text[brand, style]
+        except KeyError:
+            head = text[brand, style] = (_escape(str(brand), special) if brand is not None else "", _escape(style, special))
+
+        # Floats are the slow part of formatting, and ratings, prices and scores take few distinct values
+        try:
+            scoreText = floats[score]
+        except KeyError:
+            scoreText = floats[score] = str(score)
+        if ratingMask:
+            try:
+                ratingText = ratings[rating]
+            except KeyError:
+                ratingText = ratings[rating] = str(_number(rating))
+        else:
+            ratingText = ""
+        key = (price if priceMask else None, msrp if msrpMask else None)
+        try:
+            priceText = prices[key]
+        except KeyError:
+            priceText = prices[key] = f"{'' if key[0] is None else _number(price)}{d}{'' if key[1] is None else _number(msrp)}"
+
+        key = (screen if screenMask else None, width, height, refresh)
+        try:
+            display = screens[key]
+        except KeyError:
+            display = screens[key] = f"{'' if key[0] is None else _number(screen)}{d}{_number(width)}{d}{_number(height)}{d}{_number(refresh)}"
+
+        try:
+            cpuText = text[cpu]
+        except KeyError:
+            cpuText = text[cpu] = _escape(str(cpu), special)
+        try:
+            gpuText = text[gpu]
+        except KeyError:
+            gpuText = text[gpu] = _escape(str(gpu), special)
+        key = (ramSize if ramSizeMask else None, ramType, storageSize if storageSizeMask else None, storageType)
+        try:
+            memory = memories[key]
+        except KeyError:
+            memory = memories[key] = d.join("" if value is None else _escape(str(_number(value)), special) for value in key)
+
+        # A scrape stamps a whole batch of listings with one timestamp, so few distinct ones are formatted
+        try:
+            checked = timeText[timestamp]
+        except KeyError:
+            checked = timestamp.isoformat() if timeFormat is None else _escape(timestamp.strftime(timeFormat), special)
+            if len(timeText) < 1 << 16:
+                timeText[timestamp] = checked
+
+        yield (f"{head[0]}{d}{_escape(name, special) if name else ''}{d}{head[1]}{d}{ratingText}{d}{_number(reviews)}{d}"
+               f"{priceText}{d}{_number(sale)}{d}{display}{d}{cpuText}{d}{gpuText}{d}{memory}{d}{_escape(url, special) if url else ''}{d}"
+               f"{checked}{d}{scoreText}\n")
+
+
+def _escape(value: str, special) -> str:
+    # Same quoting as csv.writer's QUOTE_MINIMAL
+    return '"' + value.replace('"', '""') + '"' if special.search(value) else value
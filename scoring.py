@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Named scoring profiles compiled into one fused function
+
+A Profile sets, per sub-score of Computer.create_score, its weight in the total, its scale, its
+cap and its value when the field is missing. A ScoringEngine turns any number of profiles into
+one generated loop that reads each listing once, computes every distinct sub-score once and
+returns one score column per profile. The default profile is create_score itself.
+"""
+
+
+from array import array
+from typing import Iterable, Optional
+
+from catalog import ComputerCatalog
+from computer import SCORE_COMPONENTS, Computer
+
+
+
+# Component -> (expression, fields that must be present), the scale goes where create_score has its constant:
+#   rating: points per star, price: dollars off per point, resolution: points at 1080p, refresh: Hz per point,
+#   features: points per feature, cpu: points per family step, gpu: generation + performance worth 0 points,
+#   ram: points per GB, storage: GB per point
+TERMS = {
+    'rating': ("(rating * {scale})", ('rating',)),
+    'price': ("((msrp - price) / {scale})", ('msrp', 'price')),
+    'resolution': ("(((width * height) / (1920 * 1080)) * {scale})", ()),
+    'refresh': ("(refresh / {scale})", ()),
+    'features': ("((keypad + webcam + backlit) * {scale})", ()),
+    'cpu': ("((family - 1) * {scale})", ('family',)),
+    'gpu': ("(generation + performance - {scale})", ('generation',)),
+    'ram': ("(ram * {scale})", ('ram',)),
+    'storage': ("(storage / {scale})", ('storage',))
+}
+
+# create_score's constants
+DEFAULT_SCALES = {'rating': 20, 'price': 5, 'resolution': 50, 'refresh': 2.4, 'features': 33.4,
+                  'cpu': 12.5, 'gpu': 40, 'ram': 1.5625, 'storage': 20}
+DEFAULT_CAPS = {'rating': None, 'price': 100, 'resolution': 100, 'refresh': 100, 'features': None,
+                'cpu': 100, 'gpu': 100, 'ram': 100, 'storage': 100}
+DEFAULT_MISSING = {'rating': 90, 'price': 0, 'cpu': 0, 'gpu': 20, 'ram': 6.25, 'storage': 6}
+
+# Catalog columns in the order the generated catalog loop unpacks them
+_CATALOG_COLUMNS = (('rating', 'rating'), ('ratingMask', 'ratingMask'), ('price', 'price'), ('priceMask', 'priceMask'),
+                    ('msrp', 'msrp'), ('msrpMask', 'msrpMask'), ('width', 'resolutionWidth'), ('height', 'resolutionHeight'),
+                    ('refresh', 'refresh'), ('keypad', 'keypad'), ('webcam', 'webcam'), ('backlit', 'backlit'),
+                    ('family', 'cpuFamily'), ('familyMask', 'cpuFamilyMask'),
+                    ('generation', 'gpuGeneration'), ('generationMask', 'gpuGenerationMask'), ('performance', 'gpuPerformance'),
+                    ('ram', 'ramSize'), ('ramMask', 'ramSizeMask'), ('storage', 'storageSize'), ('storageMask', 'storageSizeMask'))
+
+_COMPUTER_FIELDS = ("rating, price, msrp, refresh = pc.rating, pc.price, pc.msrp, pc.refresh",
+                    "width, height = pc.resolution[0], pc.resolution[1]",
+                    "keypad, webcam, backlit = pc.keypad, pc.webcam, pc.backlit",
+                    "cpu, gpu = pc.cpu, pc.gpu",
+                    "family, generation, performance = cpu.family, gpu.generation, gpu.performance",
+                    "ram, storage = pc.ram[0], pc.storage[0]")
+
+
+
+class Profile:
+    def __init__(self,
+            name: str,
+            weights: Optional[dict] = None,                                    # component -> weight in the total, 1 if left out
+            scales: Optional[dict] = None,                                     # component -> scale, see TERMS
+            caps: Optional[dict] = None,                                       # component -> cap, None for uncapped
+            missing: Optional[dict] = None,                                    # component -> sub-score when its field is missing
+            cap: Optional[float] = 100,                                        # cap of the total
+            digits: int = 2):                                                  # rounding of the total
+
+        for parameter in (weights, scales, caps, missing):
+            for component in parameter or {}:
+                if component not in SCORE_COMPONENTS:
+                    raise ValueError(f"Unknown score component '{component}'. Must be one of {', '.join(SCORE_COMPONENTS)}.")
+
+        self.name = name
+        self.weights = {component: 1 for component in SCORE_COMPONENTS} | (weights or {})
+        self.scales = DEFAULT_SCALES | (scales or {})
+        self.caps = DEFAULT_CAPS | (caps or {})
+        self.missing = DEFAULT_MISSING | (missing or {})
+        self.cap = cap
+        self.digits = digits
+
+        if not any(self.weights.values()):
+            raise ValueError(f"Profile '{name}' gives every component a weight of 0")
+
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Profile':
+        # Profiles kept in JSON/TOML configuration
+        return Profile(**data)
+
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'weights': self.weights, 'scales': self.scales, 'caps': self.caps,
+                'missing': self.missing, 'cap': self.cap, 'digits': self.digits}
+
+
+    def term(self, component: str, present) -> str:
+        # Source of one sub-score, present(field) giving the test that a field isn't missing
+        template, required = TERMS[component]
+        expression = template.format(scale = repr(self.scales[component]))
+        if self.caps[component] is not None:
+            expression = f"min({expression}, {self.caps[component]!r})"
+        if required:
+            expression = f"({expression} if {' and '.join(present(field) for field in required)} else {self.missing[component]!r})"
+        return expression
+
+
+    def total(self, terms: dict) -> str:
+        # Source of the total over the sub-score variables of the weighted components
+        weighted = [terms[component] if self.weights[component] == 1 else f"{self.weights[component]!r} * {terms[component]}"
+                    for component in SCORE_COMPONENTS if self.weights[component]]
+        expression = f"round(({' + '.join(weighted)}) / {sum(self.weights.values())!r}, {self.digits!r})"
+        return expression if self.cap is None else f"min({expression}, {self.cap!r})"
+
+
+
+DEFAULT_PROFILE = Profile("default")
+
+
+
+class ScoringEngine:
+    # Compiles its profiles once, then scores Computers or a whole ComputerCatalog for all of them in one pass
+    def __init__(self, profiles: Iterable[Profile] = (DEFAULT_PROFILE,)):
+        self.profiles = list(profiles)
+        names = [profile.name for profile in self.profiles]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Profile names must be unique, got {', '.join(names)}")
+
+        self.source = "\n\n".join([
+            self._generate("_score_computers", "for pc in computers:", _COMPUTER_FIELDS, lambda field: f"{field} is not None"),
+            self._generate("_score_columns", f"for {', '.join(name for name, _ in _CATALOG_COLUMNS)} in zip(*columns):",
+                           (), lambda field: f"{field}Mask")])
+        namespace = {'array': array}
+        exec(compile(self.source, f"<scoring {', '.join(names)}>", "exec"), namespace)
+        self._score_computers = namespace['_score_computers']
+        self._score_columns = namespace['_score_columns']
+
+
+    def score(self, computer: Computer) -> dict:
+        # Profile name -> score of one listing
+        return {name: column[0] for name, column in self.score_all([computer]).items()}
+
+
+    def score_all(self, computers: Iterable[Computer]) -> dict:
+        # Profile name -> array('d') of scores, in the order of computers
+        return dict(zip((profile.name for profile in self.profiles), self._score_computers(computers)))
+
+
+    def score_catalog(self, catalog: ComputerCatalog) -> dict:
+        # Same as score_all, straight from the catalog's columns
+        columns = [getattr(catalog, column) for _, column in _CATALOG_COLUMNS]
+        return dict(zip((profile.name for profile in self.profiles), self._score_columns(columns)))
+
+
+    def _generate(self, function: str, loop: str, reads: tuple, present) -> str:
+        # Every distinct sub-score expression becomes one variable, shared by the profiles using it
+        variables, body, totals = {}, [], []
+        for profile in self.profiles:
+            terms = {}
+            for component in SCORE_COMPONENTS:
+                if not profile.weights[component]:
+                    continue
+                expression = profile.term(component, present)
+                if expression not in variables:
+                    variables[expression] = f"{component}{len(variables)}"
+                    body.append(f"{variables[expression]} = {expression}")
+                terms[component] = variables[expression]
+            totals.append(profile.total(terms))
+
+        outputs = [f"out{index}" for index in range(len(self.profiles))]
+        appends = [output + "Append" for output in outputs]
+        arrays = ", ".join(["array('d')"] * len(outputs))
+        lines = [f"def {function}({'computers' if reads else 'columns'}):",
+                 f"    {', '.join(outputs)}, = {arrays},",
+                 f"    {', '.join(appends)}, = {', '.join(output + '.append' for output in outputs)},",
+                 f"    {loop}"]
+        lines += [f"        {line}" for line in reads + tuple(body)]
+        lines += [f"        {append}({total})" for append, total in zip(appends, totals)]
+        lines.append(f"    return {', '.join(outputs)},")
+        return "\n".join(lines)
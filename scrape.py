@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Concurrent scraping pipeline: pooled HTTP fetching on asyncio, parsing in a process pool
+
+Pages are fetched by a fixed number of workers through keep-alive connections, with a
+concurrency cap and a minimum interval between requests per host, and retried with
+exponential backoff. Fetched pages go through a bounded queue to the SiteParser
+registered for their host, which runs in a separate process and yields Computers.
+"""
+
+
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+from urllib.parse import urlsplit
+import asyncio
+import json
+import os
+import random
+import ssl
+
+from computer import Computer
+from httpcache import ResponseCache
+
+
+
+class Response(NamedTuple):
+    url: str
+    status: int
+    headers: dict                                                              # lower-case names
+    body: bytes
+
+
+class FetchError(Exception):
+    def __init__(self, url: str, status: int):
+        super().__init__(f"{url} answered {status}")
+        self.url = url
+        self.status = status
+
+
+
+class SiteParser:
+    # Subclasses list the hosts they handle and turn a page into Computers. They run in a
+    # worker process, so they must be picklable (module-level classes, plain attributes)
+    hosts = ()
+
+    def parse(self, url: str, body: bytes) -> Iterable[Computer]:
+        raise NotImplementedError
+
+
+    def parse_records(self, url: str, body: bytes) -> tuple:
+        # (Computers, [(record index, error)]) for parsers that can tell which records on the page they left out,
+        # the pipeline reports those as failures
+        return list(self.parse(url, body)), []
+
+
+    def links(self, url: str, body: bytes) -> Iterable[str]:
+        # Further pages to visit from this one, used by crawlers
+        return ()
+
+
+
+class RecordParser(SiteParser):
+    # Pages that are JSON records (a list, one object, or JSON Lines) in Computer.to_record() form
+    def __init__(self, *hosts: str, validate: str = "batch"):
+        self.hosts = hosts
+        self.validate = validate
+
+
+    def parse(self, url: str, body: bytes) -> Iterable[Computer]:
+        return self.parse_records(url, body)[0]
+
+
+    def parse_records(self, url: str, body: bytes) -> tuple:
+        text = body.decode()
+        try:
+            records = json.loads(text)
+            records = records if isinstance(records, list) else [records]
+        except ValueError:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+        return Computer.from_records(records, self.validate)
+
+
+
+class HTTPClient:
+    # Minimal HTTP/1.1 client keeping idle connections per (scheme, host, port) for reuse
+    def __init__(self, maxIdle: int = 8, timeout: float = 30.0, userAgent: str = "ComputerFinder"):
+        self.maxIdle = maxIdle
+        self.timeout = timeout
+        self.userAgent = userAgent
+        self._idle = {}                                                        # (scheme, host, port) -> [(reader, writer)]
+
+
+    async def request(self, url: str, method: str = "GET", headers: Optional[dict] = None) -> Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {self.userAgent}",
+                 "Accept-Encoding: identity", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        # A pooled connection may have been closed by the server in the meantime, retry once on a fresh one
+        while True:
+            reader, writer, reused = await self._connect(key)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, responseHeaders, body, keepAlive = await asyncio.wait_for(
+                    self._read_response(reader, method), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            if keepAlive and len(self._idle.setdefault(key, [])) < self.maxIdle:
+                self._idle[key].append((reader, writer))
+            else:
+                writer.close()
+            return Response(url, status, responseHeaders, body)
+
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+    async def _connect(self, key: tuple) -> tuple:
+        connections = self._idle.get(key)
+        while connections:
+            reader, writer = connections.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        scheme, host, port = key
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl = ssl.create_default_context() if scheme == "https" else None),
+            self.timeout)
+        return reader, writer, False
+
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> tuple:
+        statusLine = (await reader.readline()).decode("latin-1").strip()
+        if not statusLine:
+            raise ConnectionResetError("Connection closed before a response")
+        version, status = statusLine.split(" ", 2)[:2]
+        status = int(status)
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keepAlive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()).strip():                   # trailers
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keepAlive = False
+        return status, headers, body, keepAlive
+
+
+
+class _HostLimiter:
+    def __init__(self, concurrency: int, interval: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = interval
+        self._next = 0.0
+
+
+    async def wait_turn(self) -> None:
+        # Spaces request starts at least interval seconds apart
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        start = max(now, self._next)
+        self._next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+
+class ScrapePipeline:
+    def __init__(self,
+            parsers: Iterable[SiteParser],
+            concurrency: int = 16,                                             # fetch workers overall
+            perHost: int = 4,                                                  # requests in flight per host
+            rate: Optional[float] = None,                                      # requests per second per host
+            retries: int = 3,
+            backoff: float = 0.5,                                              # seconds, doubled every retry
+            queueSize: int = 64,                                               # fetched pages waiting for a parser
+            processes: Optional[int] = None,                                   # parser processes, 0 parses inline
+            client: Optional[HTTPClient] = None,
+            cache: Optional[ResponseCache] = None):                            # skips pages that haven't changed
+
+        self.parsers = {host: parser for parser in parsers for host in parser.hosts}
+        self.concurrency = concurrency
+        self.perHost = perHost
+        self.interval = 1 / rate if rate else 0.0
+        self.retries = retries
+        self.backoff = backoff
+        self.queueSize = queueSize
+        self.processes = processes
+        self.client = client or HTTPClient()
+        self.cache = cache
+
+        self.stats = Counter()                                                 # fetched, retried, failed, unchanged, parsed, listings, rejected
+        self.failures = []                                                     # (url, error), for pages and for records they left out
+        self._limiters = {}
+
+
+    def parser_for(self, url: str) -> SiteParser:
+        host = urlsplit(url).hostname
+        if host not in self.parsers:
+            raise ValueError(f"No parser registered for {host}")
+        return self.parsers[host]
+
+
+    async def fetch(self, url: str, headers: Optional[dict] = None) -> Response:
+        # Honours the host's limits, retries connection errors, timeouts, 429 and 5xx with backoff
+        host = urlsplit(url).hostname
+        if host not in self._limiters:
+            self._limiters[host] = _HostLimiter(self.perHost, self.interval)
+        limiter = self._limiters[host]
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats['retried'] += 1
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1) * (1 + random.random() / 2))
+            async with limiter.semaphore:
+                await limiter.wait_turn()
+                try:
+                    response = await self.client.request(url, headers = headers)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+                    lastError = error
+                    continue
+            if response.status == 429 or response.status >= 500:
+                lastError = FetchError(url, response.status)
+                continue
+            self.stats['fetched'] += 1
+            return response
+        raise lastError
+
+
+    async def fetch_page(self, url: str) -> Optional[bytes]:
+        # Body to parse, or None when the cache shows the page hasn't changed since the last run
+        if self.cache is None:
+            response = await self.fetch(url)
+        else:
+            response = await self.fetch(url, self.cache.conditional_headers(url))
+            if response.status == 304:
+                self.cache.not_modified(url)
+                self.stats['unchanged'] += 1
+                return None
+            
+        if response.status != 200:
+            raise FetchError(url, response.status)
+        if self.cache is not None and not self.cache.store(url, response.body, response.headers):
+            self.stats['unchanged'] += 1
+            return None
+        return response.body
+
+
+    async def scrape(self, urls: Iterable[str]) -> AsyncIterator[Computer]:
+        # Yields Computers as pages get parsed, in no particular order. Pages that fail end up in self.failures
+        urlQueue = asyncio.Queue()
+        for url in urls:
+            urlQueue.put_nowait(url)
+        pages = asyncio.Queue(maxsize = self.queueSize)
+        results = asyncio.Queue()
+
+        if self.processes == 0:
+            executor, parseWorkers = None, 1
+        else:
+            executor = ProcessPoolExecutor(self.processes)
+            parseWorkers = self.processes or os.cpu_count() or 1
+        fetchers = [asyncio.create_task(self._fetch_worker(urlQueue, pages)) for _ in range(self.concurrency)]
+        parsers = [asyncio.create_task(self._parse_worker(pages, results, executor)) for _ in range(parseWorkers)]
+
+        async def supervise():
+            await asyncio.gather(*fetchers)
+            for _ in parsers:
+                await pages.put(None)
+            await asyncio.gather(*parsers)
+            await results.put(None)
+
+        supervisor = asyncio.create_task(supervise())
+        try:
+            while (batch := await results.get()) is not None:
+                for computer in batch:
+                    yield computer
+        finally:
+            for task in fetchers + parsers + [supervisor]:
+                task.cancel()
+            await asyncio.gather(*fetchers, *parsers, supervisor, return_exceptions = True)
+            if executor:
+                executor.shutdown(cancel_futures = True)
+
+
+    def scrape_all(self, urls: Iterable[str]) -> list:
+        # Blocking convenience around scrape()
+        async def collect():
+            try:
+                return [computer async for computer in self.scrape(urls)]
+            finally:
+                await self.client.close()
+        return asyncio.run(collect())
+
+
+    async def _fetch_worker(self, urlQueue: asyncio.Queue, pages: asyncio.Queue) -> None:
+        while not urlQueue.empty():
+            url = urlQueue.get_nowait()
+            try:
+                parser = self.parser_for(url)
+                body = await self.fetch_page(url)
+            except (FetchError, OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+                self._fail(url, error)
+                continue
+            if body is not None:
+                await pages.put((parser, url, body))
+
+
+    async def _parse_worker(self, pages: asyncio.Queue, results: asyncio.Queue, executor: Optional[Executor]) -> None:
+        loop = asyncio.get_running_loop()
+        while (page := await pages.get()) is not None:
+            parser, url, body = page
+            try:
+                if executor:
+                    computers, rejected = await loop.run_in_executor(executor, parse_page, parser, url, body)
+                else:
+                    computers, rejected = parse_page(parser, url, body)
+            except Exception as error:                                         # a broken page must not stop the run
+                self._fail(url, error)
+                continue
+            for index, error in rejected:
+                self._reject(url, index, error)
+            self.stats['parsed'] += 1
+            self.stats['listings'] += len(computers)
+            await results.put(computers)
+
+
+    def _reject(self, url: str, index: int, error: Exception) -> None:
+        # A record the page's parser left out, the page itself was parsed
+        self.stats['rejected'] += 1
+        failure = ValueError(f"Record {index}: {error}")
+        failure.__cause__ = error
+        self.failures.append((url, failure))
+
+
+    def _fail(self, url: str, error: Exception) -> None:
+        self.stats['failed'] += 1
+        self.failures.append((url, error))
+
+
+
+def parse_page(parser: SiteParser, url: str, body: bytes) -> tuple:
+    # Module level so worker processes can run it. (Computers, [(record index, error)])
+    computers, rejected = parser.parse_records(url, body)
+    return list(computers), list(rejected)
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Binary columnar snapshots of a ComputerCatalog, opened through mmap without copying
+
+Layout: 8 byte magic, 8 byte header length, JSON header, then 8 byte aligned blocks.
+Numeric columns are fixed width (float64 with NaN for missing, uint8 flags), string
+columns are int32 codes (-1 for None) into a dictionary of offsets plus a UTF-8 blob.
+"""
+
+
+from array import array
+from datetime import datetime
+from typing import Optional
+import json
+import math
+import mmap
+import struct
+import sys
+
+from catalog import ComputerCatalog, _number
+from computer import CPU, GPU, Capacity, Resolution
+
+
+
+MAGIC = b"CFSNAP01"
+
+# Fixed width columns
+FLOAT_COLUMNS = ('price', 'msrp', 'rating', 'screen', 'reviews', 'sale', 'resolutionWidth', 'resolutionHeight', 'refresh',
+                 'ramSize', 'storageSize', 'score')
+FLAG_COLUMNS = ('keypad', 'webcam', 'backlit')
+
+# Dictionary encoded columns, cpu/gpu hold spec ids whose dictionary entries are the spec's to_dict() JSON
+STRING_COLUMNS = ('brand', 'name', 'style', 'cpu', 'gpu', 'ramType', 'storageType', 'url', 'timestamp')
+
+
+
+def write_snapshot(catalog: ComputerCatalog, path: str) -> None:
+    header = {'rows': len(catalog), 'byteorder': sys.byteorder, 'columns': {}, 'dictionaries': {}}
+    blocks = []
+
+    def add_block(data: bytes) -> int:
+        # Offsets count from the end of the header
+        offset = sum(len(block) for block in blocks)
+        blocks.append(data + b"\0" * (-len(data) % 8))
+        return offset
+
+    for name in FLOAT_COLUMNS:
+        values, mask = _float_source(catalog, name)
+        column = array('d', values) if mask is None else array('d', [v if m else math.nan for v, m in zip(values, mask)])
+        header['columns'][name] = {'type': 'd', 'offset': add_block(column.tobytes())}
+
+    for name in FLAG_COLUMNS:
+        header['columns'][name] = {'type': 'B', 'offset': add_block(array('B', getattr(catalog, name)).tobytes())}
+
+    for name in STRING_COLUMNS:
+        codes, entries = _encode(_string_source(catalog, name))
+        encoded = [entry.encode() for entry in entries]
+        offsets = array('q', [0])
+        for entry in encoded:
+            offsets.append(offsets[-1] + len(entry))
+
+        header['columns'][name] = {'type': 'i', 'offset': add_block(codes.tobytes())}
+        header['dictionaries'][name] = {'count': len(entries),
+                                        'offsets': add_block(offsets.tobytes()),
+                                        'blob': add_block(b"".join(encoded))}
+
+    headerBytes = json.dumps(header, separators = (',', ':')).encode()
+    headerBytes += b" " * (-(len(MAGIC) + 8 + len(headerBytes)) % 8)
+
+    with open(path, "wb") as fp:
+        fp.write(MAGIC)
+        fp.write(struct.pack("<Q", len(headerBytes)))
+        fp.write(headerBytes)
+        for block in blocks:
+            fp.write(block)
+
+
+
+class Snapshot:
+    # Columns are memoryviews straight over the mapped file, several processes can open the same
+    # snapshot and share its pages. Release every view taken from column() before close()
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access = mmap.ACCESS_READ)
+        except ValueError:                                                     # empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a snapshot")
+
+        self._buffer = memoryview(self._map)
+        if self._buffer[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot")
+
+        headerLength, = struct.unpack_from("<Q", self._buffer, len(MAGIC))
+        headerStart = len(MAGIC) + 8
+        self.header = json.loads(bytes(self._buffer[headerStart:headerStart + headerLength]))
+        if self.header['byteorder'] != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path} was written on a {self.header['byteorder']} endian machine")
+
+        self.rows = self.header['rows']
+        self._dataStart = headerStart + headerLength
+        self._columns = {}
+        self._entries = {name: {} for name in STRING_COLUMNS}                  # decoded dictionary entries
+        self._codes = {}                                                       # reverse dictionaries, built on demand
+
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+    def __enter__(self) -> 'Snapshot':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        for view in self._columns.values():
+            view.release()
+        self._columns.clear()
+        self._buffer.release()
+        self._map.close()
+        self._file.close()
+
+
+    def column(self, name: str) -> memoryview:
+        # Typed, zero-copy view: floats ('d', NaN when missing), flags ('B') or dictionary codes ('i')
+        if name not in self._columns:
+            spec = self.header['columns'][name]
+            self._columns[name] = self._view(spec['offset'], spec['type'], self.rows)
+        return self._columns[name]
+
+
+    def value(self, name: str, index: int):
+        # Decoded value of one row, None for missing, whole numbers as ints like ComputerCatalog.row()
+        if name in self.header['dictionaries']:
+            code = self.column(name)[index]
+            return None if code < 0 else self.entry(name, code)
+
+        value = self.column(name)[index]
+        if name in FLOAT_COLUMNS and math.isnan(value):
+            return None
+        if name in FLAG_COLUMNS:
+            return bool(value)
+        return value if name == 'score' else _number(value)
+
+
+    def entry(self, name: str, code: int):
+        # Dictionary entry behind a code, decoded once then kept
+        entries = self._entries[name]
+        if code not in entries:
+            dictionary = self.header['dictionaries'][name]
+            with self._view(dictionary['offsets'], 'q', dictionary['count'] + 1) as offsets:
+                start, end = offsets[code], offsets[code + 1]
+            blobStart = self._dataStart + dictionary['blob']
+            text = bytes(self._buffer[blobStart + start:blobStart + end]).decode()
+
+            if name == 'cpu':
+                entries[code] = CPU(**json.loads(text))
+            elif name == 'gpu':
+                entries[code] = GPU(**json.loads(text))
+            elif name == 'timestamp':
+                entries[code] = datetime.fromisoformat(text)
+            else:
+                entries[code] = text
+        return entries[code]
+
+
+    def code_of(self, name: str, value) -> Optional[int]:
+        # Code of a dictionary value, for filtering a string column by comparing codes
+        if name not in self._codes:
+            count = self.header['dictionaries'][name]['count']
+            self._codes[name] = {self.entry(name, code): code for code in range(count)}
+        return self._codes[name].get(value)
+
+
+    def row(self, index: int) -> list:
+        # Same layout as Computer.to_row()
+        value = self.value
+        timestamp = value('timestamp', index)
+        return [value('brand', index), value('name', index), value('style', index),
+                value('rating', index), value('reviews', index),
+                value('price', index), value('msrp', index), value('sale', index),
+                value('screen', index),
+                Resolution(value('resolutionWidth', index), value('resolutionHeight', index)), value('refresh', index),
+                value('cpu', index), value('gpu', index),
+                Capacity(value('ramSize', index), value('ramType', index)),
+                Capacity(value('storageSize', index), value('storageType', index)),
+                value('url', index), timestamp.isoformat() if timestamp else None, value('score', index)]
+
+
+    def to_catalog(self) -> ComputerCatalog:
+        # Copies the columns into an in-memory catalog, e.g. to re-score it
+        catalog = ComputerCatalog()
+        for name in ('price', 'msrp', 'rating', 'screen', 'ramSize', 'storageSize'):
+            values = self.column(name)
+            setattr(catalog, name, array('d', [0 if math.isnan(v) else v for v in values]))
+            setattr(catalog, name + 'Mask', array('B', [not math.isnan(v) for v in values]))
+        for name in ('reviews', 'sale', 'resolutionWidth', 'resolutionHeight', 'refresh', 'score'):
+            setattr(catalog, name, array('d', self.column(name)))
+        for name in FLAG_COLUMNS:
+            setattr(catalog, name, array('B', self.column(name)))
+        for name in ('brand', 'name', 'style', 'ramType', 'storageType', 'url', 'timestamp'):
+            setattr(catalog, name, [self.value(name, index) for index in range(self.rows)])
+
+        catalog.cpu = [self.value('cpu', index) for index in range(self.rows)]
+        catalog.gpu = [self.value('gpu', index) for index in range(self.rows)]
+        for cpu in catalog.cpu:
+            _append_spec(catalog.cpuFamily, catalog.cpuFamilyMask, cpu.family)
+        for gpu in catalog.gpu:
+            _append_spec(catalog.gpuGeneration, catalog.gpuGenerationMask, gpu.generation)
+            catalog.gpuPerformance.append(gpu.performance or 0)
+        return catalog
+
+
+    def _view(self, offset: int, typecode: str, count: int) -> memoryview:
+        start = self._dataStart + offset
+        return self._buffer[start:start + count * array(typecode).itemsize].cast(typecode)
+
+
+
+def _float_source(catalog: ComputerCatalog, name: str) -> tuple:
+    mask = getattr(catalog, name + 'Mask', None)
+    return getattr(catalog, name), mask
+
+
+def _string_source(catalog: ComputerCatalog, name: str) -> list:
+    if name in ('cpu', 'gpu'):
+        return [json.dumps(spec.to_dict(), separators = (',', ':')) for spec in getattr(catalog, name)]
+    if name == 'timestamp':
+        return [timestamp.isoformat() if timestamp else None for timestamp in catalog.timestamp]
+    return getattr(catalog, name)
+
+
+def _encode(values: list) -> tuple:
+    codes, entries, lookup = array('i'), [], {}
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(entries)
+            entries.append(value)
+        codes.append(code)
+    return codes, entries
+
+
+def _append_spec(column: array, mask: array, value: Optional[int]) -> None:
+    column.append(value or 0)
+    mask.append(value is not None)
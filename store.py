@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent listing store on SQLite, keyed by URL
+
+Listings map to one row of the listings table, the to_row() fields plus the physical
+ones, with CPU/GPU specs normalized into their own tables. Writes are batched upserts,
+reads are generators that only build a Computer for each row actually consumed.
+"""
+
+
+from datetime import datetime
+from typing import Iterable, Optional
+import json
+import sqlite3
+
+from computer import CPU, GPU, Capacity, Computer, Dimensions, Resolution
+
+
+
+# Listing columns, in the order _listing_row fills them and _row_computer reads them
+COLUMNS = ('url', 'brand', 'name', 'style',
+           'rating', 'reviews', 'price', 'msrp', 'sale',
+           'weight', 'length', 'width', 'thickness',
+           'screen', 'resolutionWidth', 'resolutionHeight', 'refresh',
+           'keypad', 'webcam', 'backlit',
+           'cpu', 'gpu', 'ramSize', 'ramType', 'storageSize', 'storageType',
+           'timestamp', 'score')
+
+# Columns select can sort on
+ORDER_COLUMNS = ('price', 'score', 'ramSize', 'storageSize', 'rating', 'timestamp', 'url')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cpus (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    brand TEXT, family INTEGER, generation INTEGER, model, suffix TEXT        -- untyped, "05" models keep their zero
+);
+CREATE TABLE IF NOT EXISTS gpus (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    brand TEXT, series TEXT, generation INTEGER, performance INTEGER, suffix TEXT
+);
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    brand TEXT, name TEXT, style TEXT NOT NULL,
+    rating, reviews INTEGER, price, msrp, sale INTEGER,
+    weight, length, width, thickness,
+    screen, resolutionWidth INTEGER, resolutionHeight INTEGER, refresh INTEGER,
+    keypad INTEGER, webcam INTEGER, backlit INTEGER,
+    cpu INTEGER NOT NULL REFERENCES cpus(id), gpu INTEGER NOT NULL REFERENCES gpus(id),
+    ramSize INTEGER, ramType TEXT, storageSize INTEGER, storageType TEXT,
+    timestamp TEXT NOT NULL, score REAL
+);
+-- Untyped columns keep ints and floats as they were given
+-- Each index leads with one filter column and carries the others, so any filter combination
+-- is resolved from an index and only matching rows are read from the table
+CREATE INDEX IF NOT EXISTS listings_style ON listings (style, price, score, ramSize);
+CREATE INDEX IF NOT EXISTS listings_price ON listings (price, style, score, ramSize);
+CREATE INDEX IF NOT EXISTS listings_score ON listings (score, style, price, ramSize);
+CREATE INDEX IF NOT EXISTS listings_ram ON listings (ramSize, style, price, score);
+"""
+
+_UPSERT = (f"INSERT INTO listings ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+           f"ON CONFLICT(url) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])}")
+
+
+
+class ListingStore:
+    def __init__(self, path: str, batchSize: int = 10_000):
+        self.path = path
+        self.batchSize = batchSize                                             # rows per executemany and transaction
+
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")                # WAL stays consistent, only fsyncs at checkpoints
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        self._connection.executescript(SCHEMA)
+
+        self._specIds = {CPU: {}, GPU: {}}                                     # spec -> row id, specs are interned
+        self._specs = {CPU: {}, GPU: {}}                                       # row id -> spec
+
+
+    def __enter__(self) -> 'ListingStore':
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+
+
+    def __contains__(self, url: str) -> bool:
+        return self._connection.execute("SELECT 1 FROM listings WHERE url = ?", (url,)).fetchone() is not None
+
+
+    def upsert(self, computers: Iterable[Computer]) -> int:
+        # Inserts new URLs and overwrites known ones, batchSize rows per transaction. Returns the rows written
+        written, batch = 0, []
+        for computer in computers:
+            if computer.url is None:
+                raise ValueError("Listings without a URL can't be stored")
+            batch.append(computer)
+            if len(batch) >= self.batchSize:
+                written += self._write(batch)
+                batch = []
+        if batch:
+            written += self._write(batch)
+        return written
+
+
+    def get(self, url: str) -> Optional[Computer]:
+        row = self._connection.execute(f"SELECT {', '.join(COLUMNS)} FROM listings WHERE url = ?", (url,)).fetchone()
+        return None if row is None else self._row_computer(row)
+
+
+    def delete(self, urls: Iterable[str]) -> int:
+        # Returns how many listings were removed
+        with self._connection:
+            cursor = self._connection.executemany("DELETE FROM listings WHERE url = ?", ((url,) for url in urls))
+        return cursor.rowcount
+
+
+    def select(self,
+            style: Optional[str] = None,
+            minPrice: Optional[float] = None,
+            maxPrice: Optional[float] = None,
+            minRam: Optional[int] = None,
+            minScore: Optional[float] = None,
+            orderBy: Optional[str] = None,                                     # one of ORDER_COLUMNS, None for storage order
+            descending: bool = False,
+            limit: Optional[int] = None) -> Iterable[Computer]:
+        # Lazy: rows are fetched in batches as the generator is consumed and a Computer is only built per row yielded
+        conditions, parameters = [], []
+        for condition, value in (("style = ?", style), ("price >= ?", minPrice), ("price <= ?", maxPrice),
+                                 ("ramSize >= ?", minRam), ("score >= ?", minScore)):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+
+        query = f"SELECT {', '.join(COLUMNS)} FROM listings"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if orderBy is not None:
+            if orderBy not in ORDER_COLUMNS:
+                raise ValueError(f"Invalid orderBy '{orderBy}'. Must be one of {', '.join(ORDER_COLUMNS)}.")
+            query += f" ORDER BY {orderBy} {'DESC' if descending else 'ASC'}"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+
+        cursor = self._connection.execute(query, parameters)
+        cursor.arraysize = 1000
+        try:
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row_computer(row)
+        finally:
+            cursor.close()
+
+
+    def _write(self, computers: list) -> int:
+        # Spec rows inserted by this batch are only cached once it commits, a rolled back batch takes them with it
+        inserted = {CPU: {}, GPU: {}}
+        with self._connection:
+            cpus = self._spec_ids(CPU, {computer.cpu for computer in computers}, inserted[CPU])
+            gpus = self._spec_ids(GPU, {computer.gpu for computer in computers}, inserted[GPU])
+            self._connection.executemany(_UPSERT, (_listing_row(computer, cpus[computer.cpu], gpus[computer.gpu])
+                                                   for computer in computers))
+        for kind, ids in inserted.items():
+            self._specIds[kind].update(ids)
+            self._specs[kind].update((rowId, spec) for spec, rowId in ids.items())
+        return len(computers)
+
+
+    def _spec_ids(self, kind: type, specs: set, inserted: dict) -> dict:
+        # Row ids of specs, the ones not cached yet are looked up or inserted and added to inserted
+        known = self._specIds[kind]
+        table = "cpus" if kind is CPU else "gpus"
+        for spec in specs - known.keys():
+            fields = spec.to_dict()
+            key = json.dumps(spec.key)
+            self._connection.execute(f"INSERT INTO {table} (key, {', '.join(fields)}) VALUES (?{', ?' * len(fields)}) "
+                                     "ON CONFLICT(key) DO NOTHING", (key, *fields.values()))
+            inserted[spec] = self._connection.execute(f"SELECT id FROM {table} WHERE key = ?", (key,)).fetchone()[0]
+        return {spec: known[spec] if spec in known else inserted[spec] for spec in specs}
+
+
+    def _spec(self, kind: type, rowId: int):
+        spec = self._specs[kind].get(rowId)
+        if spec is None:
+            table = "cpus" if kind is CPU else "gpus"
+            cursor = self._connection.execute(f"SELECT * FROM {table} WHERE id = ?", (rowId,))
+            fields = dict(zip((description[0] for description in cursor.description), cursor.fetchone()))
+            del fields['id'], fields['key']
+            spec = self._specs[kind][rowId] = kind(**fields)
+            self._specIds[kind][spec] = rowId
+        return spec
+
+
+    def _row_computer(self, row: tuple) -> Computer:
+        # Rows were checked on the way in, so the fields are set as is, like from_records(validate="none")
+        (url, brand, name, style, rating, reviews, price, msrp, sale, weight, length, width, thickness,
+         screen, resolutionWidth, resolutionHeight, refresh, keypad, webcam, backlit,
+         cpu, gpu, ramSize, ramType, storageSize, storageType, timestamp, score) = row
+
+        computer = Computer.__new__(Computer)
+        computer.brand, computer.name, computer.style = brand, name, style
+        computer.rating, computer.reviews = rating, reviews
+        computer.price, computer.msrp, computer.sale = price, msrp, sale
+        computer.weight, computer.dimensions = weight, Dimensions(length, width, thickness)
+        computer.screen, computer.resolution, computer.refresh = screen, Resolution(resolutionWidth, resolutionHeight), refresh
+        computer.keypad, computer.webcam, computer.backlit = bool(keypad), bool(webcam), bool(backlit)
+        computer.cpu, computer.gpu = self._spec(CPU, cpu), self._spec(GPU, gpu)
+        computer.ram, computer.storage = Capacity(ramSize, ramType), Capacity(storageSize, storageType)
+        computer.url, computer.timestamp = url, datetime.fromisoformat(timestamp)
+        computer.score = score if score is not None else computer.create_score()
+        return computer
+
+
+
+def _listing_row(computer: Computer, cpu: int, gpu: int) -> tuple:
+    dimensions, resolution, ram, storage = computer.dimensions, computer.resolution, computer.ram, computer.storage
+    return (computer.url, computer.brand, computer.name, computer.style,
+            computer.rating, computer.reviews, computer.price, computer.msrp, computer.sale,
+            computer.weight, dimensions[0], dimensions[1], dimensions[2],
+            computer.screen, resolution[0], resolution[1], computer.refresh,
+            computer.keypad, computer.webcam, computer.backlit,
+            cpu, gpu, ram[0], ram[1], storage[0], storage[1],
+            computer.timestamp.isoformat(), computer.score)
+
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Local HTTP server standing in for retailer sites, so scraping and crawling run offline
+
+Paths, i being a page number:
+  /p/i        three listings as JSON records with an ETag, chunked for odd i and
+              Content-Length for even i, 304 to a matching If-None-Match
+  /plain/i    the same listings without an ETag, so only the content hash tells it unchanged
+  /flaky/i    503 on the first request, then like /p/i
+  /missing/i  404
+  /bad/i      the listings of /p/i followed by two invalid records (a negative price, a string CPU)
+"""
+
+
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+from computer import CPU, GPU, Computer
+from scrape import RecordParser
+
+
+
+PAGES = 120                                                                    # pages a LinkParser crawl reaches from /p/0
+
+
+def listings(page: int) -> list:
+    # Same records on every request, so an unchanged page has the same body
+    return [Computer(brand = "HP", name = f"Victus {page}", price = 500 + page + j, msrp = 900,
+                     cpu = CPU("Intel", 5, 12, 450, "H"), gpu = GPU("NVIDIA", "RTX", 40, 60),
+                     ram = (16, "DDR5"), storage = (512, "SSD"), url = f"http://shop/{page}/{j}",
+                     timestamp = datetime(2026, 10, 1)).to_record()
+            for j in range(3)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.hits[self.path] += 1
+            hits = server.hits[self.path]
+            if "If-None-Match" in self.headers:
+                server.conditional[self.path] += 1
+
+        kind, page = self.path.strip("/").split("/")
+        page = int(page)
+        if kind == "missing" or (kind == "flaky" and hits == 1):
+            self._empty(404 if kind == "missing" else 503)
+            return
+
+        etag = None if kind == "plain" else f'"{page}"'
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self._empty(304, etag)
+            return
+
+        records = listings(page) + ([{'price': -5}, {'cpu': "Intel"}] if kind == "bad" else [])
+        body = json.dumps(records).encode()
+        self.send_response(200)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if page % 2:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 100):
+                chunk = body[start:start + 100]
+                self.wfile.write(b"%x\r\n" % len(chunk) + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+    def _empty(self, status: int, etag: str = None) -> None:
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        if status != 304:
+            self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+
+class FixtureServer(ThreadingHTTPServer):
+    # with FixtureServer() as server: server.url("/p/0"), server.hits["/p/0"]
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.lock = threading.Lock()
+        self.hits = Counter()                                                  # path -> requests
+        self.conditional = Counter()                                           # path -> requests with If-None-Match
+        self.port = self.server_address[1]
+
+
+    def __enter__(self) -> 'FixtureServer':
+        threading.Thread(target = self.serve_forever, daemon = True).start()
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+    def url(self, path: str, host: str = "127.0.0.1") -> str:
+        return f"http://{host}:{self.port}{path}"
+
+
+
+class LinkParser(RecordParser):
+    # /p/i links to /p/2i+1 and /p/2i+2 up to PAGES, every third link on the other host so crawls cross shards
+    def __init__(self, host: str, other: str):
+        super().__init__(host.partition(":")[0])
+        self.host = host
+        self.other = other
+
+
+    def links(self, url: str, body: bytes) -> list:
+        page = int(url.rsplit("/", 1)[1])
+        return [f"http://{self.other if link % 3 == 0 else self.host}/p/{link}#listings"
+                for link in (2 * page + 1, 2 * page + 2) if link < PAGES]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+FileSink reopening an alert log torn by a crash
+"""
+
+
+from datetime import datetime
+import os
+import tempfile
+import unittest
+
+from alerts import Alert, FileSink
+
+
+
+T0 = datetime(2026, 10, 1)
+
+
+class FileSinkTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "alerts.jsonl")
+
+
+    def test_torn_last_line_is_cut_off(self):
+        sink = FileSink(self.path)
+        sink.send(Alert("cheap", "u1", 900, 1000, 10, 70.0, T0))
+        sink.send(Alert("cheap", "u2", 800, 1000, 20, 75.0, T0))
+        sink.close()
+        with open(self.path, "rb+") as fp:
+            fp.truncate(os.path.getsize(self.path) - 10)
+
+        sink = FileSink(self.path)
+        self.assertEqual(sink.sent, {("cheap", "u1")})
+        sink.send(Alert("cheap", "u3", 700, 1000, 30, 80.0, T0))
+        sink.close()
+        self.assertEqual(FileSink(self.path).sent, {("cheap", "u1"), ("cheap", "u3")})
+
+
+    def test_corrupt_line_before_the_end_raises(self):
+        with open(self.path, "w", encoding = "utf-8") as fp:
+            fp.write('{"rule":\n{}\n')
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            FileSink(self.path)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+ComputerCatalog against the Computers it holds: rows, scores and in-place updates
+"""
+
+
+import unittest
+from datetime import datetime
+
+from catalog import ComputerCatalog
+from computer import CPU, GPU, Computer
+
+
+
+class ComputerCatalogTest(unittest.TestCase):
+    def computers(self) -> list:
+        timestamp = datetime(2026, 10, 1)
+        return [Computer(brand = "HP", price = 650, msrp = 900, rating = 4.5, reviews = 120, sale = 27.5,
+                         screen = 15.6, resolution = (1920, 1080), refresh = 59.94, keypad = True,
+                         cpu = CPU("Intel", 7, 13, 700, "H"), gpu = GPU("NVIDIA", "RTX", 40, 60),
+                         ram = (15.5, "DDR5"), storage = (512, "SSD"), url = "u0", timestamp = timestamp),
+                Computer(brand = "Dell", style = "Tower", price = 999.99, ram = (32, "DDR4"), url = "u1",
+                         timestamp = timestamp),
+                Computer(url = "u2", timestamp = timestamp)]
+
+
+    def test_float_values(self):
+        computers = self.computers()
+        for computer in computers:
+            computer.create_score()
+        catalog = ComputerCatalog(computers)
+        self.assertEqual(list(catalog.rows()), [computer.to_row() for computer in computers])
+
+
+    def test_scores_match_computer(self):
+        computers = self.computers()
+        catalog = ComputerCatalog(computers)
+        catalog.create_score()
+        for index, computer in enumerate(computers):
+            self.assertEqual([column[index] for column in catalog.subScores.values()], computer.create_score() and
+                             computer.subScores)
+            self.assertEqual(catalog.score[index], computer.score)
+
+
+    def test_update_many(self):
+        computers = self.computers()
+        catalog = ComputerCatalog(computers)
+        catalog.create_score()
+        catalog.update_many([(1, {'refresh': 143.9, 'ram': [24.5, "DDR5"], 'missing': 1})])
+        computers[1].update({'refresh': 143.9, 'ram': [24.5, "DDR5"]})
+        self.assertEqual(catalog.row(1), computers[1].to_row())
+
+
+    def test_rejected_update_leaves_the_row(self):
+        catalog = ComputerCatalog(self.computers())
+        catalog.create_score()
+        before = catalog.row(0)
+        for data in ({'price': 300, 'reviews': -1},
+                     {'price': 300, 'refresh': 2 ** 1100},                     # passes the check, too big for a float column
+                     {'price': 300, 'rating': 4, 'storage': (2 ** 1100, "SSD")}):
+            with self.assertRaises((ValueError, OverflowError)):
+                catalog.update_many([(0, data)])
+            self.assertEqual(catalog.row(0), before)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Computer's fields and records
+"""
+
+
+import unittest
+
+from computer import CPU_BRANDS, CPU_FAMILIES, GPU, Computer, canonical_column
+
+
+
+class CompoundFieldTest(unittest.TestCase):
+    def test_equal_values_of_other_types_stay_apart(self):
+        Computer(storage = [512.0, "SSD"], ram = (16.0, "DDR5"))
+        computer = Computer(storage = [512, "SSD"], ram = [16, "DDR5"])
+        self.assertEqual([type(computer.storage[0]), type(computer.ram[0])], [int, int])
+        self.assertIn("16 GB of DDR5", str(computer))
+
+
+    def test_equal_values_share_one_tuple(self):
+        self.assertIs(Computer(storage = [1000, "SSD"]).storage, Computer(storage = [1000, "SSD"]).storage)
+
+
+
+class SpecColumnTest(unittest.TestCase):
+    def test_canonical_column(self):
+        self.assertEqual(canonical_column(CPU_BRANDS, ["intel", "AMD", None, "intel"], "CPU brand"), (["Intel", "AMD", None, "Intel"], {}))
+        families, errors = canonical_column(CPU_FAMILIES, [7, "5", 5.0, 6, [7]], "CPU family", int)
+        self.assertEqual(families, [7, 5, None, None, None])
+        self.assertEqual({position: type(error) for position, error in errors.items()}, {2: TypeError, 3: ValueError, 4: TypeError})
+
+
+    def test_batch_records_decode_specs_like_the_constructors(self):
+        records = [{'cpu': {'brand': "intel", 'family': 7, 'generation': 13, 'model': 700, 'suffix': "h"}},
+                   {'cpu': {'brand': "intel", 'family': 7.0}},
+                   {'cpu': {'brand': "Foo"}, 'gpu': {'brand': "radeon", 'series': "rx", 'generation': 76, 'performance': 0}},
+                   {'gpu': {'brand': "nvidia", 'series': ["rtx"]}},
+                   {'cpu': {'brand': "amd", 'family': 9, 'cores': 16}},
+                   {'cpu': {'family': 7, 'brand': "intel", 'generation': 13, 'model': 700, 'suffix': "H"},
+                    'gpu': {'brand': "radeon", 'series': "rx", 'generation': 76, 'performance': 0}}]
+        batch, none = Computer.from_records(records), Computer.from_records(records, "none")
+        self.assertEqual([(computer.cpu, computer.gpu) for computer in batch[0]], [(computer.cpu, computer.gpu) for computer in none[0]])
+        self.assertEqual([(index, str(error)) for index, error in batch[1]], [(index, str(error)) for index, error in none[1]])
+        self.assertEqual([index for index, _ in batch[1]], [1, 2, 3, 4])
+        self.assertIs(batch[0][0].cpu, batch[0][1].cpu)
+
+
+    def test_radeon_suffixes_are_upper_case(self):
+        self.assertEqual([GPU("Radeon", "RX", 79, 0, suffix).suffix for suffix in ("xtx", "gre", "pro", "xt m")],
+                         ["XTX", "GRE", "PRO", "XT M"])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
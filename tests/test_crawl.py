@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+CrawlCoordinator against the local fixture server, served under two host names so pages
+are spread over more than one shard
+"""
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from crawl import PAGES as PAGE_LOG, SINK, CrawlCoordinator
+from httpcache import ResponseCache
+from tests.fixtures import PAGES, FixtureServer, LinkParser, listings
+
+
+
+EXPECTED = sorted((record['url'], record['price']) for page in range(PAGES) for record in listings(page))
+
+
+class CrawlCoordinatorTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        self.hosts = (f"127.0.0.1:{self.server.port}", f"localhost:{self.server.port}")
+        self.seed = self.server.url("/p/0")
+
+
+    def coordinator(self, name: str, **options) -> CrawlCoordinator:
+        first, second = self.hosts
+        return CrawlCoordinator([LinkParser(first, second), LinkParser(second, first)],
+                                os.path.join(self.directory.name, name), shards = 3, checkpointEvery = 7, **options)
+
+
+    def sink(self, name: str) -> list:
+        with open(os.path.join(self.directory.name, name, SINK), "r", encoding = "utf-8") as fp:
+            return sorted((record['url'], record['price']) for record in map(json.loads, fp))
+
+
+    def completed(self, name: str) -> list:
+        with open(os.path.join(self.directory.name, name, PAGE_LOG), "r", encoding = "utf-8") as fp:
+            return fp.read().split()
+
+
+    def test_full_crawl(self):
+        stats = self.coordinator("crawl").run([self.seed])
+        self.assertEqual((stats['pages'], stats['listings'], stats['failed']), (PAGES, 3 * PAGES, 0))
+        self.assertEqual(self.sink("crawl"), EXPECTED)
+
+
+    def test_interrupt_and_resume(self):
+        stats = self.coordinator("crawl").run([self.seed], maxPages = 25)
+        self.assertEqual(stats['pages'], 25)
+        completed = self.completed("crawl")
+        hits = {url: self.server.hits[url.split(str(self.server.port), 1)[1]] for url in completed}
+
+        stats = self.coordinator("crawl").run([self.seed])
+        self.assertEqual(stats['resumed'], 25)
+        self.assertEqual(stats['pages'], PAGES - 25)
+        for url, count in hits.items():                                        # pages done before the stop aren't fetched again
+            self.assertEqual(self.server.hits[url.split(str(self.server.port), 1)[1]], count, url)
+        self.assertEqual(self.sink("crawl"), EXPECTED)
+        self.assertEqual(sorted(self.completed("crawl")), sorted(set(self.completed("crawl"))))
+
+        stats = self.coordinator("crawl").run([self.seed])
+        self.assertEqual(stats['pages'], 0)
+
+
+    def test_recrawl_follows_links_of_unchanged_pages(self):
+        cacheDirectory = os.path.join(self.directory.name, "cache")
+        self.coordinator("first", cacheDirectory = cacheDirectory).run([self.seed])
+
+        stats = self.coordinator("second", cacheDirectory = cacheDirectory).run([self.seed])
+        self.assertEqual((stats['pages'], stats['listings']), (PAGES, 0))
+        self.assertEqual(sum(self.server.conditional.values()), PAGES)
+
+
+    def test_resume_parses_unchanged_pending_pages(self):
+        # Pages the stopped run had cached but not checkpointed still get their listings written
+        cacheDirectory = os.path.join(self.directory.name, "cache")
+        self.coordinator("crawl", cacheDirectory = cacheDirectory).run([self.seed], maxPages = 25)
+        self.coordinator("crawl", cacheDirectory = cacheDirectory).run([self.seed])
+        self.assertEqual(self.sink("crawl"), EXPECTED)
+
+
+    def test_shared_cache_is_refused(self):
+        with self.assertRaises(ValueError):
+            self.coordinator("crawl", cache = ResponseCache(os.path.join(self.directory.name, "cache")))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Name normalization and clustering of the same machine listed at several retailers
+"""
+
+
+import unittest
+
+from computer import CPU, Computer
+from dedup import deduplicate, normalize_name
+
+
+
+class NormalizeNameTest(unittest.TestCase):
+    def test_windows_with_or_without_edition(self):
+        for name in ("New Victus 15 Laptop, Windows 11", "Victus 15 Gaming Laptop Windows 11 Home", "Victus 15 Win11 Pro",
+                     "HP Victus 15, Windows"):
+            self.assertEqual(normalize_name(name, "HP"), "victus 15", name)
+
+
+    def test_model_line_words_are_kept(self):
+        self.assertEqual(normalize_name("Yoga Pro 7 Windows 11 Pro", "Lenovo"), "yoga pro 7")
+        self.assertNotEqual(normalize_name("Yoga Pro 7", "Lenovo"), normalize_name("Yoga 7", "Lenovo"))
+
+
+
+class DeduplicateTest(unittest.TestCase):
+    def test_bare_windows_joins_the_cluster(self):
+        listings = [Computer(brand = "HP", name = name, price = price, cpu = CPU("Intel", 5, 12, 450, "H"),
+                             ram = (16, "DDR5"), url = f"https://www.{retailer}.com/victus")
+                    for name, price, retailer in (("Victus 15 Laptop", 700, "a"), ("New Victus 15 Laptop, Windows 11", 650, "b"),
+                                                  ("Victus 15 Windows 11 Home", 680, "c"))]
+        [merged] = deduplicate(listings)
+        self.assertEqual(merged.computer.price, 650)
+        self.assertEqual([offer.retailer for offer in merged.offers], ["b.com", "c.com", "a.com"])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
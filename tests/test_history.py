@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+PriceHistory with out-of-order observations and a log torn by a crash
+"""
+
+
+from datetime import datetime, timedelta
+import os
+import tempfile
+import unittest
+
+from computer import Computer
+from history import PriceHistory
+
+
+
+T0 = datetime(2026, 10, 1)
+
+
+class PriceHistoryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "history.jsonl")
+
+
+    def test_late_observation_keeps_the_latest_state(self):
+        with PriceHistory(self.path) as history:
+            history.record(Computer(url = "u", price = 900, msrp = 1000, timestamp = T0))
+            history.record(Computer(url = "u", price = 700, msrp = 1000, timestamp = T0 + timedelta(days = 2)))
+            history.record(Computer(url = "u", price = 950, msrp = 1000, rating = 4.0, timestamp = T0 + timedelta(days = 1)))
+
+            self.assertEqual(history.latest("u")['price'], 700)
+            self.assertEqual(history.latest("u")['rating'], 4.0)                # not observed later, so still current
+            self.assertEqual(history.trajectory("u"), [(T0, 900), (T0 + timedelta(days = 1), 950), (T0 + timedelta(days = 2), 700)])
+            self.assertEqual(history.dropped_since(T0 + timedelta(hours = 1)), ["u"])
+
+        self.assertEqual(PriceHistory(self.path).latest("u"), history.latest("u"))
+
+
+    def test_late_observation_is_diffed_at_its_own_time(self):
+        # T0 900, T2 700, then T1 700: 700 is news at T1 though it's already the latest price
+        with PriceHistory(self.path) as history:
+            history.record(Computer(url = "u", price = 900, timestamp = T0))
+            history.record(Computer(url = "u", price = 700, timestamp = T0 + timedelta(days = 2)))
+            changes = history.record(Computer(url = "u", price = 700, timestamp = T0 + timedelta(days = 1)))
+
+            self.assertEqual(changes, {'price': 700})
+            self.assertEqual(history.price_at("u", T0 + timedelta(days = 1, hours = 1)), 700)
+            self.assertIsNone(history.record(Computer(url = "u", price = 900, timestamp = T0 + timedelta(hours = 1))))
+        self.assertEqual(PriceHistory(self.path).price_at("u", T0 + timedelta(days = 1, hours = 1)), 700)
+
+
+    def test_torn_last_line_is_cut_off(self):
+        with PriceHistory(self.path) as history:
+            history.record(Computer(url = "u", price = 900, timestamp = T0))
+            history.record(Computer(url = "u", price = 800, timestamp = T0 + timedelta(days = 1)))
+        with open(self.path, "rb+") as fp:
+            fp.truncate(os.path.getsize(self.path) - 10)
+
+        with PriceHistory(self.path) as history:
+            self.assertEqual(history.trajectory("u"), [(T0, 900)])
+            history.record(Computer(url = "u", price = 850, timestamp = T0 + timedelta(days = 2)))
+        self.assertEqual(PriceHistory(self.path).trajectory("u"), [(T0, 900), (T0 + timedelta(days = 2), 850)])
+
+
+    def test_corrupt_line_before_the_end_raises(self):
+        with open(self.path, "w", encoding = "utf-8") as fp:
+            fp.write('{"url":\n{}\n')
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            PriceHistory(self.path)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
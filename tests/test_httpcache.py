@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+ResponseCache on its own and behind ScrapePipeline against the local fixture server
+"""
+
+
+import os
+import tempfile
+import unittest
+
+from httpcache import ResponseCache
+from scrape import RecordParser, ScrapePipeline
+from tests.fixtures import FixtureServer
+
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(self.directory.name, maxEntries = 3)
+        for page in range(3):
+            cache.store(f"u{page}", b"body %d" % page)
+        cache.body("u0")                                                       # u1 is now the least recently used
+        cache.store("u3", b"body 3")
+
+        self.assertNotIn("u1", cache)
+        self.assertEqual([url in cache for url in ("u0", "u2", "u3")], [True, True, True])
+        self.assertEqual(cache.stats['evictions'], 1)
+        self.assertEqual(len([name for name in os.listdir(self.directory.name) if name.endswith(".body")]), 3)
+
+
+    def test_lru_eviction_by_bytes(self):
+        cache = ResponseCache(self.directory.name, maxBytes = 25)
+        for page in range(3):
+            cache.store(f"u{page}", b"x" * 10)
+        self.assertEqual((len(cache), cache.size), (2, 20))
+        self.assertNotIn("u0", cache)
+
+
+    def test_same_body_is_unchanged(self):
+        cache = ResponseCache(self.directory.name)
+        self.assertTrue(cache.store("u", b"one", {'etag': '"1"'}))
+        self.assertFalse(cache.store("u", b"one"))
+        self.assertTrue(cache.store("u", b"two"))
+        self.assertEqual(cache.body("u"), b"two")
+
+
+    def test_index_survives_reopening(self):
+        with ResponseCache(self.directory.name) as cache:
+            cache.store("u", b"body", {'etag': '"7"', 'last-modified': "Sat, 17 Oct 2026 10:00:00 GMT"})
+        cache = ResponseCache(self.directory.name)
+        self.assertEqual(cache.conditional_headers("u"),
+                         {'If-None-Match': '"7"', 'If-Modified-Since': "Sat, 17 Oct 2026 10:00:00 GMT"})
+        self.assertEqual(cache.body("u"), b"body")
+
+
+    def test_missing_body_file_drops_the_entry(self):
+        cache = ResponseCache(self.directory.name)
+        cache.store("u", b"body", {'etag': '"7"'})
+        for name in os.listdir(self.directory.name):
+            os.remove(os.path.join(self.directory.name, name))
+        self.assertIsNone(cache.body("u"))
+        self.assertEqual((len(cache), cache.size, cache.conditional_headers("u")), (0, 0, {}))
+
+
+
+class ConditionalFetchTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+
+    def scrape(self, paths: list) -> tuple:
+        with ResponseCache(self.directory.name) as cache:
+            pipeline = ScrapePipeline([RecordParser("127.0.0.1")], processes = 0, cache = cache)
+            return pipeline, pipeline.scrape_all([self.server.url(path) for path in paths])
+
+
+    def test_304_with_if_none_match(self):
+        paths = [f"/p/{page}" for page in range(6)]
+        _, computers = self.scrape(paths)
+        self.assertEqual(len(computers), 18)
+
+        pipeline, computers = self.scrape(paths)
+        self.assertEqual(computers, [])
+        self.assertEqual(pipeline.stats['unchanged'], 6)
+        self.assertEqual([self.server.conditional[path] for path in paths], [1] * 6)
+
+
+    def test_same_body_without_etag(self):
+        paths = [f"/plain/{page}" for page in range(4)]
+        self.scrape(paths)
+        pipeline, computers = self.scrape(paths)
+        self.assertEqual(computers, [])
+        self.assertEqual(pipeline.stats['unchanged'], 4)
+        self.assertEqual(sum(self.server.conditional.values()), 0)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+JSON Lines round trips, and bad lines reported by line number
+"""
+
+
+import io
+import unittest
+
+from computer import CPU, Computer
+from jsonl import dump_jsonl, iter_jsonl
+
+
+
+class JsonLinesTest(unittest.TestCase):
+    def setUp(self):
+        self.computers = [Computer(brand = "HP", price = 500 + i, cpu = CPU("AMD", 7, 7, 840, "HS"), url = f"u{i}")
+                          for i in range(5)]
+        self.text = io.StringIO()
+        dump_jsonl(self.computers, self.text)
+
+
+    def test_round_trip(self):
+        self.text.seek(0)
+        computers = list(iter_jsonl(self.text, chunkSize = 2))
+        self.assertEqual([pc.to_record() for pc in computers], [pc.to_record() for pc in self.computers])
+
+
+    def test_bad_lines_are_collected(self):
+        lines = self.text.getvalue().splitlines()
+        lines[1:1] = ['5', '[1, 2]', '{"cpu": "Intel"}', '{"price": -1}', '{not json', '']
+        for validate in ("batch", "none"):
+            failures = []
+            computers = list(iter_jsonl(io.StringIO("\n".join(lines)), validate, failures, chunkSize = 3))
+            self.assertEqual([pc.url for pc in computers], [f"u{i}" for i in range(5)] if validate == "batch"
+                             else ["u0", None, "u1", "u2", "u3", "u4"])
+            self.assertEqual([line for line, _ in failures], [2, 3, 4, 5, 6] if validate == "batch" else [2, 3, 4, 6])
+
+
+    def test_bad_line_raises_without_failures(self):
+        with self.assertRaisesRegex(ValueError, "Line 2: Record: 5 is invalid"):
+            list(iter_jsonl(io.StringIO('{}\n5\n')))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+score_catalog against Computer's own scoring, bad records included
+"""
+
+
+import math
+import unittest
+
+from computer import CPU, Computer
+from parallel import score_catalog
+
+
+
+class ScoreCatalogTest(unittest.TestCase):
+    def records(self) -> list:
+        good = Computer(brand = "HP", price = 650, msrp = 900, rating = 4.5, cpu = CPU("Intel", 7, 13, 700, "H"),
+                        ram = (16, "DDR5"), storage = (1000, "SSD"))
+        return [good, good.to_record(),
+                {'cpu': "Intel"},                                              # not a spec
+                {'gpu': ["NVIDIA", "RTX", 40, 60]},
+                {'price': -5},
+                {'style': "Tower", 'rating': 3.5},
+                {'gpu': {'brand': "NVIDIA", 'series': "RTX", 'generation': 40}}]      # passes the checks, can't be scored
+
+
+    def check(self, workers: int) -> None:
+        scores, failures = score_catalog(self.records(), workers = workers, chunkSize = 4)
+        self.assertEqual(len(scores), 7)
+        self.assertEqual([index for index, _ in failures], [2, 3, 4, 6])
+        self.assertEqual([type(error) for _, error in failures], [TypeError, TypeError, ValueError, TypeError])
+        self.assertTrue(all(math.isnan(scores[index]) for index in (2, 3, 4, 6)))
+        self.assertEqual([index for index, _ in Computer.from_records(self.records()[1:])[1]], [1, 2, 3, 5])
+
+        expected = Computer.from_records([self.records()[1], self.records()[5]])[0]
+        self.assertEqual([scores[0], scores[1], scores[5]], [expected[0].score, expected[0].score, expected[1].score])
+
+
+    def test_in_process(self):
+        self.check(workers = 1)
+
+
+    def test_worker_processes(self):
+        self.check(workers = 2)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+ListingIndex and Query against a brute-force filter over the same listings
+"""
+
+
+import random
+import unittest
+
+from computer import CPU, GPU, Computer
+from query import FIELDS, ListingIndex
+
+
+
+def listings(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [Computer(brand = rng.choice(["HP", "Dell", "Lenovo", None]), style = rng.choice(["Laptop", "Tower", "Mini"]),
+                     price = rng.choice([None, rng.randrange(300, 3000, 10)]), rating = rng.choice([None, 3.5, 4.0, 4.5]),
+                     refresh = rng.choice([60, 120, 144, 240]), ram = (rng.choice([8, 16, 32]), "DDR5"),
+                     cpu = CPU("Intel", rng.choice([5, 7, 9]), rng.randint(12, 14), 450, "H"),
+                     gpu = rng.choice([GPU("NVIDIA", "RTX", 40, rng.choice([50, 60, 70])), GPU("Intel", "Integrated")]),
+                     url = f"u{row}")
+            for row in range(count)]
+
+
+class ListingIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = ListingIndex(listings(400))
+        rng = random.Random(1)
+        for row in rng.sample(range(400), 60):
+            self.index.update(row, {'price': rng.choice([None, rng.randrange(300, 3000, 10)]),
+                                    'ram': (rng.choice([8, 16, 64]), "DDR5"), 'refresh': rng.choice([60, 165])})
+        for row in rng.sample(range(400), 40):
+            if self.index.computers[row] is not None:
+                self.index.remove(row)
+        self.index.add(Computer(style = "Laptop", price = 999, ram = (16, "DDR5"), refresh = 144, url = "added"))
+
+
+    def brute(self, test) -> list:
+        return [row for row, pc in enumerate(self.index.computers) if pc is not None and test(pc)]
+
+
+    def check(self, query, test) -> None:
+        expected = self.brute(test)
+        self.assertEqual(query.rows(), expected)
+        self.assertEqual(query.count(), len(expected))
+        for by in ('score', 'price', 'ram'):
+            for k in (1, 5, 50, 1000):
+                values = [FIELDS[by](self.index.computers[row]) for row in expected]
+                best = sorted((value for value in values if value is not None), reverse = True)[:k]
+                self.assertEqual([FIELDS[by](pc) for pc in query.top(k, by)], best, (by, k))
+
+
+    def test_filters_match_brute_force(self):
+        self.check(self.index.query(), lambda pc: True)
+        self.check(self.index.query().where(style = "Laptop"), lambda pc: pc.style == "Laptop")
+        self.check(self.index.query().where(style = "Laptop", ram = (16, 64)).range('price', 500, 1500),
+                   lambda pc: pc.style == "Laptop" and pc.ram[0] in (16, 64) and pc.price is not None and 500 <= pc.price <= 1500)
+        self.check(self.index.query().range('refresh', 144).range('price', hi = 2000).where(gpuBrand = "NVIDIA"),
+                   lambda pc: pc.refresh >= 144 and pc.price is not None and pc.price <= 2000 and pc.gpu.brand == "NVIDIA")
+        self.check(self.index.query().where(brand = None, cpuFamily = 9).range('score', 30),
+                   lambda pc: pc.brand is None and pc.cpu.family == 9 and pc.score >= 30)
+        self.check(self.index.query().where(price = (999, 1000)), lambda pc: pc.price in (999, 1000))
+
+
+    def test_top_of_nothing(self):
+        query = self.index.query().where(style = "Laptop")
+        self.assertEqual(query.top(0), [])
+        self.assertEqual(query.top(-1), [])
+        self.assertEqual(query.top(0, 'price'), [])
+        self.assertEqual(self.index.query().where(style = "All-in-One").top(5), [])
+
+
+    def test_len_and_unknown_field(self):
+        self.assertEqual(len(self.index), len(self.brute(lambda pc: True)))
+        with self.assertRaises(ValueError):
+            self.index.query().where(weight = 3)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Summary lines and CSV reports of a ComputerCatalog against the Computers in it
+"""
+
+
+import csv
+import io
+import unittest
+
+from catalog import ComputerCatalog
+from computer import Computer
+from render import COLUMNS, write_csv, write_summary
+from tests.test_snapshot import computers
+
+
+
+class RenderTest(unittest.TestCase):
+    def setUp(self):
+        self.computers = computers()
+        for computer in self.computers:
+            computer.create_score()
+        self.catalog = ComputerCatalog(self.computers)
+
+
+    def test_summary_matches_to_str(self):
+        fp = io.StringIO()
+        self.assertEqual(write_summary(self.catalog, fp), 3)
+        self.assertEqual(fp.getvalue().splitlines(), [computer.to_str() for computer in self.computers])
+
+
+    def test_whole_floats_print_as_ints(self):
+        computer = Computer(price = 1200.0, screen = 16.0, ram = (16.0, "DDR5"))
+        fp = io.StringIO()
+        write_summary(ComputerCatalog([computer]), fp)
+        self.assertEqual(fp.getvalue(), computer.to_str().replace(".0", "") + "\n")
+
+
+    def test_csv(self):
+        fp = io.StringIO()
+        write_csv(self.catalog, fp)
+        fp.seek(0)
+        rows = list(csv.reader(fp))
+        self.assertEqual(rows[0], list(COLUMNS))
+        self.assertEqual([row[COLUMNS.index('price')] for row in rows[1:]], ["2220", "999.99", ""])
+        self.assertEqual([row[COLUMNS.index('refresh')] for row in rows[1:]], ["240", "59.94", "60"])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+ScrapePipeline and HTTPClient against the local fixture server
+"""
+
+
+import unittest
+
+from scrape import FetchError, RecordParser, ScrapePipeline
+from tests.fixtures import FixtureServer, listings
+
+
+
+class ScrapePipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+
+
+    def scrape(self, paths: list, **options) -> tuple:
+        pipeline = ScrapePipeline([RecordParser("127.0.0.1")], backoff = 0.01, **options)
+        return pipeline, pipeline.scrape_all([self.server.url(path) for path in paths])
+
+
+    def test_chunked_and_content_length_bodies(self):
+        # Even pages are sent with Content-Length, odd ones chunked, all over reused connections
+        pipeline, computers = self.scrape([f"/p/{page}" for page in range(10)], processes = 0)
+        expected = {(record['url'], record['price']) for page in range(10) for record in listings(page)}
+        self.assertEqual({(pc.url, pc.price) for pc in computers}, expected)
+        self.assertEqual(pipeline.stats['fetched'], 10)
+        self.assertEqual(pipeline.failures, [])
+
+
+    def test_parsing_in_processes(self):
+        pipeline, computers = self.scrape([f"/p/{page}" for page in range(4)], processes = 2)
+        self.assertEqual(len(computers), 12)
+        self.assertEqual(pipeline.stats['parsed'], 4)
+
+
+    def test_503_is_retried(self):
+        pipeline, computers = self.scrape(["/flaky/3"], processes = 0)
+        self.assertEqual(len(computers), 3)
+        self.assertEqual(pipeline.stats['retried'], 1)
+        self.assertEqual(self.server.hits["/flaky/3"], 2)
+
+
+    def test_404_fails_without_retry(self):
+        pipeline, computers = self.scrape(["/missing/1", "/p/2"], processes = 0)
+        self.assertEqual(len(computers), 3)
+        self.assertEqual(self.server.hits["/missing/1"], 1)
+        [(url, error)] = pipeline.failures
+        self.assertEqual(url, self.server.url("/missing/1"))
+        self.assertIsInstance(error, FetchError)
+        self.assertEqual(error.status, 404)
+
+
+    def test_invalid_records_are_reported(self):
+        for processes in (0, 2):
+            pipeline, computers = self.scrape(["/bad/4"], processes = processes)
+            self.assertEqual(len(computers), 3)
+            self.assertEqual((pipeline.stats['parsed'], pipeline.stats['rejected'], pipeline.stats['failed']), (1, 2, 0))
+            self.assertEqual([(url, str(error)) for url, error in pipeline.failures],
+                             [(self.server.url("/bad/4"), "Record 3: Price of -5 is invalid"),
+                              (self.server.url("/bad/4"), "Record 4: CPU: Intel is invalid")])
+
+
+    def test_unknown_host_fails(self):
+        pipeline = ScrapePipeline([RecordParser("127.0.0.1")], processes = 0)
+        self.assertEqual(pipeline.scrape_all(["http://unknown.invalid/p/1"]), [])
+        self.assertEqual(pipeline.stats['failed'], 1)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
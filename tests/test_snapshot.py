@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshots written from a ComputerCatalog and read back through mmap
+"""
+
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from catalog import ComputerCatalog
+from computer import CPU, GPU, Computer
+from snapshot import Snapshot, write_snapshot
+
+
+
+def computers() -> list:
+    timestamp = datetime(2026, 10, 1)
+    return [Computer(brand = "HP", name = "Omen 16", price = 2220, msrp = 2960, rating = 4.5, reviews = 120, sale = 25,
+                     screen = 16.1, resolution = (2560, 1440), refresh = 240, keypad = True, webcam = True,
+                     cpu = CPU("Intel", 9, 14, 900, "HX"), gpu = GPU("NVIDIA", "RTX", 40, 80),
+                     ram = (32, "DDR5"), storage = (2000, "SSD"), url = "u0", timestamp = timestamp),
+            Computer(brand = "Dell", style = "Tower", price = 999.99, rating = 4, refresh = 59.94,
+                     ram = (15.5, "DDR4"), url = "u1", timestamp = timestamp),
+            Computer(url = "u2", timestamp = timestamp)]
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "catalog.snap")
+        self.catalog = ComputerCatalog(computers())
+        self.catalog.create_score()
+        write_snapshot(self.catalog, self.path)
+
+
+    def test_rows_match_the_catalog(self):
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual([snapshot.row(index) for index in range(len(snapshot))], list(self.catalog.rows()))
+            self.assertEqual([type(snapshot.value(name, 0)) for name in ('price', 'msrp', 'sale', 'screen', 'rating')],
+                             [int, int, int, float, float])
+
+
+    def test_to_catalog(self):
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(list(snapshot.to_catalog().rows()), list(self.catalog.rows()))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
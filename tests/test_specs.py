@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+CPU.parse / GPU.parse on listing titles that have been split wrong before
+"""
+
+
+import unittest
+
+from computer import CPU, GPU, gpu_score
+
+
+
+class ParseTest(unittest.TestCase):
+    def check(self, parse, titles: dict) -> None:
+        for title, (expected, key) in titles.items():
+            spec = parse(title)
+            self.assertEqual((str(spec), spec.key), (expected, key), title)
+
+
+    def test_intel_models(self):
+        self.check(CPU.parse, {
+            "Intel Core i7-1360P": ("Intel i7-1360P", ("Intel", 7, 13, 60, "P")),
+            "Intel Core i5-1235U": ("Intel i5-1235U", ("Intel", 5, 12, 35, "U")),
+            "Intel Core i5-1135G7": ("Intel i5-1135G7", ("Intel", 5, 11, 35, "G7")),
+            "Intel Core i3-1005G1": ("Intel i3-1005G1", ("Intel", 3, 10, "05", "G1")),
+            "Intel Core i7-8750H": ("Intel i7-8750H", ("Intel", 7, 8, 750, "H")),
+            "Intel Core i5-12450H": ("Intel i5-12450H", ("Intel", 5, 12, 450, "H")),
+        })
+
+
+    def test_amd_models(self):
+        self.check(CPU.parse, {
+            "AMD Ryzen 7 7840HS": ("AMD Ryzen 7 7840HS", ("AMD", 7, 7, 840, "HS")),
+            "AMD Ryzen 9 7945HX3D": ("AMD Ryzen 9 7945HX3D", ("AMD", 9, 7, 945, "HX3D")),
+            "AMD Ryzen 7 7800X3D": ("AMD Ryzen 7 7800X3D", ("AMD", 7, 7, 800, "X3D")),
+        })
+
+
+    def test_gpus(self):
+        self.check(GPU.parse, {
+            "AMD Radeon RX 7600": ("Radeon RX 7600", ("Radeon", "RX", 76, 0, None)),
+            "AMD Radeon RX 9060 XT": ("Radeon RX 9060 XT", ("Radeon", "RX", 90, 60, "XT")),
+            "AMD Radeon RX 7900 XTX": ("Radeon RX 7900 XTX", ("Radeon", "RX", 79, 0, "XTX")),
+            "AMD Radeon RX 6500M": ("Radeon RX 6500 M", ("Radeon", "RX", 65, 0, "M")),
+            "AMD Radeon RX 7600S": ("Radeon RX 7600 S", ("Radeon", "RX", 76, 0, "S")),
+            "Iris Xe Graphics": ("Intel IRIS XE", ("Intel", "IRIS XE", None, None, None)),
+            "NVIDIA GeForce RTX 4060": ("NVIDIA RTX 4060", ("NVIDIA", "RTX", 40, 60, None)),
+        })
+
+
+    def test_model_strings_intern_with_ints(self):
+        self.assertIs(CPU("Intel", 7, 13, "700", "H"), CPU("Intel", 7, 13, 700, "H"))
+        self.assertIsNot(CPU("Intel", 3, 10, "05", "G1"), CPU("Intel", 3, 10, 5, "G1"))
+        with self.assertRaises(ValueError):
+            CPU("Intel", 7, 13, "7OO")
+
+
+    def test_radeon_scores_below_top_nvidia(self):
+        radeon, nvidia = GPU.parse("AMD Radeon RX 7600"), GPU.parse("NVIDIA GeForce RTX 4090")
+        self.assertLess(gpu_score(radeon.generation, radeon.performance), gpu_score(nvidia.generation, nvidia.performance))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+ListingStore round trips and batches that fail part way
+"""
+
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from computer import CPU, GPU, Computer
+from store import ListingStore
+from tests.test_snapshot import computers
+
+
+
+class ListingStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "listings.db")
+
+
+    def test_round_trip(self):
+        listings = computers() + [Computer(brand = "Lenovo", weight = 3.5, dimensions = (14.1, 9.9, 0.7), rating = 4.5,
+                                           cpu = CPU("Intel", 3, 10, "05", "G1"), gpu = GPU("Radeon", "RX", 76, 0, "S"),
+                                           url = "u3")]
+        for computer in listings:
+            computer.create_score()
+        with ListingStore(self.path) as store:
+            self.assertEqual(store.upsert(listings), 4)
+        with ListingStore(self.path) as store:
+            for computer in listings:
+                stored = store.get(computer.url)
+                self.assertEqual(stored.to_row(), computer.to_row())
+                self.assertEqual((stored.weight, stored.dimensions), (computer.weight, computer.dimensions))
+                self.assertIs(stored.cpu, computer.cpu)
+            self.assertEqual([pc.url for pc in store.select(minPrice = 500, orderBy = 'price', descending = True)], ["u0", "u1"])
+
+
+    def test_failed_batch_leaves_no_spec_ids_behind(self):
+        # The batch inserts a new CPU row, then fails on its listing; the rolled back id must not be reused
+        good = Computer(style = "Mini", cpu = CPU("AMD", 7, 8, 845, "HS"), url = "good")
+        bad = Computer(cpu = CPU("AMD", 9, 8, 945, "HX"), url = "bad")
+        bad.style = None                                                       # listings.style is NOT NULL
+        with ListingStore(self.path) as store:
+            with self.assertRaises(sqlite3.IntegrityError):
+                store.upsert([good, bad])
+            self.assertEqual(len(store), 0)
+
+            self.assertEqual(store.upsert([good]), 1)
+            self.assertIs(store.get("good").cpu, good.cpu)
+        with ListingStore(self.path) as store:
+            self.assertIs(store.get("good").cpu, good.cpu)
+            self.assertNotIn("bad", store)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
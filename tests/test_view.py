@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+ComputerView over records, rows and snapshot slots against the Computer it was made from
+"""
+
+
+import os
+import tempfile
+import unittest
+
+from catalog import ComputerCatalog
+from snapshot import Snapshot, write_snapshot
+from tests.test_snapshot import computers
+from view import ComputerView
+
+
+
+class ComputerViewTest(unittest.TestCase):
+    def setUp(self):
+        self.computers = computers()
+        for computer in self.computers:
+            computer.create_score()
+
+
+    def test_record_and_row_views(self):
+        for computer in self.computers:
+            view = ComputerView(computer.to_record())
+            self.assertEqual((str(view), view.to_str(), view.score), (str(computer), computer.to_str(), computer.score))
+            self.assertEqual(ComputerView.from_row(computer.to_row()).to_row(), computer.to_row())    # rows leave out the features
+
+
+    def test_snapshot_views(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.snap")
+            write_snapshot(ComputerCatalog(self.computers), path)
+            with Snapshot(path) as snapshot:
+                for index, computer in enumerate(self.computers):
+                    view = ComputerView.from_snapshot(snapshot, index)
+                    self.assertEqual(str(view), str(computer))
+                    self.assertEqual(view.to_str(), computer.to_str())
+                    self.assertEqual(view.to_row(), computer.to_row())
+                del view                                                       # its lambda holds the snapshot open
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Lazy read-only views of a listing over a raw record, a to_row() row or a snapshot slot
+
+A ComputerView decodes and checks a field the first time it is read and keeps the result, so a
+job reading price, url and score never builds the CPU/GPU specs or checks the other fields.
+The score is taken from the source when it has one and only computed when it doesn't.
+__str__, to_str, to_dict, to_row, to_record and to_json are Computer's own functions.
+"""
+
+
+from datetime import datetime
+
+from computer import FIELD_CHECKS, Capacity, Computer, Resolution, _RECORD_DEFAULTS, _decode_field
+from snapshot import Snapshot
+
+
+
+# Computer.to_row() layout
+ROW_FIELDS = ('brand', 'name', 'style', 'rating', 'reviews', 'price', 'msrp', 'sale', 'screen', 'resolution', 'refresh',
+              'cpu', 'gpu', 'ram', 'storage', 'url', 'timestamp', 'score')
+
+_ROW_POSITIONS = {field: position for position, field in enumerate(ROW_FIELDS)}
+
+_MISSING = object()
+
+
+
+class ComputerView:
+    # Fields live in the instance __dict__ once read, so only the first read of each goes through __getattr__
+    def __init__(self, record: dict):
+        # record: a JSON record (to_record) or Computer's constructor kwargs as scraped
+        self._read = lambda field: record.get(field, _MISSING)
+
+
+    @staticmethod
+    def from_row(row: list) -> 'ComputerView':
+        # row in the to_row() layout, fields it leaves out (weight, dimensions, features) read as their defaults
+        view = ComputerView.__new__(ComputerView)
+        view._read = lambda field: row[_ROW_POSITIONS[field]] if field in _ROW_POSITIONS else _MISSING
+        return view
+
+
+    @staticmethod
+    def from_snapshot(snapshot: Snapshot, index: int) -> 'ComputerView':
+        view = ComputerView.__new__(ComputerView)
+        view._read = lambda field: _snapshot_field(snapshot, index, field)
+        return view
+
+
+    def __getattr__(self, name):
+        if name not in _RECORD_DEFAULTS:
+            raise AttributeError(f"'ComputerView' object has no attribute '{name}'")
+
+        value = self._read(name)
+        if name == 'score':
+            if value is _MISSING or value is None:
+                return self.create_score()                                     # sets self.score
+        elif value is _MISSING or (name == 'timestamp' and value is None):
+            value = _RECORD_DEFAULTS[name] if name != 'timestamp' else datetime.now()
+        else:
+            value = _decode_field(name, value)
+            if name in FIELD_CHECKS:
+                FIELD_CHECKS[name](value)                                      # raises, and reads again next time
+
+        self.__dict__[name] = value
+        return value
+
+
+    def check(self) -> None:
+        # Every field at once, as Computer.check does
+        for field in FIELD_CHECKS:
+            getattr(self, field)
+
+
+    def to_computer(self) -> Computer:
+        # A full Computer with the view's values, every field checked
+        computer = Computer.__new__(Computer)
+        for field in _RECORD_DEFAULTS:
+            setattr(computer, field, getattr(self, field))
+        return computer
+
+
+    create_score = Computer.create_score
+    __str__ = Computer.__str__
+    to_str = Computer.to_str
+    to_list = Computer.to_list
+    to_row = Computer.to_row
+    to_dict = Computer.to_dict
+    to_record = Computer.to_record
+    to_json = Computer.to_json
+
+
+
+def _snapshot_field(snapshot: Snapshot, index: int, field: str):
+    # Snapshot columns behind each field, compound fields are put back together
+    if field == 'resolution':
+        return Resolution(snapshot.value('resolutionWidth', index), snapshot.value('resolutionHeight', index))
+    if field in ('ram', 'storage'):
+        return Capacity(snapshot.value(field + 'Size', index), snapshot.value(field + 'Type', index))
+    if field in snapshot.header['columns']:
+        return snapshot.value(field, index)
+    return _MISSING